@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, send_file, abort
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, send_file, abort, make_response, g, stream_with_context
 from flask_migrate import Migrate
 from datetime import datetime, timedelta, date
 import pytz
@@ -11,9 +11,19 @@ import json
 import secrets
 from decimal import Decimal, InvalidOperation
 from icalendar import Calendar, Event
-from io import BytesIO
+from io import BytesIO, StringIO
+import csv
 from flask_mail import Mail, Message
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy import event
+from sqlalchemy.orm import Session as SASession, joinedload, contains_eager, selectinload
+from itertools import chain
+from functools import lru_cache
+from collections import namedtuple
+import click
+import hashlib
+import threading
+import time
 
 # Load environment variables from .env file
 try:
@@ -56,7 +66,10 @@ app.config['MAIL_PASSWORD'] = os.environ.get('MAIL_PASSWORD')
 app.config['MAIL_DEFAULT_SENDER'] = os.environ.get('MAIL_DEFAULT_SENDER')
 
 # Import models and db
-from models import db, User, Client, Membership, MembershipFunding, Project, Task, Log, UserProjectPin, UserTaskFlag, TIMEZONE, get_current_time, Equipment, UserPreferences, ActivityLog, SchedulingSettings, EquipmentOperatingHours, EquipmentBlockedDate, EquipmentAppointment, GENERAL_PROJECT_NAME, Quote, QuoteLineItem
+from models import db, User, Client, Membership, MembershipFunding, Project, Task, Log, UserProjectPin, UserTaskFlag, TIMEZONE, get_current_time, local_day_expr, local_day_key, Equipment, UserPreferences, ActivityLog, SchedulingSettings, EquipmentOperatingHours, EquipmentBlockedDate, EquipmentAppointment, GENERAL_PROJECT_NAME, Quote, QuoteLineItem, DailyMetric, TaskMention, MembershipUsage, Job, USER_TAG_RE, PROJECT_TAG_RE
+import search
+import report_export
+import jobs
 
 # Initialize extensions
 db.init_app(app)
@@ -186,74 +199,50 @@ This is an automated notification from the Hub Tracker scheduling system.
         # Don't raise the exception - don't break appointment creation
 
 # Template context processors
+def _request_memo(key, compute):
+    """Compute a value at most once per request, storing it on flask.g."""
+    memo = g.setdefault('_context_memo', {})
+    if key not in memo:
+        memo[key] = compute()
+    return memo[key]
+
 @app.context_processor
 def inject_pinned_projects():
+    # Everything here is lazy: templates call these, and each runs at most once per request
     def get_pinned_projects():
         if 'user_id' not in session:
             return []
-        
-        # Get pinned projects for current user
-        pinned_project_ids = UserProjectPin.query.filter_by(
-            user_id=session['user_id']
-        ).all()
-        
-        project_ids = [pin.project_id for pin in pinned_project_ids]
-        
-        if not project_ids:
-            return []
-        
-        # Get the actual projects with client info
-        pinned_projects = Project.query.join(Client).filter(
-            Project.id.in_(project_ids)
-        ).order_by(Project.name.asc()).all()
-        
-        # Add open tasks count to each pinned project
-        for project in pinned_projects:
-            project.open_tasks_count = project.tasks.filter_by(is_complete=False).count()
-        
-        return pinned_projects
+        return _request_memo('pinned_projects', _load_pinned_projects)
+    
+    def current_user_logged_today():
+        user = _request_memo('current_user', lambda: db.session.get(User, session['user_id']))
+        return user is not None and user.has_logged_on(get_current_time().date())
     
     def has_logged_today():
         if 'user_id' not in session:
             return True  # Don't show animation if not logged in
-        
-        today_start = get_current_time().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = get_current_time().replace(hour=23, minute=59, second=59, microsecond=999999)
-        
-        has_logs = Log.query.filter(
-            Log.user_id == session['user_id'],
-            Log.created_at.between(today_start, today_end)
-        ).first() is not None
-        
-        return has_logs
+        return _request_memo('has_logged_today', current_user_logged_today)
     
     def should_show_log_reminder():
         if 'user_id' not in session:
             return False  # Don't show reminder if not logged in
         
-        current_time = get_current_time()
-        
         # Only show reminder after 12PM (noon) Chicago time
-        if current_time.hour < 12:
+        if get_current_time().hour < 12:
             return False
         
-        # Check if user has logged today
-        today_start = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = current_time.replace(hour=23, minute=59, second=59, microsecond=999999)
-        
-        has_logs = Log.query.filter(
-            Log.user_id == session['user_id'],
-            Log.created_at.between(today_start, today_end)
-        ).first() is not None
-        
-        return not has_logs
+        return not has_logged_today()
     
     return dict(
         get_pinned_projects=get_pinned_projects,
-        has_logged_today=has_logged_today(),
-        should_show_log_reminder=should_show_log_reminder()
+        has_logged_today=has_logged_today,
+        should_show_log_reminder=should_show_log_reminder
     )
 
+def _load_pinned_projects():
+    # Pinned projects with client info and open task counts, in one query
+    return project_listing(user_id=session['user_id'], pinned_only=True, with_usage=False)
+
 # Template filters
 @app.template_filter('markdown')
 def markdown_filter(text):
@@ -264,10 +253,15 @@ def markdown_filter(text):
 
 @app.template_filter('render_tags')
 def render_tags(value):
-    value = re.sub(r'@\[(.*?)\]', r'<span class="task-tag task-tag-user">@\1</span>', value)
-    value = re.sub(r'#\[(.*?)\]', r'<span class="task-tag task-tag-project">#\1</span>', value)
+    value = USER_TAG_RE.sub(r'<span class="task-tag task-tag-user">@\1</span>', value)
+    value = PROJECT_TAG_RE.sub(r'<span class="task-tag task-tag-project">#\1</span>', value)
     return Markup(value)
 
+@lru_cache(maxsize=4096)
+def render_tags_cached(value):
+    """render_tags() memoized by description text (Markup is immutable, so safe to share)."""
+    return render_tags(value)
+
 @app.template_filter('autolink')
 def autolink_filter(value):
     """Auto-link plain URLs in text and open in new tab."""
@@ -784,18 +778,251 @@ def recalculate_quote_totals(quote, parsed_line_items=None):
         quote.tax_amount = Decimal('0.00')
     quote.total_amount = (pre_tax_total + quote.tax_amount).quantize(Decimal('0.01'))
 
+def build_daily_rollup(days=30):
+    """Per-Chicago-day task completions, hours and projects touched for the last `days` days.
+
+    Counts and hours come from the daily_metrics rollup; projects touched is a
+    COUNT(DISTINCT activity_logs.project_id) per day. Returns a list of dicts ordered
+    oldest to newest, including today.
+    """
+    from datetime import time as time_cls
+
+    today = get_current_time().date()
+    first_day = today - timedelta(days=days - 1)
+    window_start = TIMEZONE.localize(datetime.combine(first_day, time_cls.min))
+    window_end = TIMEZONE.localize(datetime.combine(today + timedelta(days=1), time_cls.min))
+
+    rollup = {}
+    for offset in range(days):
+        day_key = (first_day + timedelta(days=offset)).isoformat()
+        rollup[day_key] = {
+            'date': day_key,
+            'tasks_completed': 0,
+            'detailed_hours': 0.0,
+            'touch_hours': 0.0,
+            'hours': 0.0,
+            'projects_touched': 0,
+        }
+
+    # Tasks completed and detailed/touch hours per day, from the daily_metrics rollup
+    metric_rows = db.session.query(
+        DailyMetric.metric_date,
+        func.coalesce(func.sum(DailyMetric.tasks_completed), 0),
+        func.coalesce(func.sum(DailyMetric.hours), 0),
+        func.coalesce(func.sum(DailyMetric.touch_hours), 0),
+    ).filter(
+        DailyMetric.metric_date >= first_day,
+        DailyMetric.metric_date <= today,
+    ).group_by(DailyMetric.metric_date).all()
+    for day, tasks_completed, detailed_hours, touch_hours in metric_rows:
+        bucket = rollup.get(local_day_key(day))
+        if bucket:
+            bucket['tasks_completed'] = int(tasks_completed or 0)
+            bucket['detailed_hours'] = round(float(detailed_hours or 0), 1)
+            bucket['touch_hours'] = round(float(touch_hours or 0), 1)
+            bucket['hours'] = round(float(detailed_hours or 0) + float(touch_hours or 0), 1)
+
+    # Projects touched per day (task completions, status changes, time/touch logs)
+    activity_day = local_day_expr(ActivityLog.created_at)
+    touched_rows = db.session.query(
+        activity_day.label('day'),
+        func.count(func.distinct(ActivityLog.project_id)),
+    ).filter(
+        ActivityLog.created_at >= window_start,
+        ActivityLog.created_at < window_end,
+        ActivityLog.project_id.isnot(None),
+        ActivityLog.activity_type.in_(
+            ['task_completed', 'project_status_change', 'time_logged', 'touch_logged']
+        ),
+    ).group_by(activity_day).all()
+    for day, projects_touched in touched_rows:
+        bucket = rollup.get(local_day_key(day))
+        if bucket:
+            bucket['projects_touched'] = projects_touched
+
+    return list(rollup.values())
+
+# Reference data cache: lightweight option tuples for the client/user/project/membership
+# pickers most pages render. Versioned and dropped on commit of a change to a field the
+# options carry; the TTL bounds staleness across gunicorn workers.
+REFERENCE_CACHE_TTL_SECONDS = 60
+REFERENCE_DATA_FIELDS = {
+    Client: ('name',),
+    User: ('first_name', 'last_name', 'role'),
+    Project: ('name', 'client_id', 'status', 'is_default'),
+    Membership: ('title',),
+}
+ClientOption = namedtuple('ClientOption', 'id name')
+UserOption = namedtuple('UserOption', 'id first_name last_name full_name role')
+ProjectOption = namedtuple('ProjectOption', 'id name client_id client status is_default')
+MembershipOption = namedtuple('MembershipOption', 'id title')
+ReferenceData = namedtuple('ReferenceData', 'version clients users projects memberships')
+_reference_cache = {'data': None, 'expires_at': 0.0, 'version': 0}
+_reference_cache_lock = threading.Lock()
+
+
+def invalidate_reference_cache():
+    with _reference_cache_lock:
+        _reference_cache['data'] = None
+        _reference_cache['version'] += 1
+
+
+def _reference_data_changed(obj):
+    fields = REFERENCE_DATA_FIELDS.get(type(obj))
+    if not fields:
+        return False
+    state = db.inspect(obj)
+    if not state.persistent or state.deleted:
+        return True
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+@event.listens_for(SASession, 'after_flush')
+def _flag_reference_cache_changes(session, flush_context):
+    if any(_reference_data_changed(obj) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info['reference_cache_dirty'] = True
+
+
+@event.listens_for(SASession, 'after_commit')
+def _invalidate_reference_cache_on_commit(session):
+    if session.info.pop('reference_cache_dirty', False):
+        invalidate_reference_cache()
+
+
+@event.listens_for(SASession, 'after_soft_rollback')
+def _reset_reference_cache_flag(session, previous_transaction):
+    session.info.pop('reference_cache_dirty', None)
+
+
+def _load_reference_data(version):
+    clients = [
+        ClientOption(row.id, row.name)
+        for row in db.session.query(Client.id, Client.name).order_by(Client.name.asc())
+    ]
+    clients_by_id = {client.id: client for client in clients}
+    users = [
+        UserOption(row.id, row.first_name, row.last_name, f"{row.first_name} {row.last_name or ''}".strip(), row.role)
+        for row in db.session.query(User.id, User.first_name, User.last_name, User.role).order_by(User.first_name.asc())
+    ]
+    projects = [
+        ProjectOption(row.id, row.name, row.client_id, clients_by_id[row.client_id], row.status, row.is_default)
+        for row in db.session.query(
+            Project.id, Project.name, Project.client_id, Project.status, Project.is_default
+        ).order_by(Project.name.asc())
+        if row.client_id in clients_by_id
+    ]
+    memberships = [
+        MembershipOption(row.id, row.title)
+        for row in db.session.query(Membership.id, Membership.title).order_by(Membership.title.asc())
+    ]
+    return ReferenceData(version, tuple(clients), tuple(users), tuple(projects), tuple(memberships))
+
+
+def reference_data():
+    """Cached client/user/project/membership options, rebuilt after relevant commits."""
+    with _reference_cache_lock:
+        data = _reference_cache['data'] if _reference_cache['expires_at'] > time.monotonic() else None
+        version = _reference_cache['version']
+
+    if data is None:
+        data = _load_reference_data(version)
+        with _reference_cache_lock:
+            # Skip storing if a commit invalidated the cache while we were loading
+            if _reference_cache['version'] == version:
+                _reference_cache.update(data=data, expires_at=time.monotonic() + REFERENCE_CACHE_TTL_SECONDS)
+    return data
+
+
+def client_options():
+    return list(reference_data().clients)
+
+
+def user_options():
+    return list(reference_data().users)
+
+
+def admin_user_options():
+    return [user for user in reference_data().users if user.role == 'admin']
+
+
+def project_options(statuses=None, exclude_statuses=()):
+    """Projects (with a client) ordered by name, optionally filtered by status."""
+    return [
+        project for project in reference_data().projects
+        if (statuses is None or project.status in statuses) and project.status not in exclude_statuses
+    ]
+
+
+def membership_options():
+    return list(reference_data().memberships)
+
+# Public landing page cache: rendered HTML + strong ETag, shared by all visitors.
+# Dropped on commit of any row the page summarizes; the TTL bounds staleness across
+# gunicorn workers, which each hold their own copy.
+LANDING_CACHE_TTL_SECONDS = 60
+LANDING_CACHE_MODELS = (Log, Task, Project, ActivityLog, Client, Membership, MembershipFunding)
+_landing_cache = {'body': None, 'etag': None, 'expires_at': 0.0, 'generation': 0}
+_landing_cache_lock = threading.Lock()
+
+
+def invalidate_landing_cache():
+    with _landing_cache_lock:
+        _landing_cache['body'] = None
+        _landing_cache['etag'] = None
+        _landing_cache['generation'] += 1
+
+
+@event.listens_for(SASession, 'after_flush')
+def _flag_landing_cache_changes(session, flush_context):
+    if any(isinstance(obj, LANDING_CACHE_MODELS) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info['landing_cache_dirty'] = True
+
+
+@event.listens_for(SASession, 'after_commit')
+def _invalidate_landing_cache_on_commit(session):
+    if session.info.pop('landing_cache_dirty', False):
+        invalidate_landing_cache()
+
+
+@event.listens_for(SASession, 'after_soft_rollback')
+def _reset_landing_cache_flag(session, previous_transaction):
+    session.info.pop('landing_cache_dirty', None)
+
+
 @app.route('/')
 def index():
+    """Serve the public landing page from cache, answering If-None-Match with 304."""
+    with _landing_cache_lock:
+        body = _landing_cache['body'] if _landing_cache['expires_at'] > time.monotonic() else None
+        etag = _landing_cache['etag']
+        generation = _landing_cache['generation']
+
+    if body is None:
+        body = render_landing_page()
+        etag = hashlib.sha256(body.encode('utf-8')).hexdigest()[:32]
+        with _landing_cache_lock:
+            # Skip storing if a write invalidated the cache while we were rendering
+            if _landing_cache['generation'] == generation:
+                _landing_cache.update(
+                    body=body,
+                    etag=etag,
+                    expires_at=time.monotonic() + LANDING_CACHE_TTL_SECONDS,
+                )
+
+    response = make_response(body)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def render_landing_page():
     # Public landing page - show general metrics without sensitive data
-    from datetime import timedelta
-    from sqlalchemy import func
+    now = get_current_time()
     
     # Get public-friendly metrics
     total_projects = Project.query.filter_by(status='Active').count()  # Only active projects
     total_clients = Client.query.count()
-    total_active_projects = Project.query.filter_by(status='Active').count()
-    total_users = User.query.count()
-    now = get_current_time()
     total_memberships = db.session.query(Membership.id).join(
         MembershipFunding, MembershipFunding.membership_id == Membership.id
     ).filter(
@@ -803,127 +1030,20 @@ def index():
         MembershipFunding.end_date >= now
     ).distinct().count()
     open_tasks = Task.query.filter_by(is_complete=False).count()
-    total_equipment = Equipment.query.count()
     
-    # Last 30 days activity (including today)
-    thirty_days_ago = get_current_time() - timedelta(days=29)  # Changed from 30 to 29
-    
-    # Tasks completed in last 30 days (general count)
-    tasks_completed_recently = Task.query.filter(
-        Task.completed_on >= thirty_days_ago,
-        Task.is_complete == True
-    ).count()
-    
-    # Get daily task completion for chart (last 30 days, including today)
-    activity_data = []
-    for i in range(30):  # Back to 30 days
-        date = thirty_days_ago + timedelta(days=i)
-        date_start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        date_end = date_start + timedelta(days=1)
-        
-        daily_tasks = Task.query.filter(
-            Task.completed_on >= date_start,
-            Task.completed_on < date_end,
-            Task.is_complete == True
-        ).count()
-        
-        activity_data.append({
-            'date': date.strftime('%Y-%m-%d'),
-            'tasks': daily_tasks
-        })
-    
-    # Get trends data for chart (last 30 days) - Hours Logged and Projects Touched
-    trends_data = []
-    for i in range(30):
-        date = thirty_days_ago + timedelta(days=i)
-        date_start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        date_end = date_start + timedelta(days=1)
-        
-        # Calculate total hours logged for this day (including touch logs as 0.5 hours each)
-        detailed_hours = db.session.query(func.sum(Log.hours)).filter(
-            Log.created_at >= date_start,
-            Log.created_at < date_end,
-            Log.is_touch.is_(False),
-            Log.hours.isnot(None)
-        ).scalar() or 0
-        
-        # Get actual hours from touch logs
-        touch_hours = db.session.query(func.sum(Log.hours)).filter(
-            Log.created_at >= date_start,
-            Log.created_at < date_end,
-            Log.is_touch.is_(True),
-            Log.hours.isnot(None)
-        ).scalar() or 0
-        
-        total_hours = detailed_hours + touch_hours
-        
-        # Calculate projects touched based on activity logs
-        projects_touched = set()
-        
-        try:
-            # Get activity logs for this day
-            daily_activities = ActivityLog.query.filter(
-                ActivityLog.created_at >= date_start,
-                ActivityLog.created_at < date_end
-            ).all()
-            
-            for activity in daily_activities:
-                project_id = None
-                
-                if activity.activity_type == 'task_completed':
-                    # Get project from task
-                    if activity.new_value and 'project_id' in activity.new_value:
-                        project_id = activity.new_value['project_id']
-                
-                elif activity.activity_type == 'project_status_change':
-                    # Entity_id is the project_id
-                    project_id = activity.entity_id
-                
-                elif activity.activity_type in ['time_logged', 'touch_logged']:
-                    # Get project from log entry
-                    if activity.entity_type == 'log':
-                        log_entry = db.session.get(Log, activity.entity_id)
-                        if log_entry:
-                            project_id = log_entry.project_id
-                
-                if project_id:
-                    projects_touched.add(project_id)
-        
-        except Exception as e:
-            # If ActivityLog table doesn't exist or there's an error, default to 0
-            projects_touched = set()
-        
-        trends_data.append({
-            'date': date.strftime('%Y-%m-%d'),
-            'hours': round(total_hours, 1),
-            'projects_touched': len(projects_touched)
-        })
-    
-    # Get task velocity data (tasks completed per day, last 30 days)
-    task_velocity_data = []
-    for i in range(30):
-        date = thirty_days_ago + timedelta(days=i)
-        date_start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        date_end = date_start + timedelta(days=1)
-        
-        daily_tasks = Task.query.filter(
-            Task.completed_on >= date_start,
-            Task.completed_on < date_end,
-            Task.is_complete == True
-        ).count()
-        
-        task_velocity_data.append({
-            'date': date.strftime('%Y-%m-%d'),
-            'tasks_completed': daily_tasks
-        })
+    # Last 30 days (including today), bucketed by Chicago day
+    daily_rollup = build_daily_rollup(days=30)
     
     # Project Status Data for pie chart (exclude default project)
-    project_status_data = {
-        'Active': Project.query.filter(Project.status == 'Active', Project.is_default == False).count(),
-        'Awaiting': Project.query.filter(Project.status == 'Awaiting', Project.is_default == False).count(),
-        'Paused': Project.query.filter(Project.status == 'Paused', Project.is_default == False).count(),
-        'Archived': Project.query.filter(Project.status == 'Archived', Project.is_default == False).count()
-    }
+    project_status_data = {'Active': 0, 'Awaiting': 0, 'Paused': 0, 'Archived': 0}
+    status_rows = db.session.query(
+        Project.status, func.count(Project.id)
+    ).filter(
+        Project.is_default == False,
+        Project.status.in_(list(project_status_data.keys()))
+    ).group_by(Project.status).all()
+    for status, count in status_rows:
+        project_status_data[status] = count
     
     # Recent Activity for public display (limit 10 items, sanitized)
     public_activities = []
@@ -999,9 +1119,7 @@ def index():
                          total_projects=total_projects,
                          total_clients=total_clients,
                          open_tasks=open_tasks,
-                         activity_data=activity_data,
-                         trends_data=trends_data,
-                         task_velocity_data=task_velocity_data,
+                         daily_rollup=daily_rollup,
                          project_status_data=project_status_data,
                          public_activities=public_activities)
 
@@ -1105,20 +1223,20 @@ def dashboard():
     user = db.session.get(User, session['user_id'])
     
     # Get tasks assigned to current user - filter out completed (for dashboard widget)
-    tasks_for_me_query = Task.query.filter(
+    tasks_for_me_query = Task.query.options(*task_load_options()).filter(
         (Task.assigned_to == session['user_id']) &
         (Task.is_complete == False)
     ).order_by(Task.created_at.desc()).all()
     
     # Get tasks created by current user - filter out completed (for dashboard widget)
-    tasks_i_created_query = Task.query.filter(
+    tasks_i_created_query = Task.query.options(*task_load_options()).filter(
         (Task.created_by == session['user_id']) &
         (Task.is_complete == False)
     ).order_by(Task.created_at.desc()).all()
     
     # Serialize tasks for JSON
-    tasks_for_me = [serialize_task(task) for task in tasks_for_me_query]
-    tasks_i_created = [serialize_task(task) for task in tasks_i_created_query]
+    tasks_for_me = serialize_tasks(tasks_for_me_query, session['user_id'])
+    tasks_i_created = serialize_tasks(tasks_i_created_query, session['user_id'])
     
     # Get upcoming equipment appointments
     from datetime import datetime, timedelta
@@ -1169,91 +1287,29 @@ def dashboard():
     recent_activities = []
     try:
         # Check if ActivityLog table exists by trying to query it
-        recent_activities = ActivityLog.query.order_by(ActivityLog.created_at.desc()).limit(10).all()
+        recent_activities = ActivityLog.query.order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc()).limit(10).all()
     except Exception as e:
         print(f"Warning: ActivityLog table not available: {e}")
         # Set empty list to prevent further errors
         recent_activities = []
     
-    # Process activities for display - combine all into single list for proper ordering
-    all_activities = []
-    
+    # Process activities for display - tasks and logs are loaded in one batch per type
     try:
-        for activity in recent_activities:
-            if activity.activity_type == 'task_completed':
-                # Get the task details
-                task = db.session.get(Task, activity.entity_id)
-                if task:
-                    all_activities.append({
-                        'type': 'task_completed',
-                        'data': serialize_task(task),
-                        'created_at': activity.created_at
-                    })
-            elif activity.activity_type == 'task_created' and activity.entity_id:
-                # Get the task details for assignments
-                task = db.session.get(Task, activity.entity_id)
-                if task:
-                    all_activities.append({
-                        'type': 'task_created',
-                        'data': serialize_task(task),
-                        'created_at': activity.created_at
-                    })
-            elif activity.activity_type == 'time_logged':
-                # Get the log details
-                log = db.session.get(Log, activity.entity_id)
-                if log:
-                    all_activities.append({
-                        'type': 'time_logged',
-                        'data': log,
-                        'created_at': activity.created_at
-                    })
-            elif activity.activity_type == 'project_status_change':
-                all_activities.append({
-                    'type': 'project_status_change',
-                    'data': activity,
-                    'created_at': activity.created_at
-                })
-            elif activity.activity_type == 'client_created':
-                all_activities.append({
-                    'type': 'client_created',
-                    'data': activity,
-                    'created_at': activity.created_at
-                })
-            elif activity.activity_type in ['membership_supplement_added', 'membership_funding_added']:
-                all_activities.append({
-                    'type': 'membership_funding_added',
-                    'data': activity,
-                    'created_at': activity.created_at
-                })
-            elif activity.activity_type == 'user_created':
-                all_activities.append({
-                    'type': 'user_created',
-                    'data': activity,
-                    'created_at': activity.created_at
-                })
-            elif activity.activity_type == 'project_created':
-                all_activities.append({
-                    'type': 'project_created',
-                    'data': activity,
-                    'created_at': activity.created_at
-                })
-            elif activity.activity_type == 'membership_created':
-                all_activities.append({
-                    'type': 'membership_created',
-                    'data': activity,
-                    'created_at': activity.created_at
-                })
+        all_activities = hydrate_activity_feed(recent_activities, session['user_id'])
     except Exception as e:
         print(f"Warning: Error processing activities: {e}")
+        all_activities = []
     
-    # Get active projects for kanban board (exclude default project)
-    active_projects = Project.query.filter(Project.status == 'Active', Project.is_default == False).order_by(Project.name.asc()).all()
-    awaiting_projects = Project.query.filter(Project.status == 'Awaiting', Project.is_default == False).order_by(Project.name.asc()).all()
-    paused_projects = Project.query.filter(Project.status == 'Paused', Project.is_default == False).order_by(Project.name.asc()).all()
+    # Kanban board (exclude default project): per-status counts and the first
+    # page of each column; further cards are paged in from /api/kanban/<status>
+    kanban_counts_by_status, kanban_columns = kanban_board(*kanban_criteria(exclude_default=True))
+    active_projects = kanban_columns['Active']['projects']
+    awaiting_projects = kanban_columns['Awaiting']['projects']
+    paused_projects = kanban_columns['Paused']['projects']
     
     # Get clients and users for project forms
-    clients = Client.query.order_by(Client.name.asc()).all()
-    users = User.query.filter_by(role='admin').order_by(User.first_name.asc()).all()
+    clients = client_options()
+    users = admin_user_options()
     
     # Get current day of week for greeting
     day_of_week = now_central.strftime('%A')
@@ -1270,6 +1326,8 @@ def dashboard():
                          active_projects=active_projects,
                          awaiting_projects=awaiting_projects,
                          paused_projects=paused_projects,
+                         kanban_counts=kanban_counts_by_status,
+                         kanban_cursors={status: column['next_cursor'] for status, column in kanban_columns.items()},
                          # Form data
                          clients=clients,
                          users=users)
@@ -1310,7 +1368,7 @@ def get_users():
     if 'user_id' not in session:
         return {'users': []}, 401
     
-    users = User.query.all()
+    users = user_options()
     return {
         'users': [
             {
@@ -1327,7 +1385,7 @@ def get_memberships():
     if 'user_id' not in session:
         return {'memberships': []}, 401
     
-    memberships = Membership.query.all()
+    memberships = membership_options()
     return {
         'memberships': [
             {
@@ -1343,7 +1401,7 @@ def get_clients():
     if 'user_id' not in session:
         return {'clients': []}, 401
     
-    clients = Client.query.all()
+    clients = client_options()
     return {
         'clients': [
             {
@@ -1354,569 +1412,397 @@ def get_clients():
         ]
     }
 
-@app.route('/api/export-report', methods=['POST'])
+@app.route('/api/export-report', methods=['GET', 'POST'])
 def export_report():
+    """Report workbook for a date range, served from the on-disk report cache (ETag / Last-Modified)."""
     if 'user_id' not in session:
         return {'error': 'Not logged in'}, 401
     
     try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-        from openpyxl.utils import get_column_letter
-        from datetime import datetime, timedelta
-        import io
-        
-        # Get form data (support JSON or form-encoded)
-        data = request.get_json(silent=True) or request.form
-        start_date_str = data.get('start_date')
-        end_date_str = data.get('end_date')
+        # Get form data (support JSON, form-encoded or query args)
+        data = request.get_json(silent=True) or request.form or request.args
+        start_date = datetime.strptime(data.get('start_date'), '%Y-%m-%d')
+        end_date = datetime.strptime(data.get('end_date'), '%Y-%m-%d')
         filter_type = data.get('filter_type', 'all')
         filter_value = data.get('filter_value', '')
         
-        # Parse dates
-        start_date = datetime.strptime(start_date_str, '%Y-%m-%d')
-        end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
-        
-        # Create workbook
-        wb = Workbook()
-        
-        # Remove default sheet
-        wb.remove(wb.active)
-        
-        # Create header sheet
-        header_ws = wb.create_sheet("Report Info")
-        
-        # Add header information
-        header_ws['A1'] = "Hub Tracker Report"
-        header_ws['A1'].font = Font(size=16, bold=True)
-        
-        header_ws['A3'] = "Date Range:"
-        header_ws['B3'] = f"{start_date.strftime('%B %d, %Y')} - {end_date.strftime('%B %d, %Y')}"
-        
-        header_ws['A4'] = "Filter:"
-        if filter_type == 'all':
-            header_ws['B4'] = "All Memberships and Clients"
-        elif filter_type == 'membership':
-            membership = db.session.get(Membership, filter_value)
-            header_ws['B4'] = f"Membership: {membership.title if membership else 'Unknown'}"
-        elif filter_type == 'client':
-            client = db.session.get(Client, filter_value)
-            header_ws['B4'] = f"Client: {client.name if client else 'Unknown'}"
-        
-        header_ws['A6'] = "Generated:"
-        header_ws['B6'] = datetime.now().strftime('%B %d, %Y at %I:%M %p')
-        
-        # Auto-adjust column widths
-        for column in header_ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            header_ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Create data sheet
-        data_ws = wb.create_sheet("Project Data")
-        
-        # Define styles
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        membership_font = Font(bold=True, size=12)
-        membership_fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-        client_font = Font(bold=True)
-        client_fill = PatternFill(start_color="E7E6E6", end_color="E7E6E6", fill_type="solid")
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        # Add headers
-        headers = [
-            "Membership", "Client", "Project", "Log Type", "User", "Date/Time", "Hours", "Cost", "Notes", "Status"
-        ]
-        for col, header in enumerate(headers, 1):
-            cell = data_ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.border = border
-            cell.alignment = Alignment(horizontal="center")
-        
-        # Helper function to calculate project totals
-        def calculate_project_totals(project_id, start_date, end_date):
-            """Calculate total hours and cost for a project within date range"""
-            from sqlalchemy import func
-            from datetime import timedelta
-            
-            # Get detailed logs with actual hours and costs
-            detailed_logs = db.session.query(
-                func.sum(Log.hours).label('total_hours'),
-                func.sum(Log.fixed_cost).label('total_cost')
-            ).filter(
-                Log.project_id == project_id,
-                Log.created_at >= start_date,
-                Log.created_at < end_date + timedelta(days=1),
-                Log.is_touch.is_(False)
-            ).first()
-            
-            # Get actual hours from touch logs
-            touch_hours = db.session.query(func.sum(Log.hours)).filter(
-                Log.project_id == project_id,
-                Log.created_at >= start_date,
-                Log.created_at < end_date + timedelta(days=1),
-                Log.is_touch.is_(True),
-                Log.hours.isnot(None)
-            ).scalar() or 0
-            
-            total_hours = float(detailed_logs.total_hours or 0) + touch_hours
-            total_cost = float(detailed_logs.total_cost or 0)
-            
-            return total_hours, total_cost
-        
-        # Helper function to calculate membership remaining
-        def calculate_membership_remaining(membership_id):
-            """Calculate remaining budget and time for a membership, using funding-aware totals"""
-            membership = db.session.get(Membership, membership_id)
-            if not membership:
-                return 0, 0
-            # Use active funding-aware properties directly
-            total_budget = float(membership.total_budget or 0)
-            total_time = float(membership.total_time or 0)
-            earliest_funding_start = membership.funding_entries.order_by(MembershipFunding.start_date.asc()).first()
-            start_anchor = earliest_funding_start.start_date if earliest_funding_start else datetime(2020, 1, 1)
-            # Calculate used cost and time for this membership (all clients/projects)
-            clients = Client.query.filter_by(membership_id=membership_id).all()
-            client_ids = [c.id for c in clients]
-            projects = Project.query.filter(Project.client_id.in_(client_ids)).all()
-            used_cost = 0
-            used_time = 0
-            for project in projects:
-                hours, cost = calculate_project_totals(project.id, start_anchor, datetime.now())
-                used_time += hours
-                used_cost += cost
-            remaining_budget = total_budget - used_cost
-            remaining_time = total_time - used_time
-            return remaining_budget, remaining_time
-        
-        # Get memberships based on filter
-        if filter_type == 'membership':
-            memberships = [db.session.get(Membership, filter_value)] if filter_value else []
-        elif filter_type == 'client':
-            client = db.session.get(Client, filter_value)
-            memberships = [client.membership] if client and client.membership else []
-        else:  # all
-            memberships = Membership.query.all()
-        
-        # Build report data
-        row = 2
-        membership_summaries = []
-        
-        for membership in memberships:
-            if not membership:
-                continue
-                
-            # Add membership header (merged row for clarity)
-            membership_cell = data_ws.cell(row=row, column=1, value=membership.title)
-            membership_cell.font = membership_font
-            membership_cell.fill = membership_fill
-            membership_cell.border = border
-            row += 1
-
-            clients = Client.query.filter_by(membership_id=membership.id).all()
-            membership_total_hours = 0
-            membership_total_cost = 0
-
-            for client in clients:
-                projects = Project.query.filter_by(client_id=client.id).all()
-                
-                # Check if this client has any projects with activity in the date range
-                client_has_activity = False
-                for project in projects:
-                    logs = Log.query.filter(
-                        Log.project_id == project.id,
-                        Log.created_at >= start_date,
-                        Log.created_at < end_date + timedelta(days=1)
-                    ).first()
-                    if logs:
-                        client_has_activity = True
-                        break
-                
-                # Skip clients with no activity in the date range
-                if not client_has_activity:
-                    continue
-
-                # Add client header (merged row for clarity)
-                client_cell = data_ws.cell(row=row, column=2, value=client.name)
-                client_cell.font = client_font
-                client_cell.fill = client_fill
-                client_cell.border = border
-                row += 1
-
-                client_total_hours = 0
-                client_total_cost = 0
-
-                for project in projects:
-                    # Fetch all logs for this project in the date range first
-                    logs = Log.query.filter(
-                        Log.project_id == project.id,
-                        Log.created_at >= start_date,
-                        Log.created_at < end_date + timedelta(days=1)
-                    ).order_by(Log.created_at).all()
-
-                    # Skip projects with no activity in the date range
-                    if not logs:
-                        continue
-
-                    # Add project header (merged row for clarity)
-                    project_cell = data_ws.cell(row=row, column=3, value=project.name)
-                    project_cell.font = Font(italic=True)
-                    project_cell.border = border
-                    row += 1
-
-                    project_hours = 0
-                    project_cost = 0
-
-                    for log in logs:
-                        log_type = "Project Touched" if log.is_touch else "Time/Cost Log"
-                        user_name = log.user.full_name if log.user else "Unknown"
-                        dt_str = log.created_at.strftime('%Y-%m-%d %I:%M %p') if log.created_at else ""
-                        hours = float(log.hours or 0)
-                        cost = float(log.fixed_cost or 0)
-                        notes = log.notes or ""
-                        status = project.status
-
-                        # Write log row
-                        data_ws.cell(row=row, column=1, value=membership.title).border = border
-                        data_ws.cell(row=row, column=2, value=client.name).border = border
-                        data_ws.cell(row=row, column=3, value=project.name).border = border
-                        data_ws.cell(row=row, column=4, value=log_type).border = border
-                        data_ws.cell(row=row, column=5, value=user_name).border = border
-                        data_ws.cell(row=row, column=6, value=dt_str).border = border
-                        data_ws.cell(row=row, column=7, value=hours).border = border
-                        data_ws.cell(row=row, column=8, value=cost).border = border
-                        data_ws.cell(row=row, column=9, value=notes).border = border
-                        data_ws.cell(row=row, column=10, value=status).border = border
-
-                        project_hours += hours if not log.is_touch else 0.5
-                        project_cost += cost
-                        client_total_hours += hours if not log.is_touch else 0.5
-                        client_total_cost += cost
-                        membership_total_hours += hours if not log.is_touch else 0.5
-                        membership_total_cost += cost
-                        row += 1
-
-                    # Project summary row
-                    if logs:
-                        data_ws.cell(row=row, column=3, value=f"{project.name} - TOTAL")
-                        data_ws.cell(row=row, column=7, value=round(project_hours, 2))
-                        data_ws.cell(row=row, column=8, value=round(project_cost, 2))
-                        data_ws.cell(row=row, column=10, value="PROJECT TOTAL")
-                        for col in range(1, 11):
-                            cell = data_ws.cell(row=row, column=col)
-                            cell.font = Font(bold=True)
-                            cell.fill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
-                            cell.border = border
-                        row += 1
-
-                # Client summary row
-                if projects:
-                    data_ws.cell(row=row, column=2, value=f"{client.name} - TOTAL")
-                    data_ws.cell(row=row, column=7, value=round(client_total_hours, 2))
-                    data_ws.cell(row=row, column=8, value=round(client_total_cost, 2))
-                    data_ws.cell(row=row, column=10, value="CLIENT TOTAL")
-                    for col in range(1, 11):
-                        cell = data_ws.cell(row=row, column=col)
-                        cell.font = Font(bold=True)
-                        cell.fill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
-                        cell.border = border
-                    row += 1
-
-            # Membership summary row
-            if clients:
-                data_ws.cell(row=row, column=1, value=f"{membership.title} - TOTAL")
-                data_ws.cell(row=row, column=7, value=round(membership_total_hours, 2))
-                data_ws.cell(row=row, column=8, value=round(membership_total_cost, 2))
-                data_ws.cell(row=row, column=10, value="MEMBERSHIP TOTAL")
-                for col in range(1, 11):
-                    cell = data_ws.cell(row=row, column=col)
-                    cell.font = Font(bold=True, size=12)
-                    cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-                    cell.border = border
-                row += 1
-                
-                # Calculate and store membership remaining
-                remaining_budget, remaining_time = calculate_membership_remaining(membership.id)
-                membership_summaries.append({
-                    'name': membership.title,
-                    'total_hours': membership_total_hours,
-                    'total_cost': membership_total_cost,
-                    'remaining_budget': remaining_budget,
-                    'remaining_time': remaining_time
-                })
+        # Rebuilt only when the report's data has changed since the cached copy
+        path, key = report_export.cached_report(start_date, end_date, filter_type, filter_value)
         
-        # Unassociated Projects Section - only include when not filtering by specific membership or client
-        if filter_type == 'all':
-            unassoc_clients = Client.query.filter(Client.membership_id.is_(None)).all()
-            if unassoc_clients:
-                # Section header
-                data_ws.cell(row=row, column=1, value="Unassociated Projects").font = Font(bold=True, size=12)
-                data_ws.cell(row=row, column=1).fill = PatternFill(start_color="FCE4D6", end_color="FCE4D6", fill_type="solid")
-                row += 1
-            
-            for client in unassoc_clients:
-                projects = Project.query.filter_by(client_id=client.id).all()
-                
-                # Check if this client has any projects with activity in the date range
-                client_has_activity = False
-                for project in projects:
-                    logs = Log.query.filter(
-                        Log.project_id == project.id,
-                        Log.created_at >= start_date,
-                        Log.created_at < end_date + timedelta(days=1)
-                    ).first()
-                    if logs:
-                        client_has_activity = True
-                        break
-                
-                # Skip clients with no activity in the date range
-                if not client_has_activity:
-                    continue
-                
-                # Client header
-                client_cell = data_ws.cell(row=row, column=2, value=client.name)
-                client_cell.font = client_font
-                client_cell.fill = client_fill
-                client_cell.border = border
-                row += 1
-                
-                client_total_hours = 0
-                client_total_cost = 0
-                
-                for project in projects:
-                    # Fetch all logs for this project in the date range first
-                    logs = Log.query.filter(
-                        Log.project_id == project.id,
-                        Log.created_at >= start_date,
-                        Log.created_at < end_date + timedelta(days=1)
-                    ).order_by(Log.created_at).all()
-                    
-                    # Skip projects with no activity in the date range
-                    if not logs:
-                        continue
-                    
-                    # Project header
-                    project_cell = data_ws.cell(row=row, column=3, value=project.name)
-                    project_cell.font = Font(italic=True)
-                    project_cell.border = border
-                    row += 1
-                    
-                    project_hours = 0
-                    project_cost = 0
-                    
-                    for log in logs:
-                        log_type = "Project Touched" if log.is_touch else "Time/Cost Log"
-                        user_name = log.user.full_name if log.user else "Unknown"
-                        dt_str = log.created_at.strftime('%Y-%m-%d %I:%M %p') if log.created_at else ""
-                        hours = float(log.hours or 0)
-                        cost = float(log.fixed_cost or 0)
-                        notes = log.notes or ""
-                        status = project.status
-                        
-                        # Write log row
-                        data_ws.cell(row=row, column=1, value="Unassociated").border = border
-                        data_ws.cell(row=row, column=2, value=client.name).border = border
-                        data_ws.cell(row=row, column=3, value=project.name).border = border
-                        data_ws.cell(row=row, column=4, value=log_type).border = border
-                        data_ws.cell(row=row, column=5, value=user_name).border = border
-                        data_ws.cell(row=row, column=6, value=dt_str).border = border
-                        data_ws.cell(row=row, column=7, value=hours).border = border
-                        data_ws.cell(row=row, column=8, value=cost).border = border
-                        data_ws.cell(row=row, column=9, value=notes).border = border
-                        data_ws.cell(row=row, column=10, value=status).border = border
-                        
-                        project_hours += hours if not log.is_touch else 0.5
-                        project_cost += cost
-                        client_total_hours += hours if not log.is_touch else 0.5
-                        client_total_cost += cost
-                        row += 1
-                    
-                    # Project summary row
-                    if logs:
-                        data_ws.cell(row=row, column=3, value=f"{project.name} - TOTAL")
-                        data_ws.cell(row=row, column=7, value=round(project_hours, 2))
-                        data_ws.cell(row=row, column=8, value=round(project_cost, 2))
-                        data_ws.cell(row=row, column=10, value="PROJECT TOTAL")
-                        for col in range(1, 11):
-                            cell = data_ws.cell(row=row, column=col)
-                            cell.font = Font(bold=True)
-                            cell.fill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
-                            cell.border = border
-                        row += 1
-                
-                # Client summary row
-                if projects:
-                    data_ws.cell(row=row, column=2, value=f"{client.name} - TOTAL")
-                    data_ws.cell(row=row, column=7, value=round(client_total_hours, 2))
-                    data_ws.cell(row=row, column=8, value=round(client_total_cost, 2))
-                    data_ws.cell(row=row, column=10, value="CLIENT TOTAL")
-                    for col in range(1, 11):
-                        cell = data_ws.cell(row=row, column=col)
-                        cell.font = Font(bold=True)
-                        cell.fill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
-                        cell.border = border
-                    row += 1
-        
-        # Create summary sheet
-        summary_ws = wb.create_sheet("Membership Summary")
-        
-        # Add summary headers
-        summary_headers = ["Membership", "Total Hours (Period)", "Total Cost (Period)", "Remaining Budget", "Remaining Time"]
-        for col, header in enumerate(summary_headers, 1):
-            cell = summary_ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.border = border
-            cell.alignment = Alignment(horizontal="center")
-        
-        # Add summary data
-        for i, summary in enumerate(membership_summaries, 2):
-            summary_ws.cell(row=i, column=1, value=summary['name']).border = border
-            summary_ws.cell(row=i, column=2, value=round(summary['total_hours'], 2)).border = border
-            summary_ws.cell(row=i, column=3, value=round(summary['total_cost'], 2)).border = border
-            summary_ws.cell(row=i, column=4, value=round(summary['remaining_budget'], 2)).border = border
-            summary_ws.cell(row=i, column=5, value=round(summary['remaining_time'], 2)).border = border
-        
-        # Auto-adjust column widths for data sheet
-        for column in data_ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            data_ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Auto-adjust column widths for summary sheet
-        for column in summary_ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            summary_ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Save to bytes
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
-        
-        # Generate filename
-        filename = f"hub_tracker_report_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.xlsx"
-        
-        return send_file(
-            output,
+        response = send_file(
+            path,
             as_attachment=True,
-            download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            download_name=report_export.report_filename(start_date, end_date),
+            mimetype=report_export.XLSX_MIMETYPE,
+            etag=key
         )
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
         
     except Exception as e:
         print(f"Export error: {str(e)}")
         return {'error': f'Export failed: {str(e)}'}, 500
 
+def job_json(job):
+    data = job.to_dict()
+    data['status_url'] = url_for('job_status', job_id=job.id)
+    if job.status == 'succeeded':
+        data['download_url'] = url_for('download_job_result', job_id=job.id)
+    return data
+
+def visible_job(job_id):
+    """The job if the session user owns it (admins see all), else 404."""
+    job = db.session.get(Job, job_id)
+    if not job or (job.user_id != session['user_id'] and session.get('role') != 'admin'):
+        abort(404)
+    return job
+
+@app.route('/api/jobs', methods=['POST'])
+def enqueue_job():
+    """Queue a background job (report exports) for `flask jobs worker`; poll status_url for the result."""
+    if 'user_id' not in session:
+        return {'error': 'Not logged in'}, 401
+    
+    data = request.get_json(silent=True) or {}
+    kind = data.get('kind')
+    if kind in jobs.ADMIN_JOB_KINDS and session.get('role') != 'admin':
+        return {'error': 'Access denied'}, 403
+    try:
+        params = jobs.validate_params(kind, data.get('params'))
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    
+    job = Job.enqueue(kind, params, user_id=session['user_id'])
+    db.session.commit()
+    return {'job': job_json(job)}, 202
+
+@app.route('/api/jobs/<int:job_id>')
+def job_status(job_id):
+    if 'user_id' not in session:
+        return {'error': 'Not logged in'}, 401
+    return {'job': job_json(visible_job(job_id))}
+
+@app.route('/api/jobs/<int:job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Withdraw a job no worker has picked up yet; 409 once it is running or finished."""
+    if 'user_id' not in session:
+        return {'error': 'Not logged in'}, 401
+    job = visible_job(job_id)
+    if not Job.cancel(job.id):
+        db.session.rollback()
+        return {'error': 'Job has already started', 'job': job_json(job)}, 409
+    db.session.commit()
+    return {'success': True}
+
+@app.route('/api/jobs/<int:job_id>/download')
+def download_job_result(job_id):
+    if 'user_id' not in session:
+        return {'error': 'Not logged in'}, 401
+    job = visible_job(job_id)
+    if job.status != 'succeeded' or not job.result_path or not os.path.exists(job.result_path):
+        return {'error': 'Result not available', 'job': job_json(job)}, 404
+    return send_file(
+        job.result_path,
+        as_attachment=True,
+        download_name=job.result_name,
+        mimetype=job.result_mimetype
+    )
+
+TASK_PAGE_DEFAULT_LIMIT = 50
+TASK_PAGE_MAX_LIMIT = 200
+
+def _user_filter_arg(name):
+    """Read a user-id query arg, accepting 'me' for the session user."""
+    value = request.args.get(name)
+    if not value:
+        return None
+    if value == 'me':
+        return session['user_id']
+    return int(value)
+
+def task_page(query, sort_column, cursor=None, limit=TASK_PAGE_DEFAULT_LIMIT):
+    """One newest-first keyset page of a Task query on (sort_column, id): (tasks, next_cursor)."""
+    if cursor:
+        cursor_value, cursor_id = cursor
+        query = query.filter(or_(
+            sort_column < cursor_value,
+            and_(sort_column == cursor_value, Task.id < cursor_id)
+        ))
+    page = query.options(*task_load_options()).order_by(
+        sort_column.desc(), Task.id.desc()
+    ).limit(limit + 1).all()
+    if len(page) <= limit:
+        return page, None
+    page = page[:limit]
+    return page, encode_keyset_cursor(getattr(page[-1], sort_column.key), page[-1].id)
+
+def task_page_response(query, sort_column, default_limit=TASK_PAGE_DEFAULT_LIMIT):
+    """Keyset-paginate a Task query newest-first on (sort_column, id) and return JSON.
+
+    Honors ?limit=, ?cursor= (next_cursor from the previous page), the assignee/
+    creator/project/flagged filters, the ?mentions= (user) and ?mentions_project=
+    tag filters, and ?fields= to trim each task dict.
+    """
+    try:
+        assigned_to = _user_filter_arg('assigned_to')
+        created_by = _user_filter_arg('created_by')
+        mentions = _user_filter_arg('mentions')
+        project_id = request.args.get('project_id', type=int)
+        mentions_project = request.args.get('mentions_project', type=int)
+        cursor = decode_keyset_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify({'error': 'Invalid filter or cursor'}), 400
+    
+    limit = min(max(request.args.get('limit', default_limit, type=int), 1), TASK_PAGE_MAX_LIMIT)
+    
+    if assigned_to is not None:
+        query = query.filter(Task.assigned_to == assigned_to)
+    if created_by is not None:
+        query = query.filter(Task.created_by == created_by)
+    if project_id is not None:
+        query = query.filter(Task.project_id == project_id)
+    if mentions is not None:
+        query = query.filter(Task.id.in_(TaskMention.task_ids_mentioning('user', mentions)))
+    if mentions_project is not None:
+        query = query.filter(Task.id.in_(TaskMention.task_ids_mentioning('project', mentions_project)))
+    if request.args.get('flagged') in ('1', 'true'):
+        query = query.filter(Task.id.in_(
+            db.session.query(UserTaskFlag.task_id).filter(UserTaskFlag.user_id == session['user_id'])
+        ))
+    
+    page, next_cursor = task_page(query, sort_column, cursor, limit)
+    tasks_data = serialize_tasks(page, session['user_id'])
+    fields = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip()]
+    if fields:
+        fields = set(fields) | {'id'}
+        tasks_data = [{k: v for k, v in task.items() if k in fields} for task in tasks_data]
+    
+    return jsonify({'tasks': tasks_data, 'next_cursor': next_cursor})
+
 @app.route('/api/tasks')
 def get_tasks():
+    """Open tasks, newest first, one page at a time."""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
+    
+    return task_page_response(Task.query.filter(Task.is_complete == False), Task.created_at)
+
+@app.route('/api/completed-tasks')
+def get_completed_tasks():
+    """Completed tasks, most recently completed first, one page at a time."""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
+    
+    return task_page_response(
+        Task.query.filter(Task.is_complete == True, Task.completed_on.isnot(None)),
+        Task.completed_on,
+        default_limit=10,
+    )
+
+@app.route('/api/client/<int:client_id>/tasks')
+def get_client_tasks(client_id):
+    """All of a client's tasks (open and completed), newest first, one page at a time."""
     if 'user_id' not in session:
         return jsonify({'error': 'Not logged in'}), 401
     
-    # Get all tasks with their related data
-    tasks = Task.query.filter(
-        Task.is_complete == False  # Only get incomplete tasks for main list
+    Client.query.get_or_404(client_id)
+    return task_page_response(client_tasks_query(client_id), Task.created_at)
+
+def client_tasks_query(client_id):
+    return Task.query.join(Project, Project.id == Task.project_id).filter(Project.client_id == client_id)
+
+# Log lists on detail pages render a first page server-side and page the rest
+# through the /api/<entity>/<id>/logs endpoints below.
+LOG_PAGE_SIZE = 50
+
+def project_logs_query(project_id):
+    return Log.query.filter(Log.project_id == project_id)
+
+def client_logs_query(client_id):
+    return Log.query.join(Project, Project.id == Log.project_id).filter(Project.client_id == client_id)
+
+def membership_logs_query(membership_id):
+    return Log.query.join(
+        Project, Project.id == Log.project_id
     ).join(
-        User, User.id == Task.created_by, aliased=True
-    ).outerjoin(
-        Project, Project.id == Task.project_id
-    ).outerjoin(
         Client, Client.id == Project.client_id
-    ).outerjoin(
-        User, User.id == Task.assigned_to, aliased=True
-    ).outerjoin(
-        User, User.id == Task.completed_by_user_id, aliased=True
-    ).all()
+    ).filter(Client.membership_id == membership_id)
+
+def log_page(query, cursor=None, limit=LOG_PAGE_SIZE):
+    """One newest-first keyset page of a Log query, eager-loaded for logs_table: (logs, next_cursor)."""
+    query = query.options(joinedload(Log.user), joinedload(Log.project).joinedload(Project.client))
+    if cursor:
+        cursor_time, cursor_id = cursor
+        query = query.filter(or_(
+            Log.created_at < cursor_time,
+            and_(Log.created_at == cursor_time, Log.id < cursor_id)
+        ))
+    page = query.order_by(Log.created_at.desc(), Log.id.desc()).limit(limit + 1).all()
+    if len(page) <= limit:
+        return page, None
+    page = page[:limit]
+    return page, encode_keyset_cursor(page[-1].created_at, page[-1].id)
+
+def serialize_log(log):
+    return {
+        'id': log.id,
+        'created_at': log.created_at.isoformat(),
+        'user_id': log.user_id,
+        'user_name': log.user.full_name if log.user else None,
+        'project_id': log.project_id,
+        'project_name': log.project.name if log.project else None,
+        'client_name': log.project.client.name if log.project and log.project.client else None,
+        'is_touch': log.is_touch,
+        'hours': log.hours,
+        'fixed_cost': float(log.fixed_cost) if log.fixed_cost is not None else None,
+        'notes': log.notes,
+    }
+
+def log_page_response(query):
+    """JSON page of logs plus the same rows rendered by the logs_table partial."""
+    try:
+        cursor = decode_keyset_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    limit = min(max(request.args.get('limit', LOG_PAGE_SIZE, type=int), 1), 200)
     
-    # Convert tasks to dictionary
-    tasks_data = []
-    for task in tasks:
-        task_dict = {
-            'id': task.id,
-            'description': task.description,
-            'is_complete': task.is_complete,
-            'completed_on': task.completed_on.isoformat() if task.completed_on else None,
-            'created_at': task.created_at.isoformat(),
-            'project_id': task.project_id,
-            'project_name': task.project.name if task.project else None,
-            'client_name': task.project.client.name if task.project and task.project.client else None,
-            'assigned_to_id': task.assigned_to,
-            'assigned_to_name': task.assignee.full_name if task.assignee else None,
-            'created_by_id': task.created_by,
-            'created_by_name': task.creator.full_name if task.creator else None,
-            'completed_by_id': task.completed_by_user_id,
-            'completed_by_name': task.completer.full_name if task.completer else None,
-            'is_flagged': bool(task.flags.filter_by(user_id=session['user_id']).first())
-        }
-        tasks_data.append(task_dict)
+    logs, next_cursor = log_page(query, cursor, limit)
+    return jsonify({
+        'logs': [serialize_log(log) for log in logs],
+        'html': render_template('partials/logs_table_rows.html', logs=logs, show_log_actions=True),
+        'next_cursor': next_cursor,
+    })
+
+LOG_EXPORT_COLUMNS = (
+    'id', 'created_at', 'user_id', 'user_name', 'project_id', 'project_name', 'client_id', 'client_name',
+    'membership_id', 'membership_title', 'is_touch', 'hours', 'fixed_cost', 'notes',
+)
+LOG_EXPORT_YIELD_PER = 2000
+LOG_EXPORT_CHUNK_SIZE = 64 * 1024
+
+def log_export_query():
+    """
+    Plain column rows (no ORM objects) for the log export, oldest first, read
+    in batches with yield_per. Filters come from request.args: start_date /
+    end_date (YYYY-MM-DD, inclusive), membership_id, client_id, project_id and
+    user_id ('me' allowed). Raises ValueError on malformed filters.
+    """
+    query = (
+        db.session.query(
+            Log.id, Log.created_at, Log.user_id, User.first_name, User.last_name,
+            Log.project_id, Project.name, Client.id, Client.name, Membership.id, Membership.title,
+            Log.is_touch, Log.hours, Log.fixed_cost, Log.notes,
+        )
+        .select_from(Log)
+        .outerjoin(User, Log.user_id == User.id)
+        .outerjoin(Project, Log.project_id == Project.id)
+        .outerjoin(Client, Project.client_id == Client.id)
+        .outerjoin(Membership, Client.membership_id == Membership.id)
+    )
+    start_date = request.args.get('start_date')
+    if start_date:
+        query = query.filter(Log.created_at >= datetime.strptime(start_date, '%Y-%m-%d'))
+    end_date = request.args.get('end_date')
+    if end_date:
+        query = query.filter(Log.created_at < datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1))
+    for arg, column in (('membership_id', Client.membership_id), ('client_id', Project.client_id),
+                        ('project_id', Log.project_id)):
+        value = request.args.get(arg)
+        if value:
+            query = query.filter(column == int(value))
+    user_id = _user_filter_arg('user_id')
+    if user_id:
+        query = query.filter(Log.user_id == user_id)
+    return query.order_by(Log.created_at, Log.id).execution_options(yield_per=LOG_EXPORT_YIELD_PER)
+
+def log_export_record(row):
+    (log_id, created_at, user_id, first_name, last_name, project_id, project_name, client_id, client_name,
+     membership_id, membership_title, is_touch, hours, fixed_cost, notes) = row
+    return (
+        log_id,
+        created_at.isoformat() if created_at else None,
+        user_id,
+        f"{first_name} {last_name or ''}".strip() if first_name is not None else None,
+        project_id, project_name, client_id, client_name, membership_id, membership_title,
+        is_touch,
+        hours,
+        float(fixed_cost) if fixed_cost is not None else None,
+        notes,
+    )
+
+def stream_log_csv(query):
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(LOG_EXPORT_COLUMNS)
+    for row in query:
+        writer.writerow(log_export_record(row))
+        if buffer.tell() >= LOG_EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def stream_log_ndjson(query):
+    chunk = []
+    size = 0
+    for row in query:
+        line = json.dumps(dict(zip(LOG_EXPORT_COLUMNS, log_export_record(row)))) + '\n'
+        chunk.append(line)
+        size += len(line)
+        if size >= LOG_EXPORT_CHUNK_SIZE:
+            yield ''.join(chunk)
+            chunk = []
+            size = 0
+    yield ''.join(chunk)
+
+LOG_EXPORT_FORMATS = {
+    'csv': (stream_log_csv, 'text/csv'),
+    'ndjson': (stream_log_ndjson, 'application/x-ndjson'),
+}
+
+@app.route('/api/export/logs.<any(csv, ndjson):fmt>')
+def export_logs(fmt):
+    """Stream every matching log as CSV or newline-delimited JSON without loading them into memory."""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
     
-    return jsonify({'tasks': tasks_data})
+    try:
+        query = log_export_query()
+    except ValueError:
+        return jsonify({'error': 'Invalid filter'}), 400
+    
+    generate, mimetype = LOG_EXPORT_FORMATS[fmt]
+    filename = f"logs_{get_current_time().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+    return app.response_class(
+        stream_with_context(generate(query)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
 
-@app.route('/api/completed-tasks')
-def get_completed_tasks():
+@app.route('/api/project/<int:project_id>/logs')
+def get_project_logs(project_id):
     if 'user_id' not in session:
         return jsonify({'error': 'Not logged in'}), 401
     
-    # Get the 10 most recently completed tasks
-    tasks = Task.query.filter(
-        Task.is_complete == True
-    ).outerjoin(
-        Project, Project.id == Task.project_id
-    ).outerjoin(
-        Client, Client.id == Project.client_id
-    ).order_by(Task.completed_on.desc()).limit(10).all()
+    Project.query.get_or_404(project_id)
+    return log_page_response(project_logs_query(project_id))
+
+@app.route('/api/client/<int:client_id>/logs')
+def get_client_logs(client_id):
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
     
-    # Convert tasks to dictionary
-    tasks_data = []
-    for task in tasks:
-        task_dict = {
-            'id': task.id,
-            'description': task.description,
-            'is_complete': task.is_complete,
-            'completed_on': task.completed_on.isoformat() if task.completed_on else None,
-            'created_at': task.created_at.isoformat(),
-            'project_id': task.project_id,
-            'project_name': task.project.name if task.project else None,
-            'client_name': task.project.client.name if task.project and task.project.client else None,
-            'assigned_to_id': task.assigned_to,
-            'assigned_to_name': task.assignee.full_name if task.assignee else None,
-            'created_by_id': task.created_by,
-            'created_by_name': task.creator.full_name if task.creator else None,
-            'completed_by_id': task.completed_by_user_id,
-            'completed_by_name': task.completer.full_name if task.completer else None,
-            'is_flagged': bool(task.flags.filter_by(user_id=session['user_id']).first())
-        }
-        tasks_data.append(task_dict)
+    Client.query.get_or_404(client_id)
+    return log_page_response(client_logs_query(client_id))
+
+@app.route('/api/membership/<int:membership_id>/logs')
+def get_membership_logs(membership_id):
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
     
-    return jsonify({'tasks': tasks_data})
+    Membership.query.get_or_404(membership_id)
+    return log_page_response(membership_logs_query(membership_id))
 
 @app.route('/add_task', methods=['POST'])
 def add_task():
@@ -1945,8 +1831,9 @@ def add_task():
             project_id=int(project_id) if project_id else None,
             assigned_to=int(assigned_to) if assigned_to else None
         )
+        task.sync_mentions()
         db.session.add(task)
-        db.session.commit()
+        db.session.flush()
         
         # Log task creation activity
         ActivityLog.log_activity(
@@ -1960,6 +1847,9 @@ def add_task():
                 'assigned_to': task.assigned_to
             }
         )
+        DailyMetric.track_task_created(task)
+        Project.track_task_created(task)
+        db.session.commit()
     
     # Redirect back to the referring page or dashboard
     return redirect(request.referrer or url_for('dashboard'))
@@ -1996,7 +1886,14 @@ def delete_task(task_id):
         return redirect(url_for('login'))
     
     task = Task.query.get_or_404(task_id)
+    DailyMetric.track_task_created(task, sign=-1)
+    Project.track_task_created(task, sign=-1)
+    if task.is_complete:
+        DailyMetric.track_task_completed(task, sign=-1)
+        Project.track_task_completed(task, sign=-1)
+    project_id = task.project_id
     db.session.delete(task)
+    Project.refresh_recency(project_id)
     db.session.commit()
     
     return redirect(request.referrer or url_for('tasks'))
@@ -2012,13 +1909,136 @@ def edit_task(task_id):
     assigned_to = request.form.get('assigned_to')
     
     if description:
+        new_project_id = int(project_id) if project_id else None
+        project_changed = new_project_id != task.project_id
+        old_project_id = task.project_id
+        if project_changed:
+            # Move the task's daily metric and project counter contributions to the new project
+            DailyMetric.track_task_created(task, sign=-1)
+            Project.track_task_created(task, sign=-1)
+            if task.is_complete:
+                DailyMetric.track_task_completed(task, sign=-1)
+                Project.track_task_completed(task, sign=-1)
         task.description = description  # Store the full text with tags
-        task.project_id = int(project_id) if project_id else None
+        task.project_id = new_project_id
         task.assigned_to = int(assigned_to) if assigned_to else None
+        task.sync_mentions()
+        if project_changed:
+            DailyMetric.track_task_created(task)
+            Project.track_task_created(task)
+            if task.is_complete:
+                DailyMetric.track_task_completed(task)
+                Project.track_task_completed(task)
+            Project.refresh_recency(old_project_id)
         db.session.commit()
     
     return redirect(request.referrer or url_for('tasks'))
 
+TASK_BULK_ACTIONS = ('complete', 'reopen', 'delete', 'assign')
+TASK_BULK_MAX = 200
+
+def parse_json_id(value):
+    """A JSON id as an int: integers and digit-only strings; bools, floats and the rest raise ValueError."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.isascii() and value.isdigit():
+        return int(value)
+    raise ValueError(f'Invalid id: {value!r}')
+
+@app.route('/api/tasks/bulk', methods=['POST'])
+def bulk_tasks():
+    """Apply one action to many tasks in a single transaction.
+
+    JSON body: {"action": "complete" | "reopen" | "delete" | "assign",
+    "task_ids": [...], "assigned_to": <user id | "me" | null> (assign only)}.
+    Tasks already in the requested state are left alone. Returns the payloads
+    of the tasks that changed (ids only for deletes) and any ids not found.
+    """
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'}), 401
+    
+    data = request.get_json(silent=True) or {}
+    action = data.get('action')
+    if action not in TASK_BULK_ACTIONS:
+        return jsonify({'success': False, 'error': 'Invalid action'}), 400
+    try:
+        if not isinstance(data.get('task_ids'), list):
+            raise TypeError
+        task_ids = list(dict.fromkeys(parse_json_id(task_id) for task_id in data['task_ids']))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'task_ids must be a list of ids'}), 400
+    if not task_ids:
+        return jsonify({'success': False, 'error': 'No tasks given'}), 400
+    if len(task_ids) > TASK_BULK_MAX:
+        return jsonify({'success': False, 'error': f'At most {TASK_BULK_MAX} tasks per request'}), 400
+    
+    assignee_id = None
+    if action == 'assign':
+        assignee_id = data.get('assigned_to')
+        if assignee_id == 'me':
+            assignee_id = session['user_id']
+        if assignee_id is not None:
+            try:
+                assignee_id = parse_json_id(assignee_id)
+            except ValueError:
+                return jsonify({'success': False, 'error': 'Invalid assignee'}), 400
+            if db.session.get(User, assignee_id) is None:
+                return jsonify({'success': False, 'error': 'Invalid assignee'}), 400
+    
+    user_id = session['user_id']
+    query = Task.query.filter(Task.id.in_(task_ids))
+    if action == 'delete':
+        # The mentions cascade would otherwise load them one task at a time
+        query = query.options(selectinload(Task.mentions))
+    tasks = query.all()
+    found_ids = {task.id for task in tasks}
+    changed = []
+    activities = []
+    stale_projects = set()
+    
+    for task in tasks:
+        if action == 'complete' and not task.is_complete:
+            task.mark_complete(user_id, log_activity=False)
+            activities.append(task.completion_activity(user_id))
+        elif action == 'reopen' and task.is_complete:
+            task.mark_incomplete(refresh_recency=False)
+            stale_projects.add(task.project_id)
+        elif action == 'assign' and task.assigned_to != assignee_id:
+            task.assigned_to = assignee_id
+        elif action == 'delete':
+            DailyMetric.track_task_created(task, sign=-1)
+            Project.track_task_created(task, sign=-1)
+            if task.is_complete:
+                DailyMetric.track_task_completed(task, sign=-1)
+                Project.track_task_completed(task, sign=-1)
+            stale_projects.add(task.project_id)
+            db.session.delete(task)
+        else:
+            continue
+        changed.append(task.id)
+    
+    try:
+        for project_id in stale_projects:
+            Project.refresh_recency(project_id)
+        ActivityLog.bulk_log(activities)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+    
+    result = {
+        'success': True,
+        'action': action,
+        'missing_ids': [task_id for task_id in task_ids if task_id not in found_ids],
+    }
+    if action == 'delete':
+        result['deleted_ids'] = changed
+    else:
+        # One eager query for the changed rows, which the commit expired
+        changed_tasks = Task.query.options(*task_load_options()).filter(Task.id.in_(changed)).all() if changed else []
+        result['tasks'] = serialize_tasks(changed_tasks, user_id)
+    return jsonify(result)
+
 @app.route('/task/<int:task_id>')
 def task_detail(task_id):
     if 'user_id' not in session:
@@ -2038,8 +2058,8 @@ def task_detail(task_id):
     ).first() is not None
     
     # Get projects and users for edit form
-    projects = Project.query.join(Client).order_by(Project.name.asc()).all()
-    users = User.query.order_by(User.first_name.asc()).all()
+    projects = project_options()
+    users = user_options()
     
     return render_template('task_detail.html', 
                          task=task,
@@ -2076,8 +2096,42 @@ def debug_tasks():
     return result
 
 # Placeholder routes for navigation
+def task_load_options():
+    """Eager-load options for every relationship serialize_tasks() reads."""
+    return (
+        joinedload(Task.project).joinedload(Project.client),
+        joinedload(Task.assignee),
+        joinedload(Task.creator),
+        joinedload(Task.completer),
+    )
+
+def flagged_task_ids(user_id, task_ids):
+    """Ids among task_ids that user_id has flagged, in one IN query."""
+    task_ids = list(task_ids)
+    if not user_id or not task_ids:
+        return set()
+    return {
+        row.task_id for row in db.session.query(UserTaskFlag.task_id).filter(
+            UserTaskFlag.user_id == user_id,
+            UserTaskFlag.task_id.in_(task_ids)
+        )
+    }
+
+def serialize_tasks(tasks, user_id=None):
+    """Convert tasks to dictionaries with related data.
+
+    Load tasks with task_load_options() so relationship access doesn't hit the
+    database; flags for user_id are fetched once for the whole batch.
+    """
+    tasks = list(tasks)
+    flagged_ids = flagged_task_ids(user_id, [task.id for task in tasks])
+    return [_serialize_task(task, task.id in flagged_ids) for task in tasks]
+
 def serialize_task(task):
-    """Convert task object to dictionary with related data"""
+    """Single-task convenience wrapper around serialize_tasks() for the session user."""
+    return serialize_tasks([task], session.get('user_id'))[0]
+
+def _serialize_task(task, is_flagged):
     try:
         # Safely access project and client info
         project_name = None
@@ -2100,16 +2154,8 @@ def serialize_task(task):
         if task.completer:
             completed_by_name = task.completer.full_name
         
-        # Check if task is flagged by current user
-        is_flagged = False
-        if 'user_id' in session:
-            is_flagged = UserTaskFlag.query.filter_by(
-                user_id=session['user_id'], 
-                task_id=task.id
-            ).first() is not None
-        
         # Apply tag formatting to description for frontend display
-        formatted_description = render_tags(task.description)
+        formatted_description = render_tags_cached(task.description)
         
         return {
             'id': task.id,
@@ -2125,7 +2171,9 @@ def serialize_task(task):
             'assigned_to_name': assigned_to_name,
             'assigned_to_id': task.assigned_to,
             'creator_name': creator_name,
+            'created_by_id': task.created_by,
             'completed_by_name': completed_by_name,
+            'completed_by_id': task.completed_by_user_id,
             'is_flagged': is_flagged,
         }
     except Exception as e:
@@ -2144,10 +2192,154 @@ def serialize_task(task):
             'assigned_to_name': None,
             'assigned_to_id': None,
             'creator_name': None,
+            'created_by_id': task.created_by,
             'completed_by_name': None,
+            'completed_by_id': task.completed_by_user_id,
             'is_flagged': False,
         }
 
+def encode_keyset_cursor(sort_value, row_id):
+    """Opaque-ish cursor for newest-first keyset pagination on (timestamp, id)."""
+    return f"{sort_value.isoformat()}_{row_id}"
+
+def decode_keyset_cursor(cursor):
+    """Inverse of encode_keyset_cursor(); None for no cursor, ValueError if malformed."""
+    if not cursor:
+        return None
+    # An unencoded '+' in the UTC offset arrives as a space
+    sort_value, row_id = cursor.replace(' ', '+').rsplit('_', 1)
+    return datetime.fromisoformat(sort_value), int(row_id)
+
+# Activity types shown in the feed that simply echo the ActivityLog payload
+PAYLOAD_ACTIVITY_TYPES = {
+    'project_status_change': 'project_status_change',
+    'client_created': 'client_created',
+    'membership_supplement_added': 'membership_funding_added',
+    'membership_funding_added': 'membership_funding_added',
+    'user_created': 'user_created',
+    'project_created': 'project_created',
+    'membership_created': 'membership_created',
+}
+
+def _feed_user(user):
+    return {'id': user.id, 'full_name': user.full_name} if user else None
+
+def hydrate_activity_feed(activities, user_id=None):
+    """Turn ActivityLog rows into display-ready feed items.
+
+    Referenced tasks and logs are each loaded in one eager query, so the feed
+    costs a fixed number of queries regardless of its length. Activities whose
+    task or log no longer exists are dropped. Each item is
+    {'type', 'data', 'created_at'}; data is a plain dict.
+    """
+    activities = list(activities)
+    task_ids = {
+        a.entity_id for a in activities
+        if a.activity_type in ('task_completed', 'task_created') and a.entity_id
+    }
+    log_ids = {a.entity_id for a in activities if a.activity_type == 'time_logged' and a.entity_id}
+    
+    tasks_by_id = {}
+    if task_ids:
+        feed_tasks = Task.query.options(*task_load_options()).filter(Task.id.in_(task_ids)).all()
+        tasks_by_id = {data['id']: data for data in serialize_tasks(feed_tasks, user_id)}
+    
+    logs_by_id = {}
+    if log_ids:
+        for log in Log.query.options(joinedload(Log.project), joinedload(Log.user)).filter(Log.id.in_(log_ids)):
+            logs_by_id[log.id] = {
+                'id': log.id,
+                'is_touch': log.is_touch,
+                'hours': log.hours,
+                'project': {'id': log.project.id, 'name': log.project.name} if log.project else None,
+                'user': _feed_user(log.user),
+            }
+    
+    feed = []
+    for activity in activities:
+        activity_type = activity.activity_type
+        if activity_type in ('task_completed', 'task_created'):
+            data = tasks_by_id.get(activity.entity_id)
+        elif activity_type == 'time_logged':
+            data = logs_by_id.get(activity.entity_id)
+        elif activity_type in PAYLOAD_ACTIVITY_TYPES:
+            activity_type = PAYLOAD_ACTIVITY_TYPES[activity_type]
+            data = {
+                'id': activity.id,
+                'old_value': activity.old_value or {},
+                'new_value': activity.new_value or {},
+                'user': _feed_user(activity.user),
+            }
+        else:
+            continue
+        if data:
+            feed.append({'type': activity_type, 'data': data, 'created_at': activity.created_at})
+    return feed
+
+@app.route('/api/activity')
+def api_activity_feed():
+    """Keyset-paginated activity feed; pass the returned next_cursor to get older items."""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
+    
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    query = ActivityLog.query
+    
+    try:
+        cursor = decode_keyset_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    if cursor:
+        cursor_time, cursor_id = cursor
+        query = query.filter(or_(
+            ActivityLog.created_at < cursor_time,
+            and_(ActivityLog.created_at == cursor_time, ActivityLog.id < cursor_id)
+        ))
+    
+    page = query.order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc()).limit(limit + 1).all()
+    has_more = len(page) > limit
+    page = page[:limit]
+    
+    items = [
+        dict(item, created_at=item['created_at'].isoformat())
+        for item in hydrate_activity_feed(page, session['user_id'])
+    ]
+    next_cursor = encode_keyset_cursor(page[-1].created_at, page[-1].id) if has_more else None
+    return jsonify({'items': items, 'next_cursor': next_cursor})
+
+SEARCH_RESULT_ENDPOINTS = {
+    'task': lambda r: url_for('task_detail', task_id=r['id']),
+    'log': lambda r: url_for('project_detail', project_id=r['project_id']) if r['project_id'] else url_for('logs'),
+    'project': lambda r: url_for('project_detail', project_id=r['id']),
+    'client': lambda r: url_for('client_detail', client_id=r['id']),
+    'quote': lambda r: url_for('billing_edit', bill_db_id=r['id']),
+}
+
+@app.route('/api/search')
+def api_search():
+    """Ranked full-text search across tasks, logs, projects, clients and (admins only) quotes."""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
+
+    q = (request.args.get('q') or '').strip()
+    if len(q) < 2:
+        return jsonify({'error': 'Query must be at least 2 characters'}), 400
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+
+    allowed = [t for t in search.SEARCH_TYPES if t != 'quote' or session.get('role') == 'admin']
+    requested = [t.strip() for t in request.args.get('types', '').split(',') if t.strip()]
+    types = [t for t in requested if t in allowed] if requested else allowed
+
+    try:
+        hits, has_more = search.search_hits(q, types=types, page=page, per_page=per_page)
+    except search.SearchIndexUnavailable as e:
+        return jsonify({'error': str(e)}), 503
+    results = search.load_search_results(hits, q)
+    for result in results:
+        result['url'] = SEARCH_RESULT_ENDPOINTS[result['type']](result)
+    return jsonify({'results': results, 'page': page, 'per_page': per_page, 'has_more': has_more})
+
 @app.route('/tasks')
 def tasks():
     if 'user_id' not in session:
@@ -2155,100 +2347,111 @@ def tasks():
     
     print(f"DEBUG: Current user_id: {session['user_id']}")
     
-    # Get tasks assigned to current user - filter out completed
-    tasks_for_me_query = Task.query.filter(
-        (Task.assigned_to == session['user_id']) &
-        (Task.is_complete == False)
-    ).order_by(Task.created_at.desc()).all()
-    
-    # Get tasks created by current user - filter out completed
-    tasks_i_created_query = Task.query.filter(
-        (Task.created_by == session['user_id']) &
-        (Task.is_complete == False)
-    ).order_by(Task.created_at.desc()).all()
-    
-    print(f"DEBUG: Found {len(tasks_for_me_query)} tasks for me, {len(tasks_i_created_query)} tasks I created")
-    
-    # Get all active tasks ordered by project name
-    all_tasks_query = Task.query.join(Project, Task.project_id == Project.id, isouter=True).filter(
+    # Get all active tasks ordered by project name; the per-user lists are subsets of it
+    all_tasks_query = Task.query.options(*task_load_options()).join(
+        Project, Task.project_id == Project.id, isouter=True
+    ).filter(
         Task.is_complete == False
     ).order_by(Project.name.asc(), Task.created_at.desc()).all()
     print(f"DEBUG: Found {len(all_tasks_query)} total active tasks")
     
-    # Get all completed tasks
-    completed_tasks_query = Task.query.filter(
-        Task.is_complete == True
-    ).order_by(Task.completed_on.desc()).all()
-    print(f"DEBUG: Found {len(completed_tasks_query)} completed tasks")
+    # Serialize tasks with related data. Completed tasks are not rendered here:
+    # the completed tab pages through /api/completed-tasks when it is opened.
+    all_tasks = serialize_tasks(all_tasks_query, session['user_id'])
     
-    # Serialize tasks with related data
-    tasks_for_me = [serialize_task(task) for task in tasks_for_me_query]
-    tasks_i_created = [serialize_task(task) for task in tasks_i_created_query]
-    all_tasks = [serialize_task(task) for task in all_tasks_query]
-    completed_tasks = [serialize_task(task) for task in completed_tasks_query]
+    # Tasks assigned to / created by the current user, newest first
+    by_newest = sorted(all_tasks, key=lambda t: t['created_at'], reverse=True)
+    tasks_for_me = [t for t in by_newest if t['assigned_to_id'] == session['user_id']]
+    tasks_i_created = [t for t in by_newest if t['created_by_id'] == session['user_id']]
     
-    print(f"DEBUG: Serialized {len(tasks_for_me)} tasks for me, {len(tasks_i_created)} tasks I created, {len(all_tasks)} all_tasks, {len(completed_tasks)} completed_tasks")
+    print(f"DEBUG: Serialized {len(tasks_for_me)} tasks for me, {len(tasks_i_created)} tasks I created, {len(all_tasks)} all_tasks")
     
     return render_template('tasks.html', 
                          tasks_for_me=tasks_for_me, 
                          tasks_i_created=tasks_i_created, 
-                         all_tasks=all_tasks, 
-                         completed_tasks=completed_tasks)
+                         all_tasks=all_tasks)
 
 # PROJECTS ROUTES
+def project_listing(*criteria, user_id=None, order_by=None, pinned_only=False, with_usage=True, limit=None):
+    """Projects matching criteria (at most limit of them), annotated for listing pages.
+
+    Usage and open-task counts come from the maintained Project counters. Each
+    project gets is_pinned (for user_id); with with_usage it also gets the
+    membership_time/membership_budget/hours_remaining/budget_remaining fields
+    from its client's active funding. Costs one query for the projects, plus one
+    for funding when usage is requested.
+    """
+    query = db.session.query(
+        Project,
+        UserProjectPin.id.label('pin_id')
+    ).join(
+        Client, Client.id == Project.client_id
+    ).outerjoin(
+        UserProjectPin, and_(UserProjectPin.project_id == Project.id, UserProjectPin.user_id == user_id)
+    ).options(
+        contains_eager(Project.client), joinedload(Project.project_leader)
+    ).filter(*criteria)
+    if pinned_only:
+        query = query.filter(UserProjectPin.id.isnot(None))
+    query = query.order_by(*(order_by if order_by is not None else (Project.name.asc(),)))
+    if limit is not None:
+        query = query.limit(limit)
+    rows = query.all()
+    
+    # Active funding totals per membership, for the memberships these projects draw on
+    membership_ids = {project.client.membership_id for project, _ in rows if project.client.membership_id}
+    funding = {}
+    if with_usage and membership_ids:
+        now = get_current_time()
+        funding = {
+            row.membership_id: row for row in db.session.query(
+                MembershipFunding.membership_id,
+                func.sum(MembershipFunding.time_budget).label('time_budget'),
+                func.sum(MembershipFunding.dollar_budget).label('dollar_budget')
+            ).filter(
+                MembershipFunding.membership_id.in_(membership_ids),
+                MembershipFunding.start_date <= now,
+                MembershipFunding.end_date >= now
+            ).group_by(MembershipFunding.membership_id)
+        }
+    
+    projects = []
+    for project, pin_id in rows:
+        project.is_pinned = pin_id is not None
+        if with_usage:
+            apply_membership_budget(project, funding.get(project.client.membership_id))
+        projects.append(project)
+    return projects
+
+ActiveFunding = namedtuple('ActiveFunding', 'time_budget dollar_budget')
+
+def apply_membership_budget(project, active_funding):
+    """Annotate project with remaining hours/budget against its membership's active funding totals."""
+    project.membership_time = None
+    project.membership_budget = None
+    project.hours_remaining = None
+    project.budget_remaining = None
+    if active_funding is None:
+        return
+    if active_funding.time_budget:
+        project.membership_time = active_funding.time_budget
+        project.hours_remaining = max(0, active_funding.time_budget - project.used_hours)
+    if active_funding.dollar_budget:
+        project.membership_budget = active_funding.dollar_budget
+        project.budget_remaining = max(0, active_funding.dollar_budget - project.used_budget)
+
 @app.route('/projects')
 def projects():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     
-    from sqlalchemy import func
-    
-    # Get all projects and separate by status
-    all_projects = Project.query.join(Client).order_by(Project.name.asc()).all()
-    
-    # Separate active/prospective from archived projects
-    active_projects = []
-    archived_projects = []
-    
-    for project in all_projects:
-        # Add open tasks count and pinned status to each project
-        project.open_tasks_count = project.tasks.filter_by(is_complete=False).count()
-        project.is_pinned = UserProjectPin.query.filter_by(
-            user_id=session['user_id'], 
-            project_id=project.id
-        ).first() is not None
-        
-        # Calculate used hours and budget from logs
-        logs_summary = db.session.query(
-            func.sum(Log.hours).label('total_hours'),
-            func.sum(Log.fixed_cost).label('total_cost')
-        ).filter_by(project_id=project.id).first()
-        
-        project.used_hours = float(logs_summary.total_hours) if logs_summary.total_hours else 0
-        project.used_budget = float(logs_summary.total_cost) if logs_summary.total_cost else 0
-        
-        # Get membership budget info through client
-        project.membership_time = None
-        project.membership_budget = None
-        project.hours_remaining = None
-        project.budget_remaining = None
-        
-        if project.client and project.client.membership:
-            membership = project.client.membership
-            if membership.total_time:
-                project.membership_time = membership.total_time
-                project.hours_remaining = max(0, membership.total_time - project.used_hours)
-            if membership.total_budget:
-                project.membership_budget = membership.total_budget
-                project.budget_remaining = max(0, membership.total_budget - project.used_budget)
-        
-        if project.status == 'Archived':
-            archived_projects.append(project)
-        else:
-            active_projects.append(project)
+    # Get all projects with usage, open task counts and pin state, then separate by status
+    all_projects = project_listing(user_id=session['user_id'])
+    active_projects = [project for project in all_projects if project.status != 'Archived']
+    archived_projects = [project for project in all_projects if project.status == 'Archived']
     
-    clients = Client.query.order_by(Client.name.asc()).all()
-    users = User.query.filter_by(role='admin').order_by(User.first_name.asc()).all()
+    clients = client_options()
+    users = admin_user_options()
     
     return render_template('projects.html', 
                          active_projects=active_projects,
@@ -2261,42 +2464,28 @@ def project_detail(project_id):
     if 'user_id' not in session:
         return redirect(url_for('login'))
     
-    from sqlalchemy import func
-    
     project = Project.query.get_or_404(project_id)
     
-    # Calculate used hours and budget from logs
-    logs_summary = db.session.query(
-        func.sum(Log.hours).label('total_hours'),
-        func.sum(Log.fixed_cost).label('total_cost')
-    ).filter_by(project_id=project.id).first()
-    
-    project.used_hours = float(logs_summary.total_hours) if logs_summary.total_hours else 0
-    project.used_budget = float(logs_summary.total_cost) if logs_summary.total_cost else 0
-    
-    # Get membership budget info through client
-    project.membership_time = None
-    project.membership_budget = None
-    project.hours_remaining = None
-    project.budget_remaining = None
-    
+    # Used hours and budget come from the maintained project counters;
+    # membership budget info comes through the client
+    active_funding = None
     if project.client and project.client.membership:
         membership = project.client.membership
-        if membership.total_time:
-            project.membership_time = membership.total_time
-            project.hours_remaining = max(0, membership.total_time - project.used_hours)
-        if membership.total_budget:
-            project.membership_budget = membership.total_budget
-            project.budget_remaining = max(0, membership.total_budget - project.used_budget)
+        active_funding = ActiveFunding(membership.total_time, membership.total_budget)
+    apply_membership_budget(project, active_funding)
     
     # Get open tasks for this project
-    open_tasks = project.tasks.filter_by(is_complete=False).order_by(Task.created_at.desc()).all()
+    open_tasks = project.tasks.options(*task_load_options()).filter_by(is_complete=False).order_by(Task.created_at.desc()).all()
     
-    # Get completed tasks for this project
-    completed_tasks = project.tasks.filter_by(is_complete=True).order_by(Task.completed_on.desc()).all()
+    # First page of completed tasks; the rest page through /api/completed-tasks
+    completed_tasks, completed_next_cursor = task_page(
+        Task.query.filter(Task.project_id == project.id, Task.is_complete == True, Task.completed_on.isnot(None)),
+        Task.completed_on
+    )
     
-    # Get all logs for this project
-    logs = project.logs.order_by(Log.created_at.desc()).all()
+    # First page of logs for this project
+    logs, logs_next_cursor = log_page(project_logs_query(project.id))
+    logs_total = project_logs_query(project.id).count()
     
     # Check if current user has pinned this project
     is_pinned = UserProjectPin.query.filter_by(
@@ -2305,18 +2494,22 @@ def project_detail(project_id):
     ).first() is not None
     
     # Serialize tasks
-    serialized_open_tasks = [serialize_task(task) for task in open_tasks]
-    serialized_completed_tasks = [serialize_task(task) for task in completed_tasks]
+    serialized_open_tasks = serialize_tasks(open_tasks, session['user_id'])
+    serialized_completed_tasks = serialize_tasks(completed_tasks, session['user_id'])
     
     # Get clients and users for dropdowns
-    clients = Client.query.order_by(Client.name.asc()).all()
-    users = User.query.filter_by(role='admin').order_by(User.first_name.asc()).all()
+    clients = client_options()
+    users = admin_user_options()
     
     return render_template('project_detail.html', 
                          project=project, 
                          tasks=serialized_open_tasks,
                          completed_tasks=serialized_completed_tasks,
+                         completed_next_cursor=completed_next_cursor,
                          logs=logs,
+                         logs_total=logs_total,
+                         logs_next_cursor=logs_next_cursor,
+                         logs_page_url=url_for('get_project_logs', project_id=project.id),
                          is_pinned=is_pinned,
                          clients=clients,
                          users=users)
@@ -2439,8 +2632,10 @@ def clients():
         return redirect(url_for('login'))
     
     clients = Client.query.order_by(Client.name.asc()).all()
-    memberships = Membership.query.all()
-    users = User.query.filter_by(role='admin').order_by(User.first_name.asc()).all()
+    memberships = membership_options()
+    users = admin_user_options()
+    # Rows show each client's membership funding state; compute it for all at once
+    MembershipUsage.for_memberships({client.membership_id for client in clients if client.membership_id})
     
     return render_template('clients.html', clients=clients, memberships=memberships, users=users)
 
@@ -2454,31 +2649,30 @@ def client_detail(client_id):
     # Get all projects for this client
     projects = client.projects.order_by(Project.name.asc()).all()
     
-    # Get all tasks for this client's projects
-    tasks = Task.query.join(Project).filter(
-        Project.client_id == client_id
-    ).order_by(Task.created_at.desc()).all()
+    # First page of tasks for this client's projects; the rest page through /api/client/<id>/tasks
+    tasks, tasks_next_cursor = task_page(client_tasks_query(client_id), Task.created_at)
     
     # Serialize tasks
-    serialized_tasks = [serialize_task(task) for task in tasks]
+    serialized_tasks = serialize_tasks(tasks, session['user_id'])
 
-    # Get all logs for this client across all projects
-    logs = Log.query.join(
-        Project, Project.id == Log.project_id
-    ).filter(
-        Project.client_id == client_id
-    ).order_by(Log.created_at.desc()).all()
+    # First page of logs for this client across all projects
+    logs, logs_next_cursor = log_page(client_logs_query(client_id))
+    logs_total = client_logs_query(client_id).count()
     
     # Get memberships for dropdown
-    memberships = Membership.query.all()
-    users = User.query.filter_by(role='admin').order_by(User.first_name.asc()).all()
-    clients = Client.query.order_by(Client.name.asc()).all()
+    memberships = membership_options()
+    users = admin_user_options()
+    clients = client_options()
     
     return render_template('client_detail.html', 
                          client=client, 
                          projects=projects, 
                          tasks=serialized_tasks,
+                         tasks_next_cursor=tasks_next_cursor,
                          logs=logs,
+                         logs_total=logs_total,
+                         logs_next_cursor=logs_next_cursor,
+                         logs_page_url=url_for('get_client_logs', client_id=client.id),
                          memberships=memberships,
                          users=users,
                          clients=clients)
@@ -2667,8 +2861,8 @@ def billing_new():
     if auth_error:
         return auth_error
 
-    clients = Client.query.order_by(Client.name.asc()).all()
-    projects = Project.query.order_by(Project.name.asc()).all()
+    clients = client_options()
+    projects = project_options()
 
     if request.method == 'GET':
         selected_client_id = request.args.get('client_id', type=int)
@@ -2798,8 +2992,8 @@ def billing_edit(bill_db_id):
         return auth_error
 
     quote = Quote.query.get_or_404(bill_db_id)
-    clients = Client.query.order_by(Client.name.asc()).all()
-    projects = Project.query.order_by(Project.name.asc()).all()
+    clients = client_options()
+    projects = project_options()
 
     if request.method == 'GET':
         return render_template(
@@ -3094,8 +3288,10 @@ def memberships():
         return redirect(url_for('login'))
     
     memberships = Membership.query.order_by(Membership.title.asc()).all()
-    active_memberships = [membership for membership in memberships if membership.is_active]
-    inactive_memberships = [membership for membership in memberships if not membership.is_active]
+    # Funding, usage and client counts for every row in a fixed number of queries
+    usage = MembershipUsage.for_memberships([membership.id for membership in memberships])
+    active_memberships = [membership for membership in memberships if usage[membership.id].is_active]
+    inactive_memberships = [membership for membership in memberships if not usage[membership.id].is_active]
     
     return render_template(
         'memberships.html',
@@ -3117,53 +3313,48 @@ def membership_detail(membership_id):
     # Get all available clients for the form
     all_clients = Client.query.order_by(Client.name.asc()).all()
     
-    # Get all projects through associated clients
-    projects = []
-    for client in associated_clients:
-        projects.extend(client.projects.all())
-    
-    # Sort projects by name
-    projects.sort(key=lambda p: p.name)
-
-    # Membership logs: all logs for associated clients/projects, newest first
-    membership_logs = Log.query.join(
-        User, User.id == Log.user_id
-    ).outerjoin(
-        Project, Project.id == Log.project_id
-    ).outerjoin(
+    # All projects of the associated clients, by name, in one query
+    projects = Project.query.join(
         Client, Client.id == Project.client_id
     ).filter(
         Client.membership_id == membership.id
-    ).order_by(Log.created_at.desc()).all()
+    ).order_by(Project.name.asc()).all()
+    projects_by_client = {}
+    for project in projects:
+        projects_by_client.setdefault(project.client_id, []).append(project)
+    
+    # Row counts for the project table and the client picker, one grouped query each
+    task_counts = dict(db.session.query(Task.project_id, func.count(Task.id)).filter(
+        Task.project_id.in_([project.id for project in projects])
+    ).group_by(Task.project_id).all()) if projects else {}
+    client_project_counts = dict(
+        db.session.query(Project.client_id, func.count(Project.id)).group_by(Project.client_id).all()
+    )
+
+    # Membership logs: first page for associated clients/projects, newest first
+    membership_logs, logs_next_cursor = log_page(membership_logs_query(membership.id))
+    logs_total = membership_logs_query(membership.id).count()
 
-    # Funding entries ordered newest start date first
+    # Funding entries ordered newest start date first, with usage inside each
+    # entry's window from one grouped query
     funding_entries = membership.funding_entries.order_by(MembershipFunding.start_date.desc()).all()
-    membership_client_ids = [client.id for client in associated_clients]
+    funding_usage = MembershipUsage.funding_usage(membership.id)
     for funding in funding_entries:
-        if membership_client_ids:
-            logs_summary = db.session.query(
-                db.func.sum(Log.hours).label('used_time'),
-                db.func.sum(Log.fixed_cost).label('used_budget')
-            ).join(
-                Project, Project.id == Log.project_id
-            ).filter(
-                Project.client_id.in_(membership_client_ids),
-                Log.created_at >= funding.start_date,
-                Log.created_at <= funding.end_date
-            ).first()
-            funding.used_time = float(logs_summary.used_time or 0)
-            funding.used_budget = float(logs_summary.used_budget or 0)
-        else:
-            funding.used_time = 0.0
-            funding.used_budget = 0.0
+        funding.used_time, funding.used_budget = funding_usage.get(funding.id, (0.0, 0.0))
     
     return render_template('membership_detail.html', 
                          membership=membership,
                          clients=associated_clients,
                          all_clients=all_clients,
                          projects=projects,
+                         projects_by_client=projects_by_client,
+                         task_counts=task_counts,
+                         client_project_counts=client_project_counts,
                          funding_entries=funding_entries,
-                         logs=membership_logs)
+                         logs=membership_logs,
+                         logs_total=logs_total,
+                         logs_next_cursor=logs_next_cursor,
+                         logs_page_url=url_for('get_membership_logs', membership_id=membership.id))
 
 @app.route('/add_membership', methods=['POST'])
 def add_membership():
@@ -3281,35 +3472,139 @@ def delete_membership(membership_id):
     flash('Membership deleted successfully', 'success')
     return redirect(url_for('memberships'))
 
+KANBAN_STATUSES = ('Active', 'Awaiting', 'Paused', 'Archived')
+KANBAN_PAGE_SIZE = 25
+
+def kanban_criteria(exclude_default=False):
+    return (Project.is_default == False,) if exclude_default else ()
+
+def kanban_counts(*criteria):
+    """Project count per kanban status, in one grouped query."""
+    counts = dict.fromkeys(KANBAN_STATUSES, 0)
+    counts.update(
+        db.session.query(Project.status, func.count(Project.id))
+        .filter(Project.status.in_(KANBAN_STATUSES), *criteria)
+        .group_by(Project.status)
+        .all()
+    )
+    return counts
+
+def kanban_column(status, *criteria, cursor=None, limit=KANBAN_PAGE_SIZE):
+    """One keyset page of a status column, most recently updated first: (projects, next_cursor)."""
+    if cursor:
+        cursor_time, cursor_id = cursor
+        criteria += (or_(
+            Project.updated_at < cursor_time,
+            and_(Project.updated_at == cursor_time, Project.id < cursor_id)
+        ),)
+    projects = project_listing(
+        Project.status == status, *criteria,
+        user_id=session['user_id'], order_by=(Project.updated_at.desc(), Project.id.desc()),
+        with_usage=False, limit=limit + 1
+    )
+    has_more = len(projects) > limit
+    projects = projects[:limit]
+    next_cursor = encode_keyset_cursor(projects[-1].updated_at, projects[-1].id) if has_more else None
+    return projects, next_cursor
+
+def kanban_board(*criteria, statuses=KANBAN_STATUSES[:3]):
+    """Counts for every status plus the first page of each requested column."""
+    columns = {}
+    for status in statuses:
+        projects, next_cursor = kanban_column(status, *criteria)
+        columns[status] = {'projects': projects, 'next_cursor': next_cursor}
+    return kanban_counts(*criteria), columns
+
+def serialize_kanban_card(project):
+    return {
+        'id': project.id,
+        'name': project.name,
+        'status': project.status,
+        'client_name': project.client.name if project.client else None,
+        'leader_first_name': project.project_leader.first_name if project.project_leader else None,
+        'open_tasks_count': project.open_tasks_count,
+        'is_pinned': getattr(project, 'is_pinned', False),
+        'updated_at': project.updated_at.isoformat() if project.updated_at else None,
+    }
+
+def kanban_column_json(projects, next_cursor):
+    return {
+        'cards': [serialize_kanban_card(p) for p in projects],
+        'html': render_template('partials/kanban_cards.html', projects=projects),
+        'next_cursor': next_cursor,
+    }
+
 @app.route('/kanban')
 def kanban():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     
-    # Get all projects grouped by status
-    active_projects = Project.query.filter_by(status='Active').order_by(Project.updated_at.desc()).all()
-    awaiting_projects = Project.query.filter_by(status='Awaiting').order_by(Project.updated_at.desc()).all()
-    paused_projects = Project.query.filter_by(status='Paused').order_by(Project.updated_at.desc()).all()
-    archived_projects = Project.query.filter_by(status='Archived').order_by(Project.updated_at.desc()).all()
+    # First page of each open column plus per-status counts; the archived
+    # column only carries its count and is paged in from /api/kanban/Archived
+    counts, columns = kanban_board()
+    active_projects = columns['Active']['projects']
+    awaiting_projects = columns['Awaiting']['projects']
+    paused_projects = columns['Paused']['projects']
     
     # If no Awaiting/Paused projects exist yet, also check Prospective projects for Awaiting column
     if not awaiting_projects:
-        awaiting_projects = Project.query.filter_by(status='Prospective').order_by(Project.updated_at.desc()).all()
+        awaiting_projects, _ = kanban_column('Prospective')
     
     # Get clients and users for the add project modal
-    clients = Client.query.order_by(Client.name.asc()).all()
-    users = User.query.filter_by(role='admin').order_by(User.first_name.asc()).all()
+    clients = client_options()
+    users = admin_user_options()
     
     return render_template('kanban.html',
                          active_projects=active_projects,
                          awaiting_projects=awaiting_projects,
                          paused_projects=paused_projects,
-                         archived_projects=archived_projects,
+                         kanban_counts=counts,
+                         kanban_cursors={status: column['next_cursor'] for status, column in columns.items()},
                          clients=clients,
                          users=users)
 
+@app.route('/api/kanban')
+def api_kanban():
+    """Per-status counts and the first page of each open column (?archived=1 adds the archived column)."""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
+    
+    criteria = kanban_criteria(request.args.get('exclude_default') in ('1', 'true'))
+    statuses = KANBAN_STATUSES if request.args.get('archived') in ('1', 'true') else KANBAN_STATUSES[:3]
+    counts, columns = kanban_board(*criteria, statuses=statuses)
+    return jsonify({
+        'counts': counts,
+        'columns': {
+            status: kanban_column_json(column['projects'], column['next_cursor'])
+            for status, column in columns.items()
+        },
+    })
+
+@app.route('/api/kanban/<status>')
+def api_kanban_column(status):
+    """The next page of one kanban column; pass the returned next_cursor for the page after."""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
+    if status not in KANBAN_STATUSES:
+        return jsonify({'error': 'Invalid status'}), 404
+    
+    try:
+        cursor = decode_keyset_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    limit = min(max(request.args.get('limit', KANBAN_PAGE_SIZE, type=int), 1), 100)
+    criteria = kanban_criteria(request.args.get('exclude_default') in ('1', 'true'))
+    
+    projects, next_cursor = kanban_column(status, *criteria, cursor=cursor, limit=limit)
+    return jsonify(dict(kanban_column_json(projects, next_cursor), status=status))
+
 @app.route('/api/project/<int:project_id>/status', methods=['POST'])
 def update_project_status(project_id):
+    """Move a project between kanban columns and return the move as a delta.
+
+    The response carries the moved card and fresh counts for the two columns
+    involved, so the board can patch itself in place instead of refetching.
+    """
     if 'user_id' not in session:
         return jsonify({'success': False, 'error': 'Not authenticated'}), 401
     
@@ -3318,20 +3613,31 @@ def update_project_status(project_id):
     new_status = data.get('status')
     
     # Validate status
-    valid_statuses = ['Active', 'Awaiting', 'Paused', 'Archived']
-    if new_status not in valid_statuses:
+    if new_status not in KANBAN_STATUSES:
         return jsonify({'success': False, 'error': 'Invalid status'}), 400
     
-    # Use the new update_status method that logs activity
-    print(f"DEBUG: Updating project {project_id} status to {new_status}")
+    old_status = project.status
     project.update_status(new_status, session['user_id'])
     
     try:
         db.session.commit()
-        return jsonify({'success': True, 'message': f'Project moved to {new_status}'})
     except Exception as e:
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 500
+    
+    criteria = kanban_criteria(data.get('exclude_default', False))
+    counts = kanban_counts(*criteria)
+    return jsonify({
+        'success': True,
+        'message': f'Project moved to {new_status}',
+        'delta': {
+            'project_id': project.id,
+            'from': old_status,
+            'to': new_status,
+            'card': serialize_kanban_card(project),
+            'counts': {status: counts.get(status, 0) for status in {old_status, new_status} if status in counts},
+        },
+    })
 
 @app.route('/analytics')
 def analytics():
@@ -3342,7 +3648,6 @@ def analytics():
     from datetime import timedelta
     import pytz
 
-    chicago_tz = pytz.timezone('America/Chicago')
     utc_tz = pytz.timezone('UTC')
     current_time_chicago = get_current_time()
     current_time_utc = current_time_chicago.astimezone(utc_tz)
@@ -3366,12 +3671,11 @@ def analytics():
         return detailed + touch
 
     # Top summary metrics
-    total_members = db.session.query(Membership.id).join(
-        MembershipFunding, MembershipFunding.membership_id == Membership.id
-    ).filter(
-        MembershipFunding.start_date <= now,
-        MembershipFunding.end_date >= now
-    ).distinct().count()
+    membership_usage = MembershipUsage.for_memberships(
+        [membership_id for (membership_id,) in db.session.query(Membership.id)], at=now
+    )
+    active_membership_ids = [membership_id for membership_id, usage in membership_usage.items() if usage.is_active]
+    total_members = len(active_membership_ids)
     total_projects = Project.query.filter_by(status='Active').count()
     total_clients = Client.query.count()
     open_tasks = Task.query.filter_by(is_complete=False).count()
@@ -3382,42 +3686,27 @@ def analytics():
     ).all()
     admin_user_ids = [user.id for user in users_for_hours_chart]
 
+    chart_first_day = current_time_chicago.date() - timedelta(days=29)
+    user_hours_by_day = {}
+    if admin_user_ids:
+        user_hours_rows = db.session.query(
+            DailyMetric.metric_date,
+            DailyMetric.user_id,
+            func.sum(DailyMetric.hours + DailyMetric.touch_hours).label('total_hours')
+        ).filter(
+            DailyMetric.metric_date >= chart_first_day,
+            DailyMetric.user_id.in_(admin_user_ids)
+        ).group_by(DailyMetric.metric_date, DailyMetric.user_id).all()
+        for row in user_hours_rows:
+            if row.total_hours:
+                user_hours_by_day.setdefault(local_day_key(row.metric_date), {})[row.user_id] = round(float(row.total_hours), 1)
+
     completion_data = []
     for i in range(30):
-        date_chicago = current_time_chicago - timedelta(days=i)
-        date_start_chicago = date_chicago.replace(hour=0, minute=0, second=0, microsecond=0)
-        date_end_chicago = date_start_chicago + timedelta(days=1)
-
-        if date_start_chicago.tzinfo is None:
-            date_start_utc = chicago_tz.localize(date_start_chicago).astimezone(utc_tz)
-        else:
-            date_start_utc = date_start_chicago.astimezone(utc_tz)
-
-        if date_end_chicago.tzinfo is None:
-            date_end_utc = chicago_tz.localize(date_end_chicago).astimezone(utc_tz)
-        else:
-            date_end_utc = date_end_chicago.astimezone(utc_tz)
-
-        user_hours_rows = []
-        if admin_user_ids:
-            user_hours_rows = db.session.query(
-                Log.user_id,
-                func.sum(Log.hours).label('total_hours')
-            ).filter(
-                Log.created_at >= date_start_utc,
-                Log.created_at < date_end_utc,
-                Log.hours.isnot(None),
-                Log.user_id.in_(admin_user_ids)
-            ).group_by(Log.user_id).all()
-
-        user_hours = {
-            row.user_id: round(float(row.total_hours), 1)
-            for row in user_hours_rows
-        }
-
+        day_key = (current_time_chicago.date() - timedelta(days=i)).isoformat()
         completion_data.append({
-            'date': date_start_chicago.strftime('%Y-%m-%d'),
-            'user_hours': user_hours
+            'date': day_key,
+            'user_hours': user_hours_by_day.get(day_key, {})
         })
 
     # Time & logs
@@ -3557,20 +3846,12 @@ def analytics():
         Client.id, Client.name
     ).order_by(desc('billed')).limit(5).all()
 
-    # Memberships
-    total_memberships = Membership.query.count()
-    active_funding_totals = db.session.query(
-        func.coalesce(func.sum(MembershipFunding.dollar_budget), 0),
-        func.coalesce(func.sum(MembershipFunding.time_budget), 0),
-    ).filter(
-        MembershipFunding.start_date <= now,
-        MembershipFunding.end_date >= now,
-    ).one()
-
-    active_membership_ids = db.session.query(MembershipFunding.membership_id).filter(
-        MembershipFunding.start_date <= now,
-        MembershipFunding.end_date >= now,
-    ).distinct()
+    # Memberships (from the usage snapshot taken for the summary metrics)
+    total_memberships = len(membership_usage)
+    active_funding_totals = (
+        sum(usage.total_budget for usage in membership_usage.values()),
+        sum(usage.total_time for usage in membership_usage.values()),
+    )
 
     upcoming_renewals = db.session.query(
         Membership.title,
@@ -3754,11 +4035,9 @@ def logs():
     ).order_by(Log.created_at.desc()).all()
     
     # Get projects and users for the edit form
-    projects = Project.query.join(Client).filter(
-        Project.status != 'Archived'
-    ).order_by(Project.name.asc()).all()
+    projects = project_options(exclude_statuses=('Archived',))
     
-    users = User.query.filter_by(role='admin').order_by(User.first_name.asc()).all()
+    users = admin_user_options()
     
     return render_template('logs.html', 
                          logs=logs,
@@ -3778,6 +4057,11 @@ def edit_log(log_id):
     project_id = request.form.get('project_id')
     log_datetime_str = request.form.get('log_datetime', '').strip()
     
+    # Retract the old values from the daily rollup and project counters; re-applied after the edit
+    DailyMetric.track_log(log, sign=-1)
+    Project.track_log(log, sign=-1)
+    old_project_id = log.project_id
+    
     # Update log fields
     log.notes = notes if notes else None
     log.hours = float(hours) if hours else None
@@ -3792,9 +4076,17 @@ def edit_log(log_id):
             log_datetime = TIMEZONE.localize(log_datetime)
             log.created_at = log_datetime
         except ValueError:
+            db.session.rollback()
             flash('Invalid date/time format', 'error')
             return redirect(url_for('logs'))
     
+    DailyMetric.track_log(log)
+    Project.track_log(log)
+    Project.refresh_recency(old_project_id)
+    if log.project_id != old_project_id:
+        Project.refresh_recency(log.project_id)
+    if log.user:
+        log.user.refresh_last_log_date()
     db.session.commit()
     flash('Log entry updated successfully', 'success')
     return redirect(url_for('logs'))
@@ -3806,7 +4098,14 @@ def delete_log(log_id):
     
     log = Log.query.get_or_404(log_id)
     
+    DailyMetric.track_log(log, sign=-1)
+    Project.track_log(log, sign=-1)
+    log_user = log.user
+    project_id = log.project_id
     db.session.delete(log)
+    Project.refresh_recency(project_id)
+    if log_user:
+        log_user.refresh_last_log_date()
     db.session.commit()
     flash('Log entry deleted successfully', 'success')
     return redirect(url_for('logs'))
@@ -3937,6 +4236,9 @@ def api_time_grid_submit():
             },
         )
         activity_log.created_at = log_datetime
+        DailyMetric.track_log(log)
+        Project.track_log(log)
+        log.user.note_log(log.created_at)
         created_count += 1
         hours_logged += float(slot_range['hours'])
 
@@ -3978,7 +4280,7 @@ def add_touch_log():
     )
     
     db.session.add(log)
-    db.session.commit()
+    db.session.flush()
     
     # Log touch activity
     ActivityLog.log_activity(
@@ -3992,6 +4294,9 @@ def add_touch_log():
             'project_id': log.project_id
         }
     )
+    DailyMetric.track_log(log)
+    Project.track_log(log)
+    log.user.note_log(log.created_at)
     
     db.session.commit()
     
@@ -4050,7 +4355,7 @@ def add_time_log():
         log.created_at = log_datetime
     
     db.session.add(log)
-    db.session.commit()
+    db.session.flush()
     
     # Log time logging activity with the same datetime
     activity_log = ActivityLog.log_activity(
@@ -4069,6 +4374,9 @@ def add_time_log():
     # Override ActivityLog created_at to match the log entry
     if log_datetime:
         activity_log.created_at = log_datetime
+    DailyMetric.track_log(log)
+    Project.track_log(log)
+    log.user.note_log(log.created_at)
     
     db.session.commit()
     
@@ -4160,7 +4468,6 @@ def profile():
     
     # Calculate time periods
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    today_end = today_start + timedelta(days=1)
     
     # This week: Monday to Sunday
     days_since_monday = now.weekday()
@@ -4171,120 +4478,57 @@ def profile():
     thirty_days_ago = now - timedelta(days=30)
     thirty_days_start = thirty_days_ago.replace(hour=0, minute=0, second=0, microsecond=0)
     
-    # Convert to UTC for database queries
-    today_start_utc = today_start.astimezone(pytz.UTC)
-    today_end_utc = today_end.astimezone(pytz.UTC)
-    week_start_utc = week_start.astimezone(pytz.UTC)
-    week_end_utc = week_end.astimezone(pytz.UTC)
-    thirty_days_start_utc = thirty_days_start.astimezone(pytz.UTC)
-    now_utc = now.astimezone(pytz.UTC)
+    # Read the user's daily rollup rows once; every period below is a slice of them
+    first_day = min(week_start, thirty_days_start).date()
+    metric_rows = DailyMetric.query.filter(
+        DailyMetric.user_id == user.id,
+        DailyMetric.metric_date >= first_day,
+        DailyMetric.metric_date < week_end.date()
+    ).all()
     
     # Calculate analytics for each time period
     analytics_data = {}
     
-    for period_name, start_utc, end_utc in [
-        ('today', today_start_utc, today_end_utc),
-        ('this_week', week_start_utc, week_end_utc),
-        ('last_30_days', thirty_days_start_utc, now_utc)
+    for period_name, start_day, end_day in [
+        ('today', today_start.date(), today_start.date()),
+        ('this_week', week_start.date(), (week_end - timedelta(days=1)).date()),
+        ('last_30_days', thirty_days_start.date(), today_start.date())
     ]:
-        # Hours logged
-        hours_logged = db.session.query(db.func.coalesce(db.func.sum(Log.hours), 0)).filter(
-            Log.user_id == user.id,
-            Log.created_at >= start_utc,
-            Log.created_at < end_utc,
-            Log.hours.isnot(None)
-        ).scalar() or 0
-        
-        # Tasks created
-        tasks_created = Task.query.filter(
-            Task.created_by == user.id,
-            Task.created_at >= start_utc,
-            Task.created_at < end_utc
-        ).count()
-        
-        # Tasks completed
-        tasks_completed = Task.query.filter(
-            Task.completed_by_user_id == user.id,
-            Task.completed_on >= start_utc,
-            Task.completed_on < end_utc
-        ).count()
+        period_rows = [row for row in metric_rows if start_day <= row.metric_date <= end_day]
         
         # Projects worked on (unique projects from logs and tasks)
-        # Get project IDs from logs
-        log_project_ids = db.session.query(Log.project_id).filter(
-            Log.user_id == user.id,
-            Log.created_at >= start_utc,
-            Log.created_at < end_utc,
-            Log.project_id.isnot(None)
-        ).distinct().all()
-        
-        # Get project IDs from tasks
-        task_project_ids = db.session.query(Task.project_id).filter(
-            db.or_(
-                db.and_(Task.created_by == user.id, Task.created_at >= start_utc, Task.created_at < end_utc),
-                db.and_(Task.completed_by_user_id == user.id, Task.completed_on >= start_utc, Task.completed_on < end_utc)
-            ),
-            Task.project_id.isnot(None)
-        ).distinct().all()
-        
-        # Combine and count unique project IDs
-        all_project_ids = set()
-        for row in log_project_ids:
-            if row[0] is not None:
-                all_project_ids.add(row[0])
-        for row in task_project_ids:
-            if row[0] is not None:
-                all_project_ids.add(row[0])
-        
-        projects_worked_on = len(all_project_ids)
+        all_project_ids = {
+            row.project_id for row in period_rows
+            if row.project_id is not None and (row.log_count or row.tasks_created or row.tasks_completed)
+        }
         
         analytics_data[period_name] = {
-            'hours_logged': hours_logged,
-            'tasks_created': tasks_created,
-            'tasks_completed': tasks_completed,
-            'projects_worked_on': projects_worked_on
+            'hours_logged': sum(row.total_hours for row in period_rows),
+            'tasks_created': sum(row.tasks_created or 0 for row in period_rows),
+            'tasks_completed': sum(row.tasks_completed or 0 for row in period_rows),
+            'projects_worked_on': len(all_project_ids)
         }
     
     # Calculate statistical averages for business days and weekends (last 30 days only)
-    # Get logs from the last 30 days only
-    thirty_days_ago_utc = thirty_days_start_utc
+    last_30_rows = [row for row in metric_rows if row.metric_date >= thirty_days_start.date()]
     
     # Calculate total hours for last 30 days
-    total_hours = db.session.query(db.func.coalesce(db.func.sum(Log.hours), 0)).filter(
-        Log.user_id == user.id,
-        Log.hours.isnot(None),
-        Log.created_at >= thirty_days_ago_utc
-    ).scalar() or 0
-    
-    # Get all log entries for the user from last 30 days
-    all_logs = Log.query.filter(
-        Log.user_id == user.id,
-        Log.hours.isnot(None),
-        Log.created_at >= thirty_days_ago_utc
-    ).all()
+    total_hours = sum(row.total_hours for row in last_30_rows)
     
     # Group by date and separate business days from weekends
     business_daily_hours = {}
     weekend_daily_hours = {}
-    business_days_count = 0
-    weekend_days_count = 0
-    
-    for log in all_logs:
-        # Convert UTC to Central time
-        log_date_central = log.created_at.astimezone(central)
-        log_date = log_date_central.date()
-        weekday = log_date_central.weekday()  # Monday=0, Sunday=6
-        
-        if weekday < 5:  # Monday-Friday (business days)
-            if log_date not in business_daily_hours:
-                business_daily_hours[log_date] = 0
-                business_days_count += 1
-            business_daily_hours[log_date] += log.hours or 0
+    
+    for row in last_30_rows:
+        if not row.log_count:
+            continue
+        if row.metric_date.weekday() < 5:  # Monday-Friday (business days)
+            business_daily_hours[row.metric_date] = business_daily_hours.get(row.metric_date, 0) + row.total_hours
         else:  # Saturday-Sunday (weekends)
-            if log_date not in weekend_daily_hours:
-                weekend_daily_hours[log_date] = 0
-                weekend_days_count += 1
-            weekend_daily_hours[log_date] += log.hours or 0
+            weekend_daily_hours[row.metric_date] = weekend_daily_hours.get(row.metric_date, 0) + row.total_hours
+    
+    business_days_count = len(business_daily_hours)
+    weekend_days_count = len(weekend_daily_hours)
     
     # Calculate business day averages
     business_hours_total = sum(business_daily_hours.values())
@@ -4947,14 +5191,10 @@ def get_task_form_data():
         return jsonify({'error': 'Not logged in'}), 401
     
     # Get all active projects
-    projects = Project.query.join(
-        Client, Client.id == Project.client_id
-    ).filter(
-        Project.status == 'Active'
-    ).order_by(Project.name).all()
+    projects = project_options(statuses=('Active',))
     
     # Get all users
-    users = User.query.filter_by(role='admin').order_by(User.first_name).all()
+    users = admin_user_options()
     
     # Convert to dictionaries
     projects_data = [{
@@ -4985,15 +5225,15 @@ def get_projects_for_logging():
     default_project_id = default_project.id if default_project else None
 
     # 2. Get projects with most recent log entries (excluding default project)
-    from sqlalchemy import desc
     recent_log_projects = db.session.query(
-        Project, Client.name.label('client_name'), db.func.max(Log.created_at).label('last_log')
-    ).join(Client).join(Log).filter(
-        Project.status != 'Archived'
+        Project, Client.name.label('client_name'), Project.last_log_at
+    ).join(Client).filter(
+        Project.status != 'Archived',
+        Project.last_log_at.isnot(None)
     )
     if default_project_id:
         recent_log_projects = recent_log_projects.filter(Project.id != default_project_id)
-    recent_log_projects = recent_log_projects.group_by(Project.id, Client.name).order_by(desc('last_log')).all()
+    recent_log_projects = recent_log_projects.order_by(Project.last_log_at.desc()).all()
 
     # 3. Get the rest of the projects (excluding those already included)
     recent_log_project_ids = {p.id for p, _, _ in recent_log_projects}
@@ -5756,7 +5996,64 @@ def edit_appointment(appointment_id):
     
     return redirect(url_for('admin'))
 
+@app.cli.command('rebuild-daily-metrics')
+@click.option('--since', default=None, help='Only reconcile days on/after this date (YYYY-MM-DD).')
+@click.option('--dry-run', is_flag=True, help='Report drift without writing changes.')
+def rebuild_daily_metrics_command(since, dry_run):
+    """Rebuild or reconcile the daily_metrics rollup from raw logs and tasks."""
+    since_date = datetime.strptime(since, '%Y-%m-%d').date() if since else None
+    counts = DailyMetric.rebuild(since=since_date, dry_run=dry_run)
+    prefix = 'Dry run: ' if dry_run else ''
+    print(
+        f"{prefix}checked {counts['checked']} rows, inserted {counts['inserted']}, "
+        f"updated {counts['updated']}, deleted {counts['deleted']}, pruned {counts['pruned']}"
+    )
+
+@app.cli.command('reconcile-project-counters')
+@click.option('--batch-size', default=500, show_default=True, help='Projects checked per transaction.')
+@click.option('--dry-run', is_flag=True, help='Report drift without writing changes.')
+def reconcile_project_counters_command(batch_size, dry_run):
+    """Verify the denormalized Project usage counters against logs and tasks and repair drift."""
+    counts = Project.reconcile(batch_size=batch_size, dry_run=dry_run)
+    prefix = 'Dry run: ' if dry_run else ''
+    verb = 'drifted' if dry_run else 'repaired'
+    print(f"{prefix}checked {counts['checked']} projects, {verb} {counts['repaired']}")
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """Create (if missing) and repopulate the full-text search index."""
+    counts = search.ensure_search_index(rebuild=True)
+    print(', '.join(f'{name}: {n}' for name, n in counts.items()))
+
+@app.cli.command('backfill-task-mentions')
+@click.option('--batch-size', default=500, show_default=True, help='Tasks re-parsed per transaction.')
+def backfill_task_mentions_command(batch_size):
+    """Parse @[User]/#[Project] tags of every task into task_mentions."""
+    counts = TaskMention.backfill(batch_size=batch_size)
+    print(f"synced {counts['tasks']} tasks, {counts['mentions']} mentions")
+
+@app.cli.group('jobs')
+def jobs_group():
+    """Background job queue (report exports)."""
+
+@jobs_group.command('worker')
+@click.option('--poll-interval', default=2.0, show_default=True, help='Seconds to wait when the queue is empty.')
+@click.option('--once', is_flag=True, help='Exit once the queue is empty instead of polling.')
+def jobs_worker_command(poll_interval, once):
+    """Run queued jobs until interrupted."""
+    try:
+        processed = jobs.work(poll_interval=poll_interval, once=once, echo=click.echo)
+    except KeyboardInterrupt:
+        return
+    click.echo(f"ran {processed} jobs")
+
+@jobs_group.command('purge')
+def jobs_purge_command():
+    """Delete expired jobs and their result files."""
+    print(f"purged {jobs.purge_expired()} jobs")
+
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
+        search.ensure_search_index()
     app.run(debug=True, host='0.0.0.0', port=int(os.environ.get('PORT', 5001))) 
\ No newline at end of file
@@ -23,11 +23,12 @@ from sqlalchemy import and_, case, desc, func, or_
 from models import (
     GENERAL_PROJECT_NAME,
     Client,
+    DailyMetric,
     Equipment,
     EquipmentAppointment,
     Log,
     Membership,
-    MembershipFunding,
+    MembershipUsage,
     Project,
     Quote,
     Task,
@@ -121,10 +122,12 @@ def collect_overview(now) -> list[str]:
 
     open_tasks = Task.query.filter_by(is_complete=False).count()
     completed_tasks = Task.query.filter_by(is_complete=True).count()
-    tasks_completed_30d = Task.query.filter(
-        Task.is_complete.is_(True),
-        Task.completed_on >= thirty_days_ago,
-    ).count()
+    tasks_completed_30d = (
+        db.session.query(func.coalesce(func.sum(DailyMetric.tasks_completed), 0))
+        .filter(DailyMetric.metric_date >= thirty_days_ago.date())
+        .scalar()
+        or 0
+    )
 
     lines = section("Scale & Engagement")
     lines.extend(
@@ -201,54 +204,35 @@ def collect_billing() -> list[str]:
 
 
 def collect_memberships(now) -> list[str]:
-    total_memberships = Membership.query.count()
-    active_memberships = (
-        db.session.query(Membership.id)
-        .join(MembershipFunding, MembershipFunding.membership_id == Membership.id)
-        .filter(
-            MembershipFunding.start_date <= now,
-            MembershipFunding.end_date >= now,
-        )
-        .distinct()
-        .count()
-    )
-
-    funding_totals = db.session.query(
-        func.coalesce(func.sum(MembershipFunding.amount), 0),
-        func.coalesce(func.sum(MembershipFunding.dollar_budget), 0),
-        func.coalesce(func.sum(MembershipFunding.time_budget), 0),
-    ).one()
+    titles = dict(db.session.query(Membership.id, Membership.title).all())
+    usage = MembershipUsage.for_memberships(list(titles), at=now)
+    active = [entry for entry in usage.values() if entry.is_active]
 
     logged_consumable = db.session.query(_log_cost_expr()).scalar() or 0
 
-    top_memberships = (
-        db.session.query(
-            Membership.title,
-            func.count(Client.id).label("client_count"),
-        )
-        .outerjoin(Client, Client.membership_id == Membership.id)
-        .group_by(Membership.id, Membership.title)
-        .order_by(desc("client_count"))
-        .limit(5)
-        .all()
-    )
+    top_memberships = sorted(
+        usage.values(), key=lambda entry: (-entry.client_count, titles[entry.membership_id])
+    )[:5]
 
     lines = section("Memberships & Funding")
     lines.extend(
         [
-            f"Memberships (total)                {fmt_number(total_memberships)}",
-            f"Memberships (currently active)     {fmt_number(active_memberships)}",
-            f"All-time funding revenue           {fmt_currency(funding_totals[0])}",
-            f"All-time dollar budgets            {fmt_currency(funding_totals[1])}",
-            f"All-time hour budgets              {fmt_number(funding_totals[2])} hrs",
+            f"Memberships (total)                {fmt_number(len(usage))}",
+            f"Memberships (currently active)     {fmt_number(len(active))}",
+            f"All-time funding revenue           {fmt_currency(sum(e.all_time_amount for e in usage.values()))}",
+            f"All-time dollar budgets            {fmt_currency(sum(e.total_budget_all_time for e in usage.values()))}",
+            f"All-time hour budgets              {fmt_number(sum(e.total_time_all_time for e in usage.values()))} hrs",
+            f"Active dollar budget remaining     {fmt_currency(sum(e.remaining_budget for e in active))}",
+            f"Active hour budget remaining       {fmt_number(sum(e.remaining_time for e in active), 1)} hrs",
             f"Logged consumable spend (all-time) {fmt_currency(logged_consumable)}",
             "",
             "Top 5 memberships by client count:",
         ]
     )
     if top_memberships:
-        for rank, (title, client_count) in enumerate(top_memberships, start=1):
-            lines.append(f"  {rank}. {title:<45} {fmt_number(client_count)} clients")
+        for rank, entry in enumerate(top_memberships, start=1):
+            title = titles[entry.membership_id]
+            lines.append(f"  {rank}. {title:<45} {fmt_number(entry.client_count)} clients")
     else:
         lines.append("  (none)")
     return lines
@@ -261,24 +245,21 @@ def collect_logs(now) -> list[str]:
     all_cost = db.session.query(_log_cost_expr()).scalar() or 0
     log_entries = Log.query.count()
 
-    recent_hours = (
-        db.session.query(_log_hours_expr())
-        .filter(Log.created_at >= thirty_days_ago)
-        .scalar()
-        or 0
-    )
-    recent_cost = (
-        db.session.query(_log_cost_expr())
-        .filter(Log.created_at >= thirty_days_ago)
-        .scalar()
-        or 0
+    recent_hours, recent_cost, recent_log_entries = (
+        db.session.query(
+            func.coalesce(func.sum(DailyMetric.hours + DailyMetric.touch_hours), 0),
+            func.coalesce(func.sum(DailyMetric.fixed_cost), 0),
+            func.coalesce(func.sum(DailyMetric.log_count), 0),
+        )
+        .filter(DailyMetric.metric_date >= thirty_days_ago.date())
+        .one()
     )
-    recent_log_entries = Log.query.filter(Log.created_at >= thirty_days_ago).count()
     projects_touched_30d = (
-        db.session.query(func.count(func.distinct(Log.project_id)))
+        db.session.query(func.count(func.distinct(DailyMetric.project_id)))
         .filter(
-            Log.created_at >= thirty_days_ago,
-            Log.project_id.isnot(None),
+            DailyMetric.metric_date >= thirty_days_ago.date(),
+            DailyMetric.project_id.isnot(None),
+            DailyMetric.log_count > 0,
         )
         .scalar()
         or 0
@@ -396,12 +377,14 @@ def build_report() -> str:
     return "\n".join(body_lines) + "\n"
 
 
+def snapshot_filename(now) -> str:
+    return f"hubtracker_snapshot_{now.strftime('%Y%m%d_%H%M%S')}.txt"
+
+
 def default_output_path() -> str:
-    now = get_current_time()
     reports_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
     os.makedirs(reports_dir, exist_ok=True)
-    filename = f"hubtracker_snapshot_{now.strftime('%Y%m%d_%H%M%S')}.txt"
-    return os.path.join(reports_dir, filename)
+    return os.path.join(reports_dir, snapshot_filename(get_current_time()))
 
 
 def main() -> int:
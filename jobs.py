@@ -0,0 +1,158 @@
+"""
+Background jobs for work too slow to run inside a web request.
+
+Requests enqueue a ``Job`` row (POST /api/jobs) and poll it; ``flask jobs
+worker`` claims queued jobs one at a time, runs the handler registered for
+the job's kind and records the outcome. Handlers write their result to a file
+under ``JOB_RESULTS_DIR``; finished jobs and their files are purged by the
+worker once ``expires_at`` passes (``JOB_RESULT_TTL_HOURS``, default 24).
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import time
+from datetime import datetime, timedelta
+
+import generate_report
+import report_export
+from models import Job, db, get_current_time
+
+JOB_RESULTS_DIR = os.environ.get('JOB_RESULTS_DIR') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'job_results'
+)
+JOB_RESULT_TTL = timedelta(hours=int(os.environ.get('JOB_RESULT_TTL_HOURS', 24)))
+# A job still 'running' after this long lost its worker and is queued again
+JOB_STALE_AFTER = timedelta(hours=1)
+PURGE_INTERVAL = 600  # seconds between expiry sweeps in the worker loop
+
+
+def _export_report_params(params):
+    try:
+        start_date = datetime.strptime(params.get('start_date') or '', '%Y-%m-%d')
+        end_date = datetime.strptime(params.get('end_date') or '', '%Y-%m-%d')
+    except ValueError:
+        raise ValueError('start_date and end_date must be YYYY-MM-DD')
+    if end_date < start_date:
+        raise ValueError('end_date is before start_date')
+    filter_type = params.get('filter_type') or 'all'
+    if filter_type not in ('all', 'membership', 'client'):
+        raise ValueError('filter_type must be all, membership or client')
+    return {
+        'start_date': start_date.strftime('%Y-%m-%d'),
+        'end_date': end_date.strftime('%Y-%m-%d'),
+        'filter_type': filter_type,
+        'filter_value': str(params.get('filter_value') or ''),
+    }
+
+
+def _run_export_report(params, path):
+    start_date = datetime.strptime(params['start_date'], '%Y-%m-%d')
+    end_date = datetime.strptime(params['end_date'], '%Y-%m-%d')
+    cached_path, _ = report_export.cached_report(start_date, end_date, params['filter_type'], params['filter_value'])
+    shutil.copyfile(cached_path, path)
+    return report_export.report_filename(start_date, end_date), report_export.XLSX_MIMETYPE
+
+
+def _run_leadership_report(params, path):
+    report_text = generate_report.build_report()
+    with open(path, 'w', encoding='utf-8') as handle:
+        handle.write(report_text)
+    return generate_report.snapshot_filename(get_current_time()), 'text/plain'
+
+
+# kind -> (params validator, handler). Handlers write the result to ``path``
+# and return (download name, mimetype).
+JOB_HANDLERS = {
+    'export_report': (_export_report_params, _run_export_report),
+    'leadership_report': (lambda params: {}, _run_leadership_report),
+}
+ADMIN_JOB_KINDS = {'leadership_report'}
+
+
+def validate_params(kind, params):
+    """Normalized params for a job of ``kind``; raises ValueError when invalid."""
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f'Unknown job kind: {kind}')
+    return JOB_HANDLERS[kind][0](params or {})
+
+
+def _remove(path):
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+def run_job(job):
+    """Run a claimed job to completion and record its result or error."""
+    os.makedirs(JOB_RESULTS_DIR, exist_ok=True)
+    job_id = job.id
+    result_path = os.path.join(JOB_RESULTS_DIR, f'job_{job_id}')
+    partial_path = result_path + '.part'
+    try:
+        if job.kind not in JOB_HANDLERS:
+            raise ValueError(f'Unknown job kind: {job.kind}')
+        name, mimetype = JOB_HANDLERS[job.kind][1](job.params or {}, partial_path)
+        os.replace(partial_path, result_path)
+    except Exception as e:
+        db.session.rollback()
+        _remove(partial_path)
+        job = db.session.get(Job, job_id)
+        job.status = 'failed'
+        job.error = str(e) or e.__class__.__name__
+    else:
+        job.status = 'succeeded'
+        job.error = None
+        job.result_path = result_path
+        job.result_name = name
+        job.result_mimetype = mimetype
+    now = get_current_time()
+    job.finished_at = now
+    job.expires_at = now + JOB_RESULT_TTL
+    db.session.commit()
+    return job
+
+
+def purge_expired(now=None):
+    """Delete finished jobs past their expiry along with their result files."""
+    now = now or get_current_time()
+    expired = Job.query.filter(Job.expires_at.isnot(None), Job.expires_at < now).all()
+    for job in expired:
+        _remove(job.result_path)
+        db.session.delete(job)
+    db.session.commit()
+    return len(expired)
+
+
+def work(poll_interval=2.0, once=False, echo=print):
+    """
+    Worker loop: claim and run queued jobs, sleeping ``poll_interval``
+    seconds when the queue is empty. With ``once``, stop when it empties.
+    Returns the number of jobs run.
+    """
+    requeued = Job.requeue_stale(get_current_time() - JOB_STALE_AFTER)
+    if requeued:
+        echo(f'requeued {requeued} stale jobs')
+    processed = 0
+    last_purge = 0
+    while True:
+        if time.monotonic() - last_purge >= PURGE_INTERVAL:
+            purged = purge_expired()
+            if purged:
+                echo(f'purged {purged} expired jobs')
+            last_purge = time.monotonic()
+
+        job = Job.claim_next()
+        if job is None:
+            if once:
+                return processed
+            db.session.remove()
+            time.sleep(poll_interval)
+            continue
+
+        started = time.monotonic()
+        job = run_job(job)
+        processed += 1
+        echo(f'job {job.id} ({job.kind}) {job.status} in {time.monotonic() - started:.1f}s'
+             + (f': {job.error}' if job.error else ''))
+        db.session.remove()
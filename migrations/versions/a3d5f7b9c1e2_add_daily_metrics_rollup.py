@@ -0,0 +1,144 @@
+"""Add daily_metrics rollup table and backfill from logs/tasks
+
+Revision ID: a3d5f7b9c1e2
+Revises: e5f1a8c9d72b
+Create Date: 2026-10-18 09:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = 'a3d5f7b9c1e2'
+down_revision = 'e5f1a8c9d72b'
+branch_labels = None
+depends_on = None
+
+
+def _local_day(bind, column):
+    if bind.dialect.name == 'postgresql':
+        return sa.func.date(sa.func.timezone('America/Chicago', column))
+    return sa.func.date(column)
+
+
+def upgrade():
+    insp = inspect(op.get_bind())
+    if not insp.has_table('daily_metrics'):
+        op.create_table(
+            'daily_metrics',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('metric_date', sa.Date(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('project_id', sa.Integer(), nullable=True),
+            sa.Column('hours', sa.Float(), nullable=False, server_default='0'),
+            sa.Column('touch_hours', sa.Float(), nullable=False, server_default='0'),
+            sa.Column('fixed_cost', sa.Numeric(12, 2), nullable=False, server_default='0'),
+            sa.Column('log_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('tasks_created', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('tasks_completed', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('metric_date', 'user_id', 'project_id', name='unique_daily_metric'),
+        )
+        op.create_index('ix_daily_metrics_metric_date', 'daily_metrics', ['metric_date'])
+
+    bind = op.get_bind()
+    logs = sa.table(
+        'logs',
+        sa.column('id', sa.Integer),
+        sa.column('is_touch', sa.Boolean),
+        sa.column('hours', sa.Float),
+        sa.column('fixed_cost', sa.Numeric(10, 2)),
+        sa.column('user_id', sa.Integer),
+        sa.column('project_id', sa.Integer),
+        sa.column('created_at', sa.DateTime(timezone=True)),
+    )
+    tasks = sa.table(
+        'tasks',
+        sa.column('id', sa.Integer),
+        sa.column('is_complete', sa.Boolean),
+        sa.column('completed_on', sa.DateTime(timezone=True)),
+        sa.column('created_by', sa.Integer),
+        sa.column('completed_by_user_id', sa.Integer),
+        sa.column('project_id', sa.Integer),
+        sa.column('created_at', sa.DateTime(timezone=True)),
+    )
+    daily_metrics = sa.table(
+        'daily_metrics',
+        sa.column('metric_date', sa.Date),
+        sa.column('user_id', sa.Integer),
+        sa.column('project_id', sa.Integer),
+        sa.column('hours', sa.Float),
+        sa.column('touch_hours', sa.Float),
+        sa.column('fixed_cost', sa.Numeric(12, 2)),
+        sa.column('log_count', sa.Integer),
+        sa.column('tasks_created', sa.Integer),
+        sa.column('tasks_completed', sa.Integer),
+    )
+
+    if bind.execute(sa.select(sa.func.count()).select_from(daily_metrics)).scalar():
+        return
+
+    rows = {}
+
+    def bucket(day, user_id, project_id):
+        key = (str(day)[:10], user_id, project_id)
+        if key not in rows:
+            rows[key] = {
+                'hours': 0.0, 'touch_hours': 0.0, 'fixed_cost': 0,
+                'log_count': 0, 'tasks_created': 0, 'tasks_completed': 0,
+            }
+        return rows[key]
+
+    log_day = _local_day(bind, logs.c.created_at)
+    for row in bind.execute(
+        sa.select(
+            log_day.label('day'), logs.c.user_id, logs.c.project_id,
+            sa.func.coalesce(sa.func.sum(sa.case((logs.c.is_touch.is_(False), logs.c.hours), else_=0)), 0).label('hours'),
+            sa.func.coalesce(sa.func.sum(sa.case((logs.c.is_touch.is_(True), logs.c.hours), else_=0)), 0).label('touch_hours'),
+            sa.func.coalesce(sa.func.sum(logs.c.fixed_cost), 0).label('fixed_cost'),
+            sa.func.count(logs.c.id).label('log_count'),
+        ).group_by(log_day, logs.c.user_id, logs.c.project_id)
+    ):
+        bucket(row.day, row.user_id, row.project_id).update(
+            hours=float(row.hours or 0), touch_hours=float(row.touch_hours or 0),
+            fixed_cost=row.fixed_cost or 0, log_count=row.log_count,
+        )
+
+    created_day = _local_day(bind, tasks.c.created_at)
+    for row in bind.execute(
+        sa.select(created_day.label('day'), tasks.c.created_by, tasks.c.project_id, sa.func.count(tasks.c.id).label('n'))
+        .group_by(created_day, tasks.c.created_by, tasks.c.project_id)
+    ):
+        bucket(row.day, row.created_by, row.project_id)['tasks_created'] = row.n
+
+    completed_day = _local_day(bind, tasks.c.completed_on)
+    for row in bind.execute(
+        sa.select(completed_day.label('day'), tasks.c.completed_by_user_id, tasks.c.project_id, sa.func.count(tasks.c.id).label('n'))
+        .where(tasks.c.is_complete.is_(True), tasks.c.completed_on.isnot(None))
+        .group_by(completed_day, tasks.c.completed_by_user_id, tasks.c.project_id)
+    ):
+        bucket(row.day, row.completed_by_user_id, row.project_id)['tasks_completed'] = row.n
+
+    from datetime import datetime
+
+    batch = []
+    for (day, user_id, project_id), values in rows.items():
+        batch.append(dict(
+            metric_date=datetime.strptime(day, '%Y-%m-%d').date(),
+            user_id=user_id,
+            project_id=project_id,
+            **values,
+        ))
+        if len(batch) >= 1000:
+            bind.execute(daily_metrics.insert(), batch)
+            batch = []
+    if batch:
+        bind.execute(daily_metrics.insert(), batch)
+
+
+def downgrade():
+    op.drop_index('ix_daily_metrics_metric_date', table_name='daily_metrics')
+    op.drop_table('daily_metrics')
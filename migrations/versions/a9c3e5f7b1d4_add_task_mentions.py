@@ -0,0 +1,41 @@
+"""Add task_mentions table for parsed @[User] / #[Project] tags
+
+Populate existing tasks afterwards with `flask backfill-task-mentions`.
+
+Revision ID: a9c3e5f7b1d4
+Revises: f4b8d2a6c0e3
+Create Date: 2026-10-18 15:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = 'a9c3e5f7b1d4'
+down_revision = 'f4b8d2a6c0e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    insp = inspect(op.get_bind())
+    if insp.has_table('task_mentions'):
+        return
+    op.create_table(
+        'task_mentions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=10), nullable=False),
+        sa.Column('target_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('task_id', 'kind', 'target_id', name='unique_task_mention'),
+    )
+    op.create_index('ix_task_mentions_task_id', 'task_mentions', ['task_id'])
+    op.create_index('ix_task_mentions_kind_target', 'task_mentions', ['kind', 'target_id'])
+
+
+def downgrade():
+    op.drop_index('ix_task_mentions_kind_target', table_name='task_mentions')
+    op.drop_index('ix_task_mentions_task_id', table_name='task_mentions')
+    op.drop_table('task_mentions')
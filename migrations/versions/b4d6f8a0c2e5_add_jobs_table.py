@@ -0,0 +1,46 @@
+"""Add jobs table for background exports and reports
+
+Revision ID: b4d6f8a0c2e5
+Revises: a9c3e5f7b1d4
+Create Date: 2026-10-18 16:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = 'b4d6f8a0c2e5'
+down_revision = 'a9c3e5f7b1d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    insp = inspect(op.get_bind())
+    if insp.has_table('jobs'):
+        return
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('result_path', sa.String(length=500), nullable=True),
+        sa.Column('result_name', sa.String(length=255), nullable=True),
+        sa.Column('result_mimetype', sa.String(length=100), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_jobs_status_created_at', 'jobs', ['status', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_jobs_status_created_at', table_name='jobs')
+    op.drop_table('jobs')
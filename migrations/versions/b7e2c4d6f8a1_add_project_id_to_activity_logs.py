@@ -0,0 +1,95 @@
+"""Add denormalized project_id to activity_logs and backfill in batches
+
+Revision ID: b7e2c4d6f8a1
+Revises: a3d5f7b9c1e2
+Create Date: 2026-10-18 10:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = 'b7e2c4d6f8a1'
+down_revision = 'a3d5f7b9c1e2'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+
+def upgrade():
+    insp = inspect(op.get_bind())
+    activity_cols = {c['name'] for c in insp.get_columns('activity_logs')}
+    if 'project_id' not in activity_cols:
+        with op.batch_alter_table('activity_logs', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('project_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(
+                'activity_logs_project_id_fkey', 'projects', ['project_id'], ['id'], ondelete='SET NULL'
+            )
+            batch_op.create_index('ix_activity_logs_project_id', ['project_id'])
+
+    bind = op.get_bind()
+    activity_logs = sa.table(
+        'activity_logs',
+        sa.column('id', sa.Integer),
+        sa.column('entity_type', sa.String),
+        sa.column('entity_id', sa.Integer),
+        sa.column('project_id', sa.Integer),
+        sa.column('old_value', sa.JSON),
+        sa.column('new_value', sa.JSON),
+    )
+    projects = sa.table('projects', sa.column('id', sa.Integer))
+    tasks = sa.table('tasks', sa.column('id', sa.Integer), sa.column('project_id', sa.Integer))
+    logs = sa.table('logs', sa.column('id', sa.Integer), sa.column('project_id', sa.Integer))
+
+    max_id = bind.execute(sa.select(sa.func.max(activity_logs.c.id))).scalar() or 0
+    project_ids = {row.id for row in bind.execute(sa.select(projects.c.id))}
+
+    for batch_start in range(0, max_id + 1, BATCH_SIZE):
+        in_batch = sa.and_(
+            activity_logs.c.id >= batch_start,
+            activity_logs.c.id < batch_start + BATCH_SIZE,
+            activity_logs.c.project_id.is_(None),
+        )
+
+        bind.execute(
+            activity_logs.update()
+            .where(in_batch, activity_logs.c.entity_type == 'project',
+                   activity_logs.c.entity_id.in_(sa.select(projects.c.id)))
+            .values(project_id=activity_logs.c.entity_id)
+        )
+        for entity_type, source in (('task', tasks), ('log', logs)):
+            bind.execute(
+                activity_logs.update()
+                .where(in_batch, activity_logs.c.entity_type == entity_type)
+                .values(project_id=(
+                    sa.select(source.c.project_id)
+                    .where(source.c.id == activity_logs.c.entity_id)
+                    .scalar_subquery()
+                ))
+            )
+
+        # Tasks/logs deleted since: fall back to the project_id recorded in the payload
+        leftovers = bind.execute(
+            sa.select(activity_logs.c.id, activity_logs.c.old_value, activity_logs.c.new_value)
+            .where(in_batch, activity_logs.c.entity_type.in_(['task', 'log']))
+        ).fetchall()
+        for row in leftovers:
+            project_id = None
+            for payload in (row.new_value, row.old_value):
+                if isinstance(payload, dict) and payload.get('project_id'):
+                    project_id = payload['project_id']
+                    break
+            if project_id in project_ids:
+                bind.execute(
+                    activity_logs.update()
+                    .where(activity_logs.c.id == row.id)
+                    .values(project_id=project_id)
+                )
+
+
+def downgrade():
+    with op.batch_alter_table('activity_logs', schema=None) as batch_op:
+        batch_op.drop_index('ix_activity_logs_project_id')
+        batch_op.drop_constraint('activity_logs_project_id_fkey', type_='foreignkey')
+        batch_op.drop_column('project_id')
@@ -0,0 +1,39 @@
+"""Add updated_at to clients so report caches can detect client changes
+
+Revision ID: c6e8a0b2d4f7
+Revises: b4d6f8a0c2e5
+Create Date: 2026-10-18 17:00:00.000000
+"""
+from datetime import datetime
+
+from alembic import op
+import pytz
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = 'c6e8a0b2d4f7'
+down_revision = 'b4d6f8a0c2e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    client_cols = {c['name'] for c in inspect(bind).get_columns('clients')}
+    if 'updated_at' not in client_cols:
+        op.add_column('clients', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+
+    clients = sa.table('clients', sa.column('updated_at', sa.DateTime(timezone=True)))
+    bind.execute(
+        clients.update()
+        .where(clients.c.updated_at.is_(None))
+        .values(updated_at=datetime.now(pytz.timezone('America/Chicago')))
+    )
+    # SQLite would need a table rebuild (dropping the search triggers) to add NOT NULL
+    if bind.dialect.name == 'postgresql':
+        op.alter_column('clients', 'updated_at', nullable=False)
+
+
+def downgrade():
+    op.drop_column('clients', 'updated_at')
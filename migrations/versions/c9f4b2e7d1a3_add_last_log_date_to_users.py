@@ -0,0 +1,53 @@
+"""Add last_log_date marker to users and backfill from logs
+
+Revision ID: c9f4b2e7d1a3
+Revises: b7e2c4d6f8a1
+Create Date: 2026-10-18 11:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+import pytz
+
+
+revision = 'c9f4b2e7d1a3'
+down_revision = 'b7e2c4d6f8a1'
+branch_labels = None
+depends_on = None
+
+TIMEZONE = pytz.timezone('America/Chicago')
+
+
+def upgrade():
+    insp = inspect(op.get_bind())
+    user_cols = {c['name'] for c in insp.get_columns('users')}
+    if 'last_log_date' not in user_cols:
+        with op.batch_alter_table('users', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('last_log_date', sa.Date(), nullable=True))
+
+    bind = op.get_bind()
+    users = sa.table('users', sa.column('id', sa.Integer), sa.column('last_log_date', sa.Date))
+    logs = sa.table(
+        'logs',
+        sa.column('user_id', sa.Integer),
+        sa.column('created_at', sa.DateTime(timezone=True)),
+    )
+
+    for row in bind.execute(
+        sa.select(logs.c.user_id, sa.func.max(logs.c.created_at).label('latest'))
+        .where(logs.c.user_id.isnot(None))
+        .group_by(logs.c.user_id)
+    ):
+        latest = row.latest
+        if latest is None:
+            continue
+        # Naive values (SQLite) are already Chicago wall-clock
+        last_log_date = latest.date() if latest.tzinfo is None else latest.astimezone(TIMEZONE).date()
+        bind.execute(
+            users.update().where(users.c.id == row.user_id).values(last_log_date=last_log_date)
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('last_log_date')
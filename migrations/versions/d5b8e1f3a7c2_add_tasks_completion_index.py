@@ -0,0 +1,25 @@
+"""Add (is_complete, completed_on) index on tasks for the completed-tasks listing
+
+Revision ID: d5b8e1f3a7c2
+Revises: c9f4b2e7d1a3
+Create Date: 2026-10-18 12:00:00.000000
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+
+revision = 'd5b8e1f3a7c2'
+down_revision = 'c9f4b2e7d1a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    insp = inspect(op.get_bind())
+    existing = {ix['name'] for ix in insp.get_indexes('tasks')}
+    if 'ix_tasks_is_complete_completed_on' not in existing:
+        op.create_index('ix_tasks_is_complete_completed_on', 'tasks', ['is_complete', 'completed_on'])
+
+
+def downgrade():
+    op.drop_index('ix_tasks_is_complete_completed_on', table_name='tasks')
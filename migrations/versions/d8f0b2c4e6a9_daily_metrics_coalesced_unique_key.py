@@ -0,0 +1,72 @@
+"""Replace daily_metrics unique constraint with a NULL-safe unique index
+
+UNIQUE (metric_date, user_id, project_id) never matched rows whose user or
+project is NULL, so duplicates could pile up. Duplicates are merged first,
+then the key becomes a unique index on coalesce(user_id, 0) /
+coalesce(project_id, 0), which DailyMetric.track() also uses as its
+ON CONFLICT target.
+
+Revision ID: d8f0b2c4e6a9
+Revises: c6e8a0b2d4f7
+Create Date: 2026-10-18 18:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = 'd8f0b2c4e6a9'
+down_revision = 'c6e8a0b2d4f7'
+branch_labels = None
+depends_on = None
+
+COUNTER_FIELDS = ('hours', 'touch_hours', 'fixed_cost', 'log_count', 'tasks_created', 'tasks_completed')
+
+
+def _merge_duplicates(bind):
+    daily_metrics = sa.table(
+        'daily_metrics',
+        sa.column('id', sa.Integer),
+        sa.column('metric_date', sa.Date),
+        sa.column('user_id', sa.Integer),
+        sa.column('project_id', sa.Integer),
+        *(sa.column(field) for field in COUNTER_FIELDS),
+    )
+    c = daily_metrics.c
+    key = (c.metric_date, sa.func.coalesce(c.user_id, 0), sa.func.coalesce(c.project_id, 0))
+    duplicates = bind.execute(
+        sa.select(*key, *(sa.func.sum(c[field]) for field in COUNTER_FIELDS), sa.func.min(c.id))
+        .group_by(*key).having(sa.func.count() > 1)
+    ).fetchall()
+    for row in duplicates:
+        metric_date, user_key, project_key = row[:3]
+        totals = dict(zip(COUNTER_FIELDS, row[3:-1]))
+        keep_id = row[-1]
+        same_key = sa.and_(
+            c.metric_date == metric_date,
+            sa.func.coalesce(c.user_id, 0) == user_key,
+            sa.func.coalesce(c.project_id, 0) == project_key,
+        )
+        bind.execute(daily_metrics.delete().where(same_key, c.id != keep_id))
+        bind.execute(daily_metrics.update().where(c.id == keep_id).values(**totals))
+
+
+def upgrade():
+    bind = op.get_bind()
+    insp = inspect(bind)
+    _merge_duplicates(bind)
+    if any(uc['name'] == 'unique_daily_metric' for uc in insp.get_unique_constraints('daily_metrics')):
+        with op.batch_alter_table('daily_metrics', schema=None) as batch_op:
+            batch_op.drop_constraint('unique_daily_metric', type_='unique')
+    if not any(ix['name'] == 'ux_daily_metrics_key' for ix in insp.get_indexes('daily_metrics')):
+        op.create_index(
+            'ux_daily_metrics_key', 'daily_metrics',
+            ['metric_date', sa.text('coalesce(user_id, 0)'), sa.text('coalesce(project_id, 0)')],
+            unique=True,
+        )
+
+
+def downgrade():
+    op.drop_index('ux_daily_metrics_key', table_name='daily_metrics')
+    with op.batch_alter_table('daily_metrics', schema=None) as batch_op:
+        batch_op.create_unique_constraint('unique_daily_metric', ['metric_date', 'user_id', 'project_id'])
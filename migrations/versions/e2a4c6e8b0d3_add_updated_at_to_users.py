@@ -0,0 +1,39 @@
+"""Add updated_at to users so report caches can detect renamed users
+
+Revision ID: e2a4c6e8b0d3
+Revises: d8f0b2c4e6a9
+Create Date: 2026-10-18 19:00:00.000000
+"""
+from datetime import datetime
+
+from alembic import op
+import pytz
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = 'e2a4c6e8b0d3'
+down_revision = 'd8f0b2c4e6a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    user_cols = {c['name'] for c in inspect(bind).get_columns('users')}
+    if 'updated_at' not in user_cols:
+        op.add_column('users', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+
+    users = sa.table('users', sa.column('updated_at', sa.DateTime(timezone=True)))
+    bind.execute(
+        users.update()
+        .where(users.c.updated_at.is_(None))
+        .values(updated_at=datetime.now(pytz.timezone('America/Chicago')))
+    )
+    # Matches clients.updated_at: NOT NULL is left to Postgres rather than rebuilding the SQLite table
+    if bind.dialect.name == 'postgresql':
+        op.alter_column('users', 'updated_at', nullable=False)
+
+
+def downgrade():
+    op.drop_column('users', 'updated_at')
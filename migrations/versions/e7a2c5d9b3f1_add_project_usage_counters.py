@@ -0,0 +1,109 @@
+"""Add denormalized usage counters to projects and backfill in batches
+
+Revision ID: e7a2c5d9b3f1
+Revises: d5b8e1f3a7c2
+Create Date: 2026-10-18 13:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = 'e7a2c5d9b3f1'
+down_revision = 'd5b8e1f3a7c2'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+
+def upgrade():
+    insp = inspect(op.get_bind())
+    project_cols = {c['name'] for c in insp.get_columns('projects')}
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        if 'used_hours' not in project_cols:
+            batch_op.add_column(sa.Column('used_hours', sa.Float(), nullable=False, server_default='0'))
+        if 'used_cost' not in project_cols:
+            batch_op.add_column(sa.Column('used_cost', sa.Numeric(12, 2), nullable=False, server_default='0'))
+        if 'open_task_count' not in project_cols:
+            batch_op.add_column(sa.Column('open_task_count', sa.Integer(), nullable=False, server_default='0'))
+        if 'last_log_at' not in project_cols:
+            batch_op.add_column(sa.Column('last_log_at', sa.DateTime(timezone=True), nullable=True))
+        if 'last_activity_at' not in project_cols:
+            batch_op.add_column(sa.Column('last_activity_at', sa.DateTime(timezone=True), nullable=True))
+
+    bind = op.get_bind()
+    projects = sa.table(
+        'projects',
+        sa.column('id', sa.Integer),
+        sa.column('used_hours', sa.Float),
+        sa.column('used_cost', sa.Numeric(12, 2)),
+        sa.column('open_task_count', sa.Integer),
+        sa.column('last_log_at', sa.DateTime(timezone=True)),
+        sa.column('last_activity_at', sa.DateTime(timezone=True)),
+    )
+    logs = sa.table(
+        'logs',
+        sa.column('project_id', sa.Integer),
+        sa.column('hours', sa.Float),
+        sa.column('fixed_cost', sa.Numeric(10, 2)),
+        sa.column('created_at', sa.DateTime(timezone=True)),
+    )
+    tasks = sa.table(
+        'tasks',
+        sa.column('id', sa.Integer),
+        sa.column('project_id', sa.Integer),
+        sa.column('is_complete', sa.Boolean),
+        sa.column('created_at', sa.DateTime(timezone=True)),
+        sa.column('completed_on', sa.DateTime(timezone=True)),
+    )
+
+    project_ids = [row.id for row in bind.execute(sa.select(projects.c.id).order_by(projects.c.id))]
+    for start in range(0, len(project_ids), BATCH_SIZE):
+        batch = project_ids[start:start + BATCH_SIZE]
+        values = {
+            project_id: {'used_hours': 0.0, 'used_cost': 0, 'open_task_count': 0,
+                         'last_log_at': None, 'last_activity_at': None}
+            for project_id in batch
+        }
+
+        def bump_activity(entry, value):
+            if value is not None and (entry['last_activity_at'] is None or value > entry['last_activity_at']):
+                entry['last_activity_at'] = value
+
+        for row in bind.execute(
+            sa.select(
+                logs.c.project_id,
+                sa.func.coalesce(sa.func.sum(logs.c.hours), 0).label('hours'),
+                sa.func.coalesce(sa.func.sum(logs.c.fixed_cost), 0).label('cost'),
+                sa.func.max(logs.c.created_at).label('last_log'),
+            ).where(logs.c.project_id.in_(batch)).group_by(logs.c.project_id)
+        ):
+            entry = values[row.project_id]
+            entry.update(used_hours=float(row.hours or 0), used_cost=row.cost or 0, last_log_at=row.last_log)
+            bump_activity(entry, row.last_log)
+
+        for row in bind.execute(
+            sa.select(
+                tasks.c.project_id,
+                sa.func.sum(sa.case((tasks.c.is_complete.is_(False), 1), else_=0)).label('open_tasks'),
+                sa.func.max(tasks.c.created_at).label('last_created'),
+                sa.func.max(tasks.c.completed_on).label('last_completed'),
+            ).where(tasks.c.project_id.in_(batch)).group_by(tasks.c.project_id)
+        ):
+            entry = values[row.project_id]
+            entry['open_task_count'] = int(row.open_tasks or 0)
+            bump_activity(entry, row.last_created)
+            bump_activity(entry, row.last_completed)
+
+        for project_id, entry in values.items():
+            bind.execute(projects.update().where(projects.c.id == project_id).values(**entry))
+
+
+def downgrade():
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_column('last_activity_at')
+        batch_op.drop_column('last_log_at')
+        batch_op.drop_column('open_task_count')
+        batch_op.drop_column('used_cost')
+        batch_op.drop_column('used_hours')
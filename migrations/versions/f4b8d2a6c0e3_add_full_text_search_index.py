@@ -0,0 +1,100 @@
+"""Add full-text search index over tasks, logs, projects, clients and quotes
+
+Postgres: STORED generated tsvector columns with GIN indexes.
+SQLite: FTS5 shadow table kept current by triggers (local development).
+
+Revision ID: f4b8d2a6c0e3
+Revises: e7a2c5d9b3f1
+Create Date: 2026-10-18 14:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = 'f4b8d2a6c0e3'
+down_revision = 'e7a2c5d9b3f1'
+branch_labels = None
+depends_on = None
+
+# table -> (title column, body column, FTS rowid type code); mirrors search.SEARCH_SOURCES
+SOURCES = {
+    'tasks': (None, 'description', 1),
+    'logs': (None, 'notes', 2),
+    'projects': ('name', 'notes', 3),
+    'clients': ('name', 'notes', 4),
+    'quotes': ('title', 'scope_summary', 5),
+}
+ROWID_STRIDE = 8
+
+
+def _tsvector(title, body):
+    parts = []
+    if title:
+        parts.append(f"setweight(to_tsvector('english', coalesce({title}, '')), 'A')")
+    parts.append(f"setweight(to_tsvector('english', coalesce({body}, '')), 'B')")
+    return ' || '.join(parts)
+
+
+def _upgrade_postgres(bind):
+    insp = inspect(bind)
+    for table, (title, body, _) in SOURCES.items():
+        columns = {c['name'] for c in insp.get_columns(table)}
+        if 'search_vector' not in columns:
+            op.execute(
+                f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+                f"GENERATED ALWAYS AS ({_tsvector(title, body)}) STORED"
+            )
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)")
+
+
+def _upgrade_sqlite():
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index "
+        "USING fts5(title, body, tokenize='porter unicode61')"
+    )
+    op.execute("DELETE FROM search_index")
+    for table, (title, body, code) in SOURCES.items():
+        def fts_text(alias):
+            title_sql = f"coalesce({alias}.{title}, '')" if title else "''"
+            return title_sql, f"coalesce({alias}.{body}, '')"
+
+        new_title, new_body = fts_text('new')
+        src_title, src_body = fts_text('src')
+        watched = ', '.join(c for c in (title, body) if c)
+        insert = (
+            f"INSERT INTO search_index(rowid, title, body) "
+            f"VALUES (new.id * {ROWID_STRIDE} + {code}, {new_title}, {new_body});"
+        )
+        delete = f"DELETE FROM search_index WHERE rowid = old.id * {ROWID_STRIDE} + {code};"
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} BEGIN {insert} END")
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE OF {watched} ON {table} "
+            f"BEGIN {delete} {insert} END"
+        )
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} BEGIN {delete} END")
+        op.execute(
+            f"INSERT INTO search_index(rowid, title, body) "
+            f"SELECT src.id * {ROWID_STRIDE} + {code}, {src_title}, {src_body} FROM {table} AS src"
+        )
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        _upgrade_postgres(bind)
+    elif bind.dialect.name == 'sqlite':
+        _upgrade_sqlite()
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        for table in SOURCES:
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+            op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+    elif bind.dialect.name == 'sqlite':
+        for table in SOURCES:
+            for suffix in ('ai', 'au', 'ad'):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_search_{suffix}")
+        op.execute("DROP TABLE IF EXISTS search_index")
@@ -1,10 +1,18 @@
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, time
+from decimal import Decimal
+import re
+from sqlalchemy import func, case, and_, or_, update, insert, delete, event, literal_column
+from sqlalchemy.orm import Session as SASession
 import pytz
 
 # Create db instance that will be initialized in app.py
 db = SQLAlchemy()
 
+# Inline tags in task descriptions: @[User Name] and #[Project Name]
+USER_TAG_RE = re.compile(r'@\[(.*?)\]')
+PROJECT_TAG_RE = re.compile(r'#\[(.*?)\]')
+
 # Time zone configuration
 TIMEZONE = pytz.timezone('America/Chicago')
 
@@ -12,6 +20,42 @@ def get_current_time():
     """Get current time in Chicago timezone"""
     return datetime.now(TIMEZONE)
 
+def local_day_expr(column):
+    """SQL expression bucketing a timestamp column by Chicago calendar day.
+
+    Postgres stores timestamptz in UTC, so convert before truncating; SQLite
+    keeps the Chicago wall-clock value we wrote, so date() is enough.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        return func.date(func.timezone(TIMEZONE.zone, column))
+    return func.date(column)
+
+def local_day_key(value):
+    """Normalize a local_day_expr() result (date or 'YYYY-MM-DD' string) to a string key."""
+    if value is None:
+        return None
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()[:10]
+    return str(value)[:10]
+
+def to_local_date(dt):
+    """Chicago calendar date for a stored timestamp (naive values are already Chicago wall-clock)."""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.date()
+    return dt.astimezone(TIMEZONE).date()
+
+def _same_instant(a, b):
+    """Compare stored timestamps that may mix naive (Chicago wall-clock) and aware values."""
+    if a is None or b is None:
+        return a is b
+    if a.tzinfo is None:
+        a = TIMEZONE.localize(a)
+    if b.tzinfo is None:
+        b = TIMEZONE.localize(b)
+    return a == b
+
 # Association table for User-Equipment relationship
 user_equipment = db.Table('user_equipment',
     db.Column('user_id', db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
@@ -45,6 +89,8 @@ class User(db.Model):
     email = db.Column(db.String(120), nullable=False, unique=True)
     role = db.Column(db.String(20), nullable=False, default='trainee')  # admin, trainee, finance
     password = db.Column(db.String(255), nullable=True)  # Will implement hashing later
+    last_log_date = db.Column(db.Date, nullable=True)  # Chicago date of the user's most recent log
+    updated_at = db.Column(db.DateTime(timezone=True), default=get_current_time, onupdate=get_current_time, nullable=False)
     
     # Relationships
     created_tasks = db.relationship('Task', foreign_keys='Task.created_by', backref='creator', lazy='dynamic')
@@ -63,6 +109,31 @@ class User(db.Model):
     def full_name(self):
         return f"{self.first_name} {self.last_name or ''}".strip()
     
+    def note_log(self, created_at):
+        """Advance last_log_date for a newly written log (caller commits)."""
+        log_date = to_local_date(created_at or get_current_time())
+        if self.last_log_date is None or log_date > self.last_log_date:
+            self.last_log_date = log_date
+
+    def refresh_last_log_date(self):
+        """Recompute last_log_date from the logs table after an edit or delete (caller commits)."""
+        latest = db.session.query(func.max(Log.created_at)).filter(Log.user_id == self.id).scalar()
+        self.last_log_date = to_local_date(latest)
+
+    def has_logged_on(self, day):
+        if self.last_log_date is None or self.last_log_date < day:
+            return False
+        if self.last_log_date == day:
+            return True
+        # A later (future-dated) log hides whether this day has one, so look it up
+        window_start = TIMEZONE.localize(datetime.combine(day, time.min))
+        window_end = TIMEZONE.localize(datetime.combine(day + timedelta(days=1), time.min))
+        return db.session.query(
+            Log.query.filter(Log.user_id == self.id,
+                             Log.created_at >= window_start,
+                             Log.created_at < window_end).exists()
+        ).scalar()
+
     def set_last_name(self, value):
         """Set last_name, converting empty strings to None"""
         self.last_name = value.strip() if value and value.strip() else None
@@ -109,95 +180,248 @@ class Membership(db.Model):
             MembershipFunding.end_date >= now
         )
     
+    @property
+    def usage(self):
+        """Funding totals and log usage from MembershipUsage, memoized for the request."""
+        return MembershipUsage.for_membership(self.id)
+    
     @property
     def all_time_amount(self):
-        return sum(f.amount or 0 for f in self.funding_entries)
+        return self.usage.all_time_amount
     
     @property
     def total_budget_all_time(self):
-        return sum(f.dollar_budget or 0 for f in self.funding_entries)
+        return self.usage.total_budget_all_time
     
     @property
     def total_time_all_time(self):
-        return sum(f.time_budget or 0 for f in self.funding_entries)
+        return self.usage.total_time_all_time
     
     @property
     def total_budget(self):
         """Active dollar budget (legacy-compatible name)."""
-        return sum(f.dollar_budget or 0 for f in self.active_funding)
+        return self.usage.total_budget
     
     @property
     def total_time(self):
         """Active time budget (legacy-compatible name)."""
-        return sum(f.time_budget or 0 for f in self.active_funding)
-    
-    def _membership_logs(self):
-        return db.session.query(Log).join(
-            Project, Project.id == Log.project_id
-        ).join(
-            Client, Client.id == Project.client_id
-        ).filter(
-            Client.membership_id == self.id
-        ).all()
+        return self.usage.total_time
     
     @property
     def used_budget_all_time(self):
-        return float(sum(float(log.fixed_cost or 0) for log in self._membership_logs()))
+        return self.usage.used_budget_all_time
 
     @property
     def used_time_all_time(self):
-        return float(sum(float(log.hours or 0) for log in self._membership_logs()))
+        return self.usage.used_time_all_time
 
     @property
     def used_budget(self):
         """Usage within currently active funding windows (legacy-compatible name)."""
-        active_windows = [(f.start_date, f.end_date) for f in self.active_funding]
-        if not active_windows:
-            return 0.0
-        total = 0.0
-        for log in self._membership_logs():
-            created_at = log.created_at
-            if created_at and any(start <= created_at <= end for start, end in active_windows):
-                total += float(log.fixed_cost or 0)
-        return total
+        return self.usage.used_budget
 
     @property
     def used_time(self):
         """Usage within currently active funding windows (legacy-compatible name)."""
-        active_windows = [(f.start_date, f.end_date) for f in self.active_funding]
-        if not active_windows:
-            return 0.0
-        total = 0.0
-        for log in self._membership_logs():
-            created_at = log.created_at
-            if created_at and any(start <= created_at <= end for start, end in active_windows):
-                total += float(log.hours or 0)
-        return total
+        return self.usage.used_time
 
     @property
     def unfunded_budget(self):
-        return self.used_budget_all_time - self.used_budget
+        return self.usage.unfunded_budget
 
     @property
     def unfunded_time(self):
-        return self.used_time_all_time - self.used_time
+        return self.usage.unfunded_time
 
     @property
     def remaining_budget(self):
-        return self.total_budget - self.used_budget
+        return self.usage.remaining_budget
 
     @property
     def remaining_time(self):
-        return self.total_time - self.used_time
+        return self.usage.remaining_time
 
     @property
     def is_active(self):
         """Dynamic active trait: any funding entry active now."""
-        now = get_current_time()
-        return self.funding_entries.filter(
-            MembershipFunding.start_date <= now,
-            MembershipFunding.end_date >= now
-        ).count() > 0
+        return self.usage.is_active
+
+
+class MembershipUsage:
+    """Funding totals and log usage for memberships, computed in SQL.
+
+    Funding comes from one grouped query over membership_funding, client
+    counts from one over clients, and usage from one over the memberships'
+    logs, where a log counts as funded when its created_at falls BETWEEN the
+    start/end of any funding window active at `at`. Results as of now are
+    memoized per membership in the session (i.e. per request); the memo is
+    dropped on flush, commit and rollback so writes are never hidden.
+    """
+    CACHE_KEY = 'membership_usage'
+    
+    def __init__(self, membership_id, is_active=False, funding_count=0, client_count=0, all_time_amount=0,
+                 total_budget_all_time=0, total_time_all_time=0, total_budget=0, total_time=0,
+                 used_budget_all_time=0.0, used_time_all_time=0.0, used_budget=0.0, used_time=0.0):
+        self.membership_id = membership_id
+        self.is_active = is_active
+        self.funding_count = funding_count
+        self.client_count = client_count
+        self.all_time_amount = all_time_amount
+        self.total_budget_all_time = total_budget_all_time
+        self.total_time_all_time = total_time_all_time
+        self.total_budget = total_budget
+        self.total_time = total_time
+        self.used_budget_all_time = used_budget_all_time
+        self.used_time_all_time = used_time_all_time
+        self.used_budget = used_budget
+        self.used_time = used_time
+    
+    def __repr__(self):
+        return f'<MembershipUsage {self.membership_id}>'
+    
+    @property
+    def unfunded_budget(self):
+        return self.used_budget_all_time - self.used_budget
+    
+    @property
+    def unfunded_time(self):
+        return self.used_time_all_time - self.used_time
+    
+    @property
+    def remaining_budget(self):
+        return self.total_budget - self.used_budget
+    
+    @property
+    def remaining_time(self):
+        return self.total_time - self.used_time
+    
+    @staticmethod
+    def active_window(at):
+        """Criteria for funding entries active at `at`."""
+        return (MembershipFunding.start_date <= at, MembershipFunding.end_date >= at)
+    
+    @classmethod
+    def _compute(cls, membership_ids, at):
+        """{membership_id: MembershipUsage} for membership_ids, in three grouped queries."""
+        membership_ids = list(membership_ids)
+        usage = {membership_id: cls(membership_id) for membership_id in membership_ids}
+        if not membership_ids:
+            return usage
+        
+        active = and_(*cls.active_window(at))
+        for row in db.session.query(
+            MembershipFunding.membership_id,
+            func.count(MembershipFunding.id).label('funding_count'),
+            func.coalesce(func.sum(MembershipFunding.amount), 0).label('all_time_amount'),
+            func.coalesce(func.sum(MembershipFunding.dollar_budget), 0).label('total_budget_all_time'),
+            func.coalesce(func.sum(MembershipFunding.time_budget), 0).label('total_time_all_time'),
+            func.coalesce(func.sum(case((active, MembershipFunding.dollar_budget), else_=0)), 0).label('total_budget'),
+            func.coalesce(func.sum(case((active, MembershipFunding.time_budget), else_=0)), 0).label('total_time'),
+            func.coalesce(func.sum(case((active, 1), else_=0)), 0).label('active_count'),
+        ).filter(
+            MembershipFunding.membership_id.in_(membership_ids)
+        ).group_by(MembershipFunding.membership_id):
+            entry = usage[row.membership_id]
+            entry.funding_count = row.funding_count
+            entry.all_time_amount = row.all_time_amount
+            entry.total_budget_all_time = row.total_budget_all_time
+            entry.total_time_all_time = row.total_time_all_time
+            entry.total_budget = row.total_budget
+            entry.total_time = row.total_time
+            entry.is_active = row.active_count > 0
+        
+        for membership_id, client_count in db.session.query(
+            Client.membership_id, func.count(Client.id)
+        ).filter(
+            Client.membership_id.in_(membership_ids)
+        ).group_by(Client.membership_id):
+            usage[membership_id].client_count = client_count
+        
+        # A log is funded if it falls inside any active window; EXISTS (rather
+        # than joining the windows) keeps overlapping windows from double counting
+        funded = db.session.query(MembershipFunding.id).filter(
+            MembershipFunding.membership_id == Client.membership_id,
+            active,
+            Log.created_at.between(MembershipFunding.start_date, MembershipFunding.end_date),
+        ).exists()
+        for row in db.session.query(
+            Client.membership_id,
+            func.coalesce(func.sum(Log.fixed_cost), 0).label('used_budget_all_time'),
+            func.coalesce(func.sum(Log.hours), 0).label('used_time_all_time'),
+            func.coalesce(func.sum(case((funded, Log.fixed_cost), else_=0)), 0).label('used_budget'),
+            func.coalesce(func.sum(case((funded, Log.hours), else_=0)), 0).label('used_time'),
+        ).join(
+            Project, Project.id == Log.project_id
+        ).join(
+            Client, Client.id == Project.client_id
+        ).filter(
+            Client.membership_id.in_(membership_ids)
+        ).group_by(Client.membership_id):
+            entry = usage[row.membership_id]
+            entry.used_budget_all_time = float(row.used_budget_all_time or 0)
+            entry.used_time_all_time = float(row.used_time_all_time or 0)
+            entry.used_budget = float(row.used_budget or 0) if entry.is_active else 0.0
+            entry.used_time = float(row.used_time or 0) if entry.is_active else 0.0
+        return usage
+    
+    @staticmethod
+    def funding_usage(membership_id):
+        """{funding_id: (used_time, used_budget)} for each of a membership's funding entries.
+
+        One query: funding entries are joined to the membership's logs on the
+        entry's time window and grouped by funding id (entries with no logs
+        in their window come back as zeros).
+        """
+        logs = db.session.query(
+            Log.hours, Log.fixed_cost, Log.created_at
+        ).join(
+            Project, Project.id == Log.project_id
+        ).join(
+            Client, Client.id == Project.client_id
+        ).filter(
+            Client.membership_id == membership_id
+        ).subquery()
+        rows = db.session.query(
+            MembershipFunding.id,
+            func.coalesce(func.sum(logs.c.hours), 0),
+            func.coalesce(func.sum(logs.c.fixed_cost), 0),
+        ).outerjoin(
+            logs, logs.c.created_at.between(MembershipFunding.start_date, MembershipFunding.end_date)
+        ).filter(
+            MembershipFunding.membership_id == membership_id
+        ).group_by(MembershipFunding.id)
+        return {funding_id: (float(used_time or 0), float(used_budget or 0)) for funding_id, used_time, used_budget in rows}
+    
+    @classmethod
+    def _memo(cls):
+        return db.session.info.setdefault(cls.CACHE_KEY, {})
+    
+    @classmethod
+    def for_memberships(cls, membership_ids, at=None):
+        """{membership_id: MembershipUsage} for many memberships in a fixed number of queries.
+
+        With at=None (now) the results also prime the per-request memo, so the
+        Membership properties of those memberships cost nothing afterwards.
+        """
+        if at is not None:
+            return cls._compute(membership_ids, at)
+        memo = cls._memo()
+        missing = [membership_id for membership_id in membership_ids if membership_id not in memo]
+        if missing:
+            memo.update(cls._compute(missing, get_current_time()))
+        return {membership_id: memo[membership_id] for membership_id in membership_ids}
+    
+    @classmethod
+    def for_membership(cls, membership_id):
+        """Usage for one membership as of now, computed at most once per request."""
+        return cls.for_memberships([membership_id])[membership_id]
+
+
+@event.listens_for(SASession, 'after_flush')
+@event.listens_for(SASession, 'after_commit')
+@event.listens_for(SASession, 'after_soft_rollback')
+def _reset_membership_usage(session, *args):
+    session.info.pop(MembershipUsage.CACHE_KEY, None)
 
 class MembershipFunding(db.Model):
     __tablename__ = 'membership_funding'
@@ -233,6 +457,7 @@ class Client(db.Model):
     bill_to_state = db.Column(db.String(120), nullable=True)
     bill_to_postal_code = db.Column(db.String(40), nullable=True)
     bill_to_country = db.Column(db.String(120), nullable=True)
+    updated_at = db.Column(db.DateTime(timezone=True), default=get_current_time, onupdate=get_current_time, nullable=False)
     
     # Relationships (DB FK clients <- projects uses ON DELETE CASCADE; passive_deletes avoids ORM pre-loading)
     projects = db.relationship('Project', backref='client', lazy='dynamic', passive_deletes=True)
@@ -259,6 +484,14 @@ class Project(db.Model):
     created_at = db.Column(db.DateTime(timezone=True), default=get_current_time, nullable=False)
     updated_at = db.Column(db.DateTime(timezone=True), default=get_current_time, onupdate=get_current_time, nullable=False)
     
+    # Usage counters maintained by the Log/Task write paths (see track_* below);
+    # `flask reconcile-project-counters` repairs drift
+    used_hours = db.Column(db.Float, default=0, server_default='0', nullable=False)
+    used_cost = db.Column(db.Numeric(12, 2), default=0, server_default='0', nullable=False)
+    open_task_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    last_log_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    last_activity_at = db.Column(db.DateTime(timezone=True), nullable=True)  # Latest log, task creation or completion
+    
     # Relationships (FK cascades on project delete are defined on Task/Log/UserProjectPin columns)
     tasks = db.relationship('Task', backref='project', lazy='dynamic', passive_deletes=True)
     logs = db.relationship('Log', backref='project', lazy='dynamic', passive_deletes=True)
@@ -268,6 +501,148 @@ class Project(db.Model):
     def __repr__(self):
         return f'<Project {self.name}>'
     
+    @property
+    def used_budget(self):
+        return float(self.used_cost or 0)
+    
+    @property
+    def open_tasks_count(self):
+        return self.open_task_count or 0
+    
+    @classmethod
+    def _update_counters(cls, project_id, **values):
+        """Apply counter updates in SQL (caller commits); leaves updated_at untouched."""
+        if project_id is None or not values:
+            return
+        db.session.execute(
+            update(cls).where(cls.id == project_id)
+            .values(updated_at=cls.updated_at, **values)
+            .execution_options(synchronize_session=False)
+        )
+    
+    @staticmethod
+    def _later_of(column, value):
+        return case((or_(column.is_(None), column < value), value), else_=column)
+    
+    @classmethod
+    def track_log(cls, log, sign=1):
+        """Add (sign=1) or retract (sign=-1) a log's hours/cost; refresh_recency() after retracting."""
+        values = {
+            'used_hours': cls.used_hours + sign * float(log.hours or 0),
+            'used_cost': cls.used_cost + sign * Decimal(str(log.fixed_cost or 0)),
+        }
+        if sign > 0 and log.created_at:
+            values['last_log_at'] = cls._later_of(cls.last_log_at, log.created_at)
+            values['last_activity_at'] = cls._later_of(cls.last_activity_at, log.created_at)
+        cls._update_counters(log.project_id, **values)
+    
+    @classmethod
+    def track_task_created(cls, task, sign=1):
+        values = {'open_task_count': cls.open_task_count + sign}
+        if sign > 0 and task.created_at:
+            values['last_activity_at'] = cls._later_of(cls.last_activity_at, task.created_at)
+        cls._update_counters(task.project_id, **values)
+    
+    @classmethod
+    def track_task_completed(cls, task, sign=1):
+        values = {'open_task_count': cls.open_task_count - sign}
+        if sign > 0 and task.completed_on:
+            values['last_activity_at'] = cls._later_of(cls.last_activity_at, task.completed_on)
+        cls._update_counters(task.project_id, **values)
+    
+    @classmethod
+    def _recency(cls, project_ids):
+        """{project_id: (last_log_at, last_activity_at)} computed from logs and tasks."""
+        latest = {project_id: [None, None] for project_id in project_ids}
+        
+        def merge(project_id, value, log_time=False):
+            if value is None:
+                return
+            entry = latest[project_id]
+            if log_time and (entry[0] is None or value > entry[0]):
+                entry[0] = value
+            if entry[1] is None or value > entry[1]:
+                entry[1] = value
+        
+        for project_id, value in db.session.query(Log.project_id, func.max(Log.created_at)).filter(
+            Log.project_id.in_(project_ids)
+        ).group_by(Log.project_id):
+            merge(project_id, value, log_time=True)
+        for project_id, created, completed in db.session.query(
+            Task.project_id, func.max(Task.created_at), func.max(Task.completed_on)
+        ).filter(Task.project_id.in_(project_ids)).group_by(Task.project_id):
+            merge(project_id, created)
+            merge(project_id, completed)
+        return {project_id: tuple(entry) for project_id, entry in latest.items()}
+    
+    @classmethod
+    def refresh_recency(cls, project_id):
+        """Recompute last_log_at/last_activity_at after a log or task was edited or removed."""
+        if project_id is None:
+            return
+        db.session.flush()
+        last_log_at, last_activity_at = cls._recency([project_id])[project_id]
+        cls._update_counters(project_id, last_log_at=last_log_at, last_activity_at=last_activity_at)
+    
+    @classmethod
+    def reconcile(cls, batch_size=500, dry_run=False):
+        """Recompute every project's counters from logs and tasks and repair drift.
+
+        Works through projects in id batches, committing each batch unless
+        dry_run. Returns {'checked', 'repaired'}.
+        """
+        stats = {'checked': 0, 'repaired': 0}
+        last_id = 0
+        while True:
+            projects = cls.query.filter(cls.id > last_id).order_by(cls.id.asc()).limit(batch_size).all()
+            if not projects:
+                break
+            last_id = projects[-1].id
+            project_ids = [project.id for project in projects]
+            
+            usage = {
+                row.project_id: row for row in db.session.query(
+                    Log.project_id,
+                    func.coalesce(func.sum(Log.hours), 0).label('hours'),
+                    func.coalesce(func.sum(Log.fixed_cost), 0).label('cost')
+                ).filter(Log.project_id.in_(project_ids)).group_by(Log.project_id)
+            }
+            open_counts = dict(
+                db.session.query(Task.project_id, func.count(Task.id)).filter(
+                    Task.project_id.in_(project_ids), Task.is_complete == False
+                ).group_by(Task.project_id).all()
+            )
+            recency = cls._recency(project_ids)
+            
+            for project in projects:
+                stats['checked'] += 1
+                row = usage.get(project.id)
+                expected = {
+                    'used_hours': float(row.hours) if row else 0.0,
+                    'used_cost': Decimal(str(row.cost)).quantize(Decimal('0.01')) if row else Decimal('0.00'),
+                    'open_task_count': open_counts.get(project.id, 0),
+                    'last_log_at': recency[project.id][0],
+                    'last_activity_at': recency[project.id][1],
+                }
+                drifted = (
+                    abs((project.used_hours or 0) - expected['used_hours']) > 1e-6
+                    or Decimal(str(project.used_cost or 0)).quantize(Decimal('0.01')) != expected['used_cost']
+                    or project.open_task_count != expected['open_task_count']
+                    or not _same_instant(project.last_log_at, expected['last_log_at'])
+                    or not _same_instant(project.last_activity_at, expected['last_activity_at'])
+                )
+                if drifted:
+                    stats['repaired'] += 1
+                    if not dry_run:
+                        cls._update_counters(project.id, **expected)
+            
+            if dry_run:
+                db.session.rollback()
+            else:
+                db.session.commit()
+            db.session.expunge_all()
+        return stats
+    
     def update_status(self, new_status, user_id):
         """Update project status and log the change"""
         old_status = self.status
@@ -296,24 +671,34 @@ class Task(db.Model):
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=True)  # Adding project relationship
     created_at = db.Column(db.DateTime(timezone=True), default=get_current_time, nullable=False)
     
+    # Backs the completed-tasks listing (newest completion first)
+    __table_args__ = (db.Index('ix_tasks_is_complete_completed_on', 'is_complete', 'completed_on'),)
+    
     # Relationships
     flags = db.relationship('UserTaskFlag', backref='task', lazy='dynamic', cascade='all, delete-orphan')
+    mentions = db.relationship('TaskMention', backref='task', cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<Task {self.description[:30]}...>'
     
-    def mark_complete(self, user_id):
-        """Mark task as complete by a user"""
-        self.is_complete = True
-        self.completed_by_user_id = user_id
-        self.completed_on = get_current_time()
-        
-        # Log the activity
-        ActivityLog.log_activity(
+    def sync_mentions(self, lookups=None):
+        """Re-parse the description's tags into task_mentions; call after editing description or project."""
+        wanted = TaskMention.resolve(self.description, self.project_id, lookups)
+        current = {(m.kind, m.target_id): m for m in self.mentions}
+        for key, mention in current.items():
+            if key not in wanted:
+                self.mentions.remove(mention)
+        for kind, target_id in sorted(wanted - current.keys()):
+            self.mentions.append(TaskMention(kind=kind, target_id=target_id))
+    
+    def completion_activity(self, user_id):
+        """Keyword arguments for the task_completed ActivityLog entry."""
+        return dict(
             user_id=user_id,
             activity_type='task_completed',
             entity_type='task',
             entity_id=self.id,
+            project_id=self.project_id,
             new_value={
                 'description': self.description,
                 'project_id': self.project_id,
@@ -321,16 +706,131 @@ class Task(db.Model):
             }
         )
     
+    def mark_complete(self, user_id, log_activity=True):
+        """Mark task as complete by a user (log_activity=False when the caller bulk-logs)"""
+        self.is_complete = True
+        self.completed_by_user_id = user_id
+        self.completed_on = get_current_time()
+        DailyMetric.track_task_completed(self)
+        Project.track_task_completed(self)
+        
+        # Log the activity
+        if log_activity:
+            ActivityLog.log_activity(**self.completion_activity(user_id))
+    
+    def mark_incomplete(self, refresh_recency=True):
+        """Reopen a completed task (refresh_recency=False when the caller refreshes per project)"""
+        DailyMetric.track_task_completed(self, sign=-1)
+        Project.track_task_completed(self, sign=-1)
+        self.is_complete = False
+        self.completed_by_user_id = None
+        self.completed_on = None
+        if refresh_recency:
+            Project.refresh_recency(self.project_id)
+    
     def toggle_complete(self, user_id):
         """Toggle task completion status"""
         if self.is_complete:
-            self.is_complete = False
-            self.completed_by_user_id = None
-            self.completed_on = None
+            self.mark_incomplete()
         else:
             self.mark_complete(user_id)
 
 
+class TaskMention(db.Model):
+    """An @[User] or #[Project] tag in a task description, resolved to an id.
+
+    Kept in sync by Task.sync_mentions() so "tasks that mention X" is an indexed
+    lookup rather than a regex scan over every description. Tags that don't
+    resolve to a user/project are not recorded.
+    """
+    __tablename__ = 'task_mentions'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, db.ForeignKey('tasks.id', ondelete='CASCADE'), nullable=False, index=True)
+    kind = db.Column(db.String(10), nullable=False)  # user, project
+    target_id = db.Column(db.Integer, nullable=False)  # users.id or projects.id, depending on kind
+    
+    __table_args__ = (
+        db.UniqueConstraint('task_id', 'kind', 'target_id', name='unique_task_mention'),
+        db.Index('ix_task_mentions_kind_target', 'kind', 'target_id'),
+    )
+    
+    def __repr__(self):
+        return f'<TaskMention {self.task_id}:{self.kind}:{self.target_id}>'
+    
+    @staticmethod
+    def parse(description):
+        """(user names, project names) tagged in a description, lowercased."""
+        description = description or ''
+        users = {name.strip().lower() for name in USER_TAG_RE.findall(description) if name.strip()}
+        projects = {name.strip().lower() for name in PROJECT_TAG_RE.findall(description) if name.strip()}
+        return users, projects
+    
+    @staticmethod
+    def build_lookups(user_names=None, project_names=None):
+        """Name -> id maps for resolve(). With no names given, covers every user and project (backfill)."""
+        # Full names are computed, so match users in Python (the table is small)
+        users = {}
+        if user_names is None or user_names:
+            for user in User.query.order_by(User.id):
+                users.setdefault(user.full_name.lower(), user.id)
+        
+        projects = {}
+        if project_names is None or project_names:
+            project_query = db.session.query(Project.id, Project.name)
+            if project_names is not None:
+                project_query = project_query.filter(func.lower(Project.name).in_(project_names))
+            # Most recently updated first, so an ambiguous name resolves to the live project
+            for project_id, name in project_query.order_by(Project.updated_at.desc(), Project.id.desc()):
+                projects.setdefault(name.lower(), []).append(project_id)
+        return users, projects
+    
+    @classmethod
+    def resolve(cls, description, project_id=None, lookups=None):
+        """Set of (kind, target_id) for the tags in description.
+
+        A project name shared by several projects (e.g. every client's "General")
+        resolves to the task's own project when it matches, else the most
+        recently updated one.
+        """
+        user_names, project_names = cls.parse(description)
+        if not user_names and not project_names:
+            return set()
+        users, projects = lookups or cls.build_lookups(user_names, project_names)
+        
+        mentions = {('user', users[name]) for name in user_names if name in users}
+        for name in project_names:
+            candidates = projects.get(name)
+            if candidates:
+                mentions.add(('project', project_id if project_id in candidates else candidates[0]))
+        return mentions
+    
+    @classmethod
+    def task_ids_mentioning(cls, kind, target_id):
+        """Subquery of task ids tagging the given user/project, for Task.id.in_()."""
+        return db.session.query(cls.task_id).filter(cls.kind == kind, cls.target_id == target_id)
+    
+    @classmethod
+    def backfill(cls, batch_size=500):
+        """Re-sync every task's mentions in id-ordered batches. Returns {'tasks', 'mentions'}."""
+        lookups = cls.build_lookups()
+        counts = {'tasks': 0, 'mentions': 0}
+        last_id = 0
+        while True:
+            batch = Task.query.options(db.selectinload(Task.mentions)).filter(
+                Task.id > last_id
+            ).order_by(Task.id).limit(batch_size).all()
+            if not batch:
+                break
+            for task in batch:
+                task.sync_mentions(lookups)
+                counts['mentions'] += len(task.mentions)
+            counts['tasks'] += len(batch)
+            last_id = batch[-1].id
+            db.session.commit()
+        return counts
+
+
 class Quote(db.Model):
     __tablename__ = 'quotes'
 
@@ -418,6 +918,217 @@ class Log(db.Model):
     def __repr__(self):
         return f'<Log {self.id} - {self.user.first_name if self.user else "Unknown"}>'
 
+class DailyMetric(db.Model):
+    """Per-day rollup of logs and tasks, keyed by (Chicago date, user, project).
+
+    Kept current by the log/task write paths via the track_* helpers; rebuild()
+    recomputes it from the raw logs and tasks tables.
+    """
+    __tablename__ = 'daily_metrics'
+
+    id = db.Column(db.Integer, primary_key=True)
+    metric_date = db.Column(db.Date, nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=True)
+    hours = db.Column(db.Float, default=0, nullable=False)  # Detailed (non-touch) hours
+    touch_hours = db.Column(db.Float, default=0, nullable=False)
+    fixed_cost = db.Column(db.Numeric(12, 2), default=0, nullable=False)
+    log_count = db.Column(db.Integer, default=0, nullable=False)
+    tasks_created = db.Column(db.Integer, default=0, nullable=False)
+    tasks_completed = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime(timezone=True), default=get_current_time, onupdate=get_current_time, nullable=False)
+
+    # Unique on coalesced keys so rows with a NULL user/project are deduplicated too
+    # (a plain UNIQUE treats NULLs as distinct); also the ON CONFLICT target of track()
+    __table_args__ = (
+        db.Index('ux_daily_metrics_key', 'metric_date', func.coalesce(user_id, literal_column('0')),
+                 func.coalesce(project_id, literal_column('0')), unique=True),
+    )
+
+    COUNTER_FIELDS = ('hours', 'touch_hours', 'fixed_cost', 'log_count', 'tasks_created', 'tasks_completed')
+
+    def __repr__(self):
+        return f'<DailyMetric {self.metric_date} user={self.user_id} project={self.project_id}>'
+
+    @property
+    def total_hours(self):
+        return (self.hours or 0) + (self.touch_hours or 0)
+
+    @staticmethod
+    def key_expressions(columns):
+        # Inline literal: ON CONFLICT must repeat the index expressions verbatim, not as bind params
+        return func.coalesce(columns.user_id, literal_column('0')), func.coalesce(columns.project_id, literal_column('0'))
+
+    @classmethod
+    def track(cls, metric_date, user_id, project_id, **deltas):
+        """Add deltas to the row for (metric_date, user_id, project_id), creating it if needed.
+
+        Applied in SQL like the Project counters: an UPDATE ... SET col = col + delta,
+        and when no row exists yet an INSERT ... ON CONFLICT DO UPDATE on the
+        coalesced key, so concurrent writers add up instead of losing increments
+        or failing on the unique index. Caller is responsible for committing.
+        """
+        if metric_date is None or not deltas:
+            return
+        deltas = {
+            field: Decimal(str(delta or 0)) if field == 'fixed_cost' else (delta or 0)
+            for field, delta in deltas.items()
+        }
+        now = get_current_time()
+        key = (
+            cls.metric_date == metric_date,
+            cls.user_id.is_(None) if user_id is None else cls.user_id == user_id,
+            cls.project_id.is_(None) if project_id is None else cls.project_id == project_id,
+        )
+        matched = db.session.execute(
+            update(cls).where(*key)
+            .values(updated_at=now, **{field: getattr(cls, field) + delta for field, delta in deltas.items()})
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if matched:
+            return
+
+        values = {field: 0 for field in cls.COUNTER_FIELDS}
+        values.update(deltas, metric_date=metric_date, user_id=user_id, project_id=project_id, updated_at=now)
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        else:
+            db.session.execute(insert(cls).values(**values))
+            return
+        columns = cls.__table__.c
+        statement = upsert(cls.__table__).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[columns.metric_date, *cls.key_expressions(columns)],
+            set_={
+                'updated_at': statement.excluded.updated_at,
+                **{field: columns[field] + statement.excluded[field] for field in deltas},
+            },
+        )
+        db.session.execute(statement)
+
+    @classmethod
+    def track_log(cls, log, sign=1):
+        """Apply (sign=1) or retract (sign=-1) a log's contribution."""
+        hours = float(log.hours or 0)
+        return cls.track(
+            to_local_date(log.created_at or get_current_time()), log.user_id, log.project_id,
+            hours=0 if log.is_touch else sign * hours,
+            touch_hours=sign * hours if log.is_touch else 0,
+            fixed_cost=sign * float(log.fixed_cost or 0),
+            log_count=sign,
+        )
+
+    @classmethod
+    def track_task_created(cls, task, sign=1):
+        return cls.track(
+            to_local_date(task.created_at or get_current_time()), task.created_by, task.project_id,
+            tasks_created=sign,
+        )
+
+    @classmethod
+    def track_task_completed(cls, task, sign=1):
+        if not task.completed_on:
+            return None
+        return cls.track(
+            to_local_date(task.completed_on), task.completed_by_user_id, task.project_id,
+            tasks_completed=sign,
+        )
+
+    @classmethod
+    def rebuild(cls, since=None, dry_run=False):
+        """Reconcile rows on/after `since` (a date; None = everything) with logs and tasks.
+
+        Returns counts of checked, inserted, updated, deleted and pruned (all-zero) rows.
+        """
+        since_dt = TIMEZONE.localize(datetime.combine(since, time.min)) if since else None
+        expected = {}
+
+        def bucket(day, user_id, project_id):
+            key = (local_day_key(day), user_id, project_id)
+            if key not in expected:
+                expected[key] = {field: 0 for field in cls.COUNTER_FIELDS}
+            return expected[key]
+
+        log_day = local_day_expr(Log.created_at)
+        log_query = db.session.query(
+            log_day, Log.user_id, Log.project_id,
+            func.coalesce(func.sum(case((Log.is_touch.is_(False), Log.hours), else_=0)), 0),
+            func.coalesce(func.sum(case((Log.is_touch.is_(True), Log.hours), else_=0)), 0),
+            func.coalesce(func.sum(Log.fixed_cost), 0),
+            func.count(Log.id),
+        )
+        if since_dt:
+            log_query = log_query.filter(Log.created_at >= since_dt)
+        for day, user_id, project_id, hours, touch_hours, cost, count in log_query.group_by(
+            log_day, Log.user_id, Log.project_id
+        ):
+            values = bucket(day, user_id, project_id)
+            values.update(hours=float(hours or 0), touch_hours=float(touch_hours or 0),
+                          fixed_cost=float(cost or 0), log_count=count)
+
+        created_day = local_day_expr(Task.created_at)
+        created_query = db.session.query(created_day, Task.created_by, Task.project_id, func.count(Task.id))
+        if since_dt:
+            created_query = created_query.filter(Task.created_at >= since_dt)
+        for day, user_id, project_id, count in created_query.group_by(
+            created_day, Task.created_by, Task.project_id
+        ):
+            bucket(day, user_id, project_id)['tasks_created'] = count
+
+        completed_day = local_day_expr(Task.completed_on)
+        completed_query = db.session.query(
+            completed_day, Task.completed_by_user_id, Task.project_id, func.count(Task.id)
+        ).filter(Task.is_complete == True, Task.completed_on.isnot(None))
+        if since_dt:
+            completed_query = completed_query.filter(Task.completed_on >= since_dt)
+        for day, user_id, project_id, count in completed_query.group_by(
+            completed_day, Task.completed_by_user_id, Task.project_id
+        ):
+            bucket(day, user_id, project_id)['tasks_completed'] = count
+
+        existing_query = cls.query
+        if since:
+            existing_query = existing_query.filter(cls.metric_date >= since)
+        existing = {(row.metric_date.isoformat(), row.user_id, row.project_id): row for row in existing_query}
+
+        counts = {'checked': len(set(expected) | set(existing)), 'inserted': 0, 'updated': 0, 'deleted': 0, 'pruned': 0}
+        for key, values in expected.items():
+            row = existing.pop(key, None)
+            if row is None:
+                counts['inserted'] += 1
+                if not dry_run:
+                    db.session.add(cls(
+                        metric_date=datetime.strptime(key[0], '%Y-%m-%d').date(),
+                        user_id=key[1], project_id=key[2],
+                        **{**values, 'fixed_cost': Decimal(str(values['fixed_cost']))}
+                    ))
+                continue
+            drifted = any(
+                round(float(getattr(row, field) or 0), 3) != round(float(values[field]), 3)
+                for field in cls.COUNTER_FIELDS
+            )
+            if drifted:
+                counts['updated'] += 1
+                if not dry_run:
+                    for field in cls.COUNTER_FIELDS:
+                        value = values[field]
+                        setattr(row, field, Decimal(str(value)) if field == 'fixed_cost' else value)
+        for row in existing.values():
+            # Rows that incremental updates drove back to zero are pruned, not drift
+            if any(float(getattr(row, field) or 0) for field in cls.COUNTER_FIELDS):
+                counts['deleted'] += 1
+            else:
+                counts['pruned'] += 1
+            if not dry_run:
+                db.session.delete(row)
+
+        if not dry_run:
+            db.session.commit()
+        return counts
+
 class UserProjectPin(db.Model):
     __tablename__ = 'user_project_pins'
     
@@ -470,6 +1181,7 @@ class ActivityLog(db.Model):
     activity_type = db.Column(db.String(50), nullable=False)  # e.g., 'task_completed', 'project_status_change'
     entity_type = db.Column(db.String(50), nullable=False)  # e.g., 'task', 'project', 'user'
     entity_id = db.Column(db.Integer, nullable=False)  # ID of the affected record
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='SET NULL'), nullable=True, index=True)  # Project touched (task, log and project events)
     old_value = db.Column(db.JSON, nullable=True)  # Previous state
     new_value = db.Column(db.JSON, nullable=True)  # New state
     extra_data = db.Column(db.JSON, nullable=True)  # Additional context
@@ -482,19 +1194,51 @@ class ActivityLog(db.Model):
         return f'<ActivityLog {self.activity_type} on {self.entity_type}:{self.entity_id}>'
     
     @classmethod
-    def log_activity(cls, user_id, activity_type, entity_type, entity_id, old_value=None, new_value=None, extra_data=None):
+    def resolve_project_id(cls, entity_type, entity_id, old_value=None, new_value=None):
+        """Project an activity belongs to, for task, log and project events (else None)."""
+        if entity_type == 'project':
+            return entity_id
+        if entity_type not in ('task', 'log'):
+            return None
+        for payload in (new_value, old_value):
+            if isinstance(payload, dict) and payload.get('project_id'):
+                return payload['project_id']
+        entity = db.session.get(Task if entity_type == 'task' else Log, entity_id)
+        return entity.project_id if entity else None
+
+    @classmethod
+    def log_activity(cls, user_id, activity_type, entity_type, entity_id, old_value=None, new_value=None, extra_data=None, project_id=None):
         """Helper method to create activity log entries"""
+        if project_id is None:
+            project_id = cls.resolve_project_id(entity_type, entity_id, old_value, new_value)
         log = cls(
             user_id=user_id,
             activity_type=activity_type,
             entity_type=entity_type,
             entity_id=entity_id,
+            project_id=project_id,
             old_value=old_value,
             new_value=new_value,
             extra_data=extra_data
         )
         db.session.add(log)
         return log
+    
+    @classmethod
+    def bulk_log(cls, entries):
+        """Insert many log_activity()-style entries (dicts) with one executemany INSERT."""
+        if not entries:
+            return
+        now = get_current_time()
+        rows = []
+        for entry in entries:
+            row = {'old_value': None, 'new_value': None, 'extra_data': None, 'project_id': None, 'created_at': now, **entry}
+            if row['project_id'] is None:
+                row['project_id'] = cls.resolve_project_id(
+                    row['entity_type'], row['entity_id'], row['old_value'], row['new_value']
+                )
+            rows.append(row)
+        db.session.execute(insert(cls), rows)
 
 # Equipment Scheduling Models
 
@@ -567,4 +1311,102 @@ class EquipmentAppointment(db.Model):
         if self.start_time and self.end_time:
             delta = self.end_time - self.start_time
             return delta.total_seconds() / 3600
-        return 0 
\ No newline at end of file
+        return 0 
+
+class Job(db.Model):
+    """A unit of background work (report exports) run by `flask jobs worker`.
+
+    Results are written to disk under the job results directory; result_path
+    is set when the job succeeds and the file is removed once expires_at passes.
+    """
+    __tablename__ = 'jobs'
+
+    STATUSES = ('queued', 'running', 'succeeded', 'failed')
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    params = db.Column(db.JSON, nullable=True)
+    status = db.Column(db.String(20), default='queued', nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    error = db.Column(db.Text, nullable=True)
+    result_path = db.Column(db.String(500), nullable=True)
+    result_name = db.Column(db.String(255), nullable=True)
+    result_mimetype = db.Column(db.String(100), nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), default=get_current_time, nullable=False)
+    started_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    finished_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (db.Index('ix_jobs_status_created_at', 'status', 'created_at'),)
+
+    def __repr__(self):
+        return f'<Job {self.id} {self.kind} {self.status}>'
+
+    @property
+    def is_finished(self):
+        return self.status in ('succeeded', 'failed')
+
+    @classmethod
+    def enqueue(cls, kind, params=None, user_id=None):
+        job = cls(kind=kind, params=params or {}, user_id=user_id, status='queued')
+        db.session.add(job)
+        return job
+
+    @classmethod
+    def claim_next(cls):
+        """
+        Atomically move the oldest queued job to 'running' and return it, or
+        None when the queue is empty. The status-guarded UPDATE makes the claim
+        safe with several workers: only one of them sees a row change.
+        """
+        while True:
+            job_id = db.session.query(cls.id).filter(cls.status == 'queued').order_by(cls.created_at, cls.id).limit(1).scalar()
+            if job_id is None:
+                return None
+            claimed = db.session.execute(
+                update(cls)
+                .where(cls.id == job_id, cls.status == 'queued')
+                .values(status='running', started_at=get_current_time(), attempts=cls.attempts + 1)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.session.commit()
+            if claimed:
+                return db.session.get(cls, job_id, populate_existing=True)
+
+    @classmethod
+    def cancel(cls, job_id):
+        """
+        Delete a job that no worker has claimed yet (caller commits). Returns
+        False when it is already running or finished; guarded like claim_next.
+        """
+        return db.session.execute(
+            delete(cls)
+            .where(cls.id == job_id, cls.status == 'queued')
+            .execution_options(synchronize_session=False)
+        ).rowcount > 0
+
+    @classmethod
+    def requeue_stale(cls, older_than):
+        """Put jobs whose worker died mid-run (still 'running' since before older_than) back on the queue."""
+        count = db.session.execute(
+            update(cls)
+            .where(cls.status == 'running', cls.started_at < older_than)
+            .values(status='queued', started_at=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        return count
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'error': self.error,
+            'result_name': self.result_name,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
+        }
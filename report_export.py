@@ -0,0 +1,460 @@
+"""
+XLSX activity report behind /api/export-report.
+
+The Project Data sheet comes from one ordered query over the date range
+(membership, client, project, log, user) read with ``yield_per``; project,
+client and membership subtotals are emitted as each group closes, so nothing
+is held per log. Sheets are written with openpyxl's write-only workbook.
+
+A write-only sheet emits its column widths before the first row, so the data
+rows are spooled to a temporary file while their widths are measured and then
+replayed into the sheet. Memory stays flat however large the range is.
+
+Finished workbooks are cached on disk under ``REPORT_CACHE_DIR``, addressed
+by a hash of the report parameters and the data version (row counts and
+latest updated_at of every table the report reads), so a repeat download is
+served from disk until the underlying data changes. The Report Info sheet
+therefore shows when the data last changed rather than when the file was built.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from datetime import datetime, timedelta
+from itertools import groupby
+from operator import attrgetter
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+from sqlalchemy import and_, case, func, or_, select
+
+from models import (
+    TIMEZONE, Client, Log, Membership, MembershipFunding, MembershipUsage, Project, User, db, get_current_time,
+)
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+DATA_HEADERS = [
+    "Membership", "Client", "Project", "Log Type", "User", "Date/Time", "Hours", "Cost", "Notes", "Status"
+]
+SUMMARY_HEADERS = ["Membership", "Total Hours (Period)", "Total Cost (Period)", "Remaining Budget", "Remaining Time"]
+UNASSOCIATED_LABEL = "Unassociated"
+MAX_COLUMN_WIDTH = 50
+YIELD_PER = 1000
+# Usage start for memberships that have never been funded
+NO_FUNDING_ANCHOR = datetime(2020, 1, 1)
+
+REPORT_CACHE_DIR = os.environ.get('REPORT_CACHE_DIR') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'report_cache'
+)
+REPORT_CACHE_MAX_AGE = timedelta(days=int(os.environ.get('REPORT_CACHE_MAX_AGE_DAYS', 7)))
+# Tables whose rows appear in the report; any insert, update or delete changes the data version
+VERSIONED_MODELS = (Log, Project, Client, Membership, MembershipFunding, User)
+
+
+def report_filename(start_date, end_date):
+    return f"hub_tracker_report_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.xlsx"
+
+
+def _fill(color):
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+
+def _styles():
+    """Cell styles by row kind; each is a dict of WriteOnlyCell attributes."""
+    border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                    top=Side(style='thin'), bottom=Side(style='thin'))
+    return {
+        'title': {'font': Font(size=16, bold=True)},
+        'header': {'font': Font(bold=True, color="FFFFFF"), 'fill': _fill("366092"),
+                   'border': border, 'alignment': Alignment(horizontal="center")},
+        'membership': {'font': Font(bold=True, size=12), 'fill': _fill("D9E1F2"), 'border': border},
+        'client': {'font': Font(bold=True), 'fill': _fill("E7E6E6"), 'border': border},
+        'project': {'font': Font(italic=True), 'border': border},
+        'cell': {'border': border},
+        'total': {'font': Font(bold=True), 'fill': _fill("F2F2F2"), 'border': border},
+        'membership_total': {'font': Font(bold=True, size=12), 'fill': _fill("D9E1F2"), 'border': border},
+        'section': {'font': Font(bold=True, size=12), 'fill': _fill("FCE4D6")},
+    }
+
+
+class ColumnWidths:
+    """Longest rendered value per column, measured as rows go by."""
+
+    def __init__(self):
+        self.lengths = {}
+
+    def track(self, values):
+        for col, value in enumerate(values, 1):
+            if value is not None:
+                self.lengths[col] = max(self.lengths.get(col, 0), len(str(value)))
+
+    def apply(self, ws):
+        for col, length in self.lengths.items():
+            ws.column_dimensions[get_column_letter(col)].width = min(length + 2, MAX_COLUMN_WIDTH)
+
+
+class RowSpool:
+    """Append-only on-disk buffer of rows, replayed once in order."""
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+
+    def append(self, row):
+        pickle.dump(row, self._file, pickle.HIGHEST_PROTOCOL)
+
+    def __iter__(self):
+        self._file.seek(0)
+        try:
+            while True:
+                yield pickle.load(self._file)
+        except EOFError:
+            pass
+        finally:
+            self._file.close()
+
+
+def _write_row(ws, styles, kind, values, style_blanks=False):
+    """
+    Append one row. Cells get the style for ``kind``; empty cells stay
+    unstyled unless ``style_blanks`` (total rows shade the full width).
+    """
+    style = styles.get(kind, {})
+    cells = []
+    for value in values:
+        if value is None and not style_blanks:
+            cells.append(None)
+            continue
+        cell = WriteOnlyCell(ws, value=value)
+        for attr, setting in style.items():
+            setattr(cell, attr, setting)
+        cells.append(cell)
+    ws.append(cells)
+
+
+def _write_sheet(wb, styles, title, rows, widths):
+    ws = wb.create_sheet(title)
+    widths.apply(ws)
+    for row in rows:
+        _write_row(ws, styles, *row)
+    return ws
+
+
+def _total_row(kind, column, label, hours, cost, marker):
+    values = [None] * len(DATA_HEADERS)
+    values[column - 1] = f"{label} - TOTAL"
+    values[6] = round(hours, 2)
+    values[7] = round(cost, 2)
+    values[9] = marker
+    return (kind, values, True)
+
+
+def report_memberships(filter_type, filter_value):
+    """Memberships covered by a report filter, in report order."""
+    if filter_type == 'membership':
+        membership = db.session.get(Membership, filter_value) if filter_value else None
+        return [membership] if membership else []
+    if filter_type == 'client':
+        client = db.session.get(Client, filter_value)
+        return [client.membership] if client and client.membership else []
+    return Membership.query.order_by(Membership.id).all()
+
+
+def filter_label(filter_type, filter_value):
+    if filter_type == 'all':
+        return "All Memberships and Clients"
+    if filter_type == 'membership':
+        membership = db.session.get(Membership, filter_value)
+        return f"Membership: {membership.title if membership else 'Unknown'}"
+    if filter_type == 'client':
+        client = db.session.get(Client, filter_value)
+        return f"Client: {client.name if client else 'Unknown'}"
+    return None
+
+
+def report_log_rows(start_date, end_date, membership_ids, include_unassociated=False):
+    """
+    Every log in the date range for clients of ``membership_ids`` (plus
+    clients without a membership when ``include_unassociated``), as plain
+    rows in report order: membership, client, project, then time.
+    """
+    unassociated = Client.membership_id.is_(None)
+    scope = Client.membership_id.in_(membership_ids)
+    if include_unassociated:
+        scope = or_(scope, unassociated)
+    return (
+        db.session.query(
+            Client.membership_id,
+            Client.id.label('client_id'),
+            Client.name.label('client_name'),
+            Project.id.label('project_id'),
+            Project.name.label('project_name'),
+            Project.status.label('project_status'),
+            Log.is_touch,
+            Log.hours,
+            Log.fixed_cost,
+            Log.notes,
+            Log.created_at,
+            User.first_name,
+            User.last_name,
+        )
+        .select_from(Log)
+        .join(Project, Log.project_id == Project.id)
+        .join(Client, Project.client_id == Client.id)
+        .outerjoin(User, Log.user_id == User.id)
+        .filter(
+            Log.created_at >= start_date,
+            Log.created_at < end_date + timedelta(days=1),
+            scope,
+        )
+        .order_by(unassociated, Client.membership_id, Client.id, Project.id, Log.created_at, Log.id)
+        .execution_options(yield_per=YIELD_PER)
+    )
+
+
+def _client_rows(label, rows, totals):
+    """
+    Client/project headers, log rows and subtotals for one membership's logs.
+    Hours and cost are added to every running total in ``totals`` per log
+    (touch logs count as half an hour).
+    """
+    for (_, client_name), client_logs in groupby(rows, key=attrgetter('client_id', 'client_name')):
+        yield ('client', [None, client_name])
+        client_totals = [0, 0]
+        for (_, project_name, status), project_logs in groupby(
+            client_logs, key=attrgetter('project_id', 'project_name', 'project_status')
+        ):
+            yield ('project', [None, None, project_name])
+            project_totals = [0, 0]
+            for log in project_logs:
+                hours = float(log.hours or 0)
+                cost = float(log.fixed_cost or 0)
+                user_name = f"{log.first_name} {log.last_name or ''}".strip() if log.first_name is not None else "Unknown"
+                yield ('cell', [
+                    label,
+                    client_name,
+                    project_name,
+                    "Project Touched" if log.is_touch else "Time/Cost Log",
+                    user_name,
+                    log.created_at.strftime('%Y-%m-%d %I:%M %p') if log.created_at else "",
+                    hours,
+                    cost,
+                    log.notes or "",
+                    status,
+                ])
+                for running in (project_totals, client_totals, *totals):
+                    running[0] += hours if not log.is_touch else 0.5
+                    running[1] += cost
+            yield _total_row('total', 3, project_name, *project_totals, "PROJECT TOTAL")
+        yield _total_row('total', 2, client_name, *client_totals, "CLIENT TOTAL")
+
+
+def report_data_rows(memberships, start_date, end_date, include_unassociated, summaries):
+    """
+    Rows of the Project Data sheet as (kind, values[, style_blanks]) tuples.
+    Appends one {'membership', 'total_hours', 'total_cost'} entry to
+    ``summaries`` per membership that has clients.
+    """
+    membership_ids = [m.id for m in memberships]
+    client_counts = dict(
+        db.session.query(Client.membership_id, func.count(Client.id))
+        .filter(or_(Client.membership_id.in_(membership_ids), Client.membership_id.is_(None)))
+        .group_by(Client.membership_id)
+    )
+    log_rows = report_log_rows(start_date, end_date, membership_ids, include_unassociated)
+    groups = groupby(log_rows, key=attrgetter('membership_id'))
+    pending = next(groups, None)
+
+    yield ('header', DATA_HEADERS)
+    for membership in memberships:
+        yield ('membership', [membership.title])
+        totals = [0, 0]
+        while pending is not None and pending[0] == membership.id:
+            yield from _client_rows(membership.title, pending[1], [totals])
+            pending = next(groups, None)
+        if client_counts.get(membership.id):
+            yield _total_row('membership_total', 1, membership.title, *totals, "MEMBERSHIP TOTAL")
+            summaries.append({'membership': membership, 'total_hours': totals[0], 'total_cost': totals[1]})
+
+    if include_unassociated and client_counts.get(None):
+        yield ('section', ["Unassociated Projects"])
+        while pending is not None and pending[0] is None:
+            yield from _client_rows(UNASSOCIATED_LABEL, pending[1], [])
+            pending = next(groups, None)
+
+
+def membership_balances(membership_ids, at=None):
+    """
+    {membership_id: (remaining_budget, remaining_time)} for many memberships
+    in one statement. Budgets are the funding entries active at ``at``; usage
+    is every log on the membership's clients' projects since its earliest
+    funding start (2020-01-01 when it has none). Hours include touch logs that
+    record hours; cost counts detailed logs only.
+    """
+    membership_ids = list(membership_ids)
+    if not membership_ids:
+        return {}
+    at = at or get_current_time()
+    active = and_(*MembershipUsage.active_window(at))
+    funding = db.session.query(
+        MembershipFunding.membership_id,
+        func.min(MembershipFunding.start_date).label('first_start'),
+        func.coalesce(func.sum(case((active, MembershipFunding.dollar_budget), else_=0)), 0).label('total_budget'),
+        func.coalesce(func.sum(case((active, MembershipFunding.time_budget), else_=0)), 0).label('total_time'),
+    ).filter(
+        MembershipFunding.membership_id.in_(membership_ids)
+    ).group_by(MembershipFunding.membership_id).subquery()
+    used = db.session.query(
+        Client.membership_id,
+        func.coalesce(func.sum(Log.hours), 0).label('used_time'),
+        func.coalesce(func.sum(case((Log.is_touch.is_(False), Log.fixed_cost), else_=0)), 0).label('used_cost'),
+    ).join(
+        Project, Project.id == Log.project_id
+    ).join(
+        Client, Client.id == Project.client_id
+    ).outerjoin(
+        funding, funding.c.membership_id == Client.membership_id
+    ).filter(
+        Client.membership_id.in_(membership_ids),
+        Log.created_at >= func.coalesce(funding.c.first_start, NO_FUNDING_ANCHOR),
+        Log.created_at < at + timedelta(days=1),
+    ).group_by(Client.membership_id).subquery()
+    rows = db.session.query(
+        Membership.id, funding.c.total_budget, funding.c.total_time, used.c.used_cost, used.c.used_time,
+    ).outerjoin(
+        funding, funding.c.membership_id == Membership.id
+    ).outerjoin(
+        used, used.c.membership_id == Membership.id
+    ).filter(Membership.id.in_(membership_ids))
+    return {
+        membership_id: (float(total_budget or 0) - float(used_cost or 0), float(total_time or 0) - float(used_time or 0))
+        for membership_id, total_budget, total_time, used_cost, used_time in rows
+    }
+
+
+def write_report(output, start_date, end_date, filter_type='all', filter_value='', data_as_of=None):
+    """
+    Build the report workbook for ``[start_date, end_date]`` and save it to
+    ``output`` (a path or binary file object). ``data_as_of`` is the time of
+    the latest change to the data (see data_version); defaults to now.
+    """
+    data_as_of = data_as_of or get_current_time()
+    wb = Workbook(write_only=True)
+    styles = _styles()
+
+    info_rows = [
+        ('title', ["Hub Tracker Report"]),
+        ('info', []),
+        ('info', ["Date Range:", f"{start_date.strftime('%B %d, %Y')} - {end_date.strftime('%B %d, %Y')}"]),
+        ('info', ["Filter:", filter_label(filter_type, filter_value)]),
+        ('info', []),
+        ('info', ["Data as of:", data_as_of.strftime('%B %d, %Y at %I:%M %p')]),
+    ]
+    info_widths = ColumnWidths()
+    for _, values in info_rows:
+        info_widths.track(values)
+    _write_sheet(wb, styles, "Report Info", info_rows, info_widths)
+
+    # Measure the data rows on the way to disk; the sheet needs its widths first
+    memberships = report_memberships(filter_type, filter_value)
+    summaries = []
+    spool = RowSpool()
+    data_widths = ColumnWidths()
+    for row in report_data_rows(memberships, start_date, end_date, filter_type == 'all', summaries):
+        data_widths.track(row[1])
+        spool.append(row)
+    _write_sheet(wb, styles, "Project Data", spool, data_widths)
+
+    # Period totals come from the data sheet; balances for all memberships in one query
+    balances = membership_balances(summary['membership'].id for summary in summaries)
+    summary_rows = [('header', SUMMARY_HEADERS)]
+    for summary in summaries:
+        remaining_budget, remaining_time = balances[summary['membership'].id]
+        summary_rows.append(('cell', [
+            summary['membership'].title,
+            round(summary['total_hours'], 2),
+            round(summary['total_cost'], 2),
+            round(remaining_budget, 2),
+            round(remaining_time, 2),
+        ]))
+    summary_widths = ColumnWidths()
+    for _, values in summary_rows:
+        summary_widths.track(values)
+    _write_sheet(wb, styles, "Membership Summary", summary_rows, summary_widths)
+
+    wb.save(output)
+
+
+def _local_time(value):
+    # SQLite hands back naive Chicago wall-clock values, Postgres aware ones
+    if value.tzinfo is None:
+        return TIMEZONE.localize(value)
+    return value.astimezone(TIMEZONE)
+
+
+def data_version():
+    """
+    (token, as_of): the token changes whenever report data may have (row count
+    and latest updated_at of each versioned table, counts catching deletes),
+    read in one query; as_of is the latest of those updated_at values in
+    Chicago time, or now when the tables are empty. Today's date is part of
+    the token because remaining balances depend on which funding windows are
+    active.
+    """
+    columns = []
+    for model in VERSIONED_MODELS:
+        columns.append(select(func.count()).select_from(model).scalar_subquery())
+        columns.append(select(func.max(model.updated_at)).scalar_subquery())
+    row = db.session.execute(select(*columns)).one()
+    parts = [get_current_time().date().isoformat()] + [str(value) for value in row]
+    token = hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:16]
+    changed = [_local_time(value) for value in row[1::2] if value is not None]
+    return token, max(changed) if changed else get_current_time()
+
+
+def report_cache_key(start_date, end_date, filter_type, filter_value, version):
+    parts = [start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'), filter_type or 'all',
+             str(filter_value or ''), version]
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:32]
+
+
+def prune_report_cache(max_age=REPORT_CACHE_MAX_AGE):
+    """Remove cached reports (and abandoned partial writes) older than max_age."""
+    cutoff = time.time() - max_age.total_seconds()
+    removed = 0
+    for entry in os.scandir(REPORT_CACHE_DIR):
+        if entry.name.startswith('report_') and entry.stat().st_mtime < cutoff:
+            os.remove(entry.path)
+            removed += 1
+    return removed
+
+
+def cached_report(start_date, end_date, filter_type='all', filter_value=''):
+    """
+    (path, key) of the report workbook for these parameters at the current
+    data version, building it only on a cache miss. ``key`` identifies the
+    content and doubles as its ETag.
+    """
+    version, as_of = data_version()
+    key = report_cache_key(start_date, end_date, filter_type, filter_value, version)
+    path = os.path.join(REPORT_CACHE_DIR, f'report_{key}.xlsx')
+    if os.path.exists(path):
+        return path, key
+
+    os.makedirs(REPORT_CACHE_DIR, exist_ok=True)
+    fd, partial_path = tempfile.mkstemp(prefix='report_', suffix='.part', dir=REPORT_CACHE_DIR)
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            write_report(handle, start_date, end_date, filter_type, filter_value, data_as_of=as_of)
+        os.replace(partial_path, path)
+    except Exception:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    prune_report_cache()
+    return path, key
@@ -0,0 +1,271 @@
+"""
+Full-text search over tasks, logs, projects, clients and quotes.
+
+Postgres: every searchable table carries a STORED generated ``search_vector``
+tsvector column with a GIN index (migration f4b8d2a6c0e3), so the database keeps
+the index current on every write and there is nothing to sync from the app.
+
+SQLite (local development): a single FTS5 table, ``search_index``, kept current
+by insert/update/delete triggers on the source tables. Databases built with
+``db.create_all()`` instead of migrations get it from ``ensure_search_index()``
+(``flask rebuild-search-index``).
+
+The search_vector columns and the FTS table are deliberately not mapped on the
+models: they are maintained entirely by the database.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.orm import joinedload
+
+from models import db, Client, Log, Project, Quote, Task
+
+# entity type -> (table, title column, body column, FTS rowid type code)
+# Title text ranks above body text (weight A vs. B / bm25 column weights).
+SEARCH_SOURCES = {
+    'task': ('tasks', None, 'description', 1),
+    'log': ('logs', None, 'notes', 2),
+    'project': ('projects', 'name', 'notes', 3),
+    'client': ('clients', 'name', 'notes', 4),
+    'quote': ('quotes', 'title', 'scope_summary', 5),
+}
+SEARCH_TYPES = tuple(SEARCH_SOURCES)
+# FTS rowid = entity id * ROWID_STRIDE + type code, so trigger deletes hit the rowid directly
+ROWID_STRIDE = 8
+
+SNIPPET_RADIUS = 80
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class SearchIndexUnavailable(RuntimeError):
+    """The database has no search index (Postgres migration f4b8d2a6c0e3 not applied)."""
+
+
+def search_tokens(query_text: str) -> List[str]:
+    """Split free text into plain word tokens; everything else is dropped."""
+    return _TOKEN_RE.findall((query_text or '').lower())[:12]
+
+
+def _is_postgres() -> bool:
+    return db.engine.dialect.name == 'postgresql'
+
+
+# ---------------------------------------------------------------------------
+# SQLite FTS5 index
+# ---------------------------------------------------------------------------
+
+def _fts_text(alias: str, title: Optional[str], body: str) -> Tuple[str, str]:
+    title_sql = f"coalesce({alias}.{title}, '')" if title else "''"
+    return title_sql, f"coalesce({alias}.{body}, '')"
+
+
+def sqlite_index_ddl() -> List[str]:
+    """CREATE statements for the FTS5 table and the triggers that maintain it."""
+    statements = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index "
+        "USING fts5(title, body, tokenize='porter unicode61')"
+    ]
+    for table, title, body, code in SEARCH_SOURCES.values():
+        rowid = f"new.id * {ROWID_STRIDE} + {code}"
+        old_rowid = f"old.id * {ROWID_STRIDE} + {code}"
+        title_sql, body_sql = _fts_text('new', title, body)
+        watched = ', '.join(c for c in (title, body) if c)
+        insert = f"INSERT INTO search_index(rowid, title, body) VALUES ({rowid}, {title_sql}, {body_sql});"
+        delete = f"DELETE FROM search_index WHERE rowid = {old_rowid};"
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE OF {watched} ON {table} "
+            f"BEGIN {delete} {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} BEGIN {delete} END",
+        ]
+    return statements
+
+
+def ensure_search_index(rebuild: bool = False) -> Dict[str, int]:
+    """
+    Make sure the search index exists and is populated. On SQLite this creates
+    the FTS table and triggers if missing and (re)fills the table when it is
+    empty or ``rebuild`` is set. Postgres maintains its generated columns on
+    its own, so there is nothing to do beyond reporting counts.
+    """
+    counts = {}
+    if _is_postgres():
+        for entity_type, (table, _, _, _) in SEARCH_SOURCES.items():
+            counts[entity_type] = db.session.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+        return counts
+
+    for statement in sqlite_index_ddl():
+        db.session.execute(text(statement))
+    indexed = db.session.execute(text("SELECT count(*) FROM search_index")).scalar()
+    if indexed and not rebuild:
+        return {'indexed': indexed}
+
+    db.session.execute(text("DELETE FROM search_index"))
+    for entity_type, (table, title, body, code) in SEARCH_SOURCES.items():
+        title_sql, body_sql = _fts_text('src', title, body)
+        result = db.session.execute(text(
+            f"INSERT INTO search_index(rowid, title, body) "
+            f"SELECT src.id * {ROWID_STRIDE} + {code}, {title_sql}, {body_sql} FROM {table} AS src"
+        ))
+        counts[entity_type] = result.rowcount
+    db.session.execute(text("INSERT INTO search_index(search_index) VALUES ('optimize')"))
+    db.session.commit()
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Querying
+# ---------------------------------------------------------------------------
+
+def _postgres_hits(tokens: Sequence[str], types: Sequence[str], limit: int, offset: int):
+    # Every token is a bare word, so the prefix query cannot be malformed
+    params: Dict[str, Any] = {'tsquery': ' & '.join(f'{t}:*' for t in tokens), 'limit': limit, 'offset': offset}
+    selects = []
+    for entity_type in types:
+        table = SEARCH_SOURCES[entity_type][0]
+        selects.append(
+            f"SELECT '{entity_type}' AS entity_type, id AS entity_id, "
+            f"ts_rank(search_vector, q) AS rank "
+            f"FROM {table}, to_tsquery('english', :tsquery) AS q WHERE search_vector @@ q"
+        )
+    sql = ' UNION ALL '.join(selects) + ' ORDER BY rank DESC, entity_id DESC LIMIT :limit OFFSET :offset'
+    return [(row.entity_type, row.entity_id) for row in db.session.execute(text(sql), params)]
+
+
+def _sqlite_hits(tokens: Sequence[str], types: Sequence[str], limit: int, offset: int):
+    match = ' '.join(f'"{t}"*' for t in tokens)
+    codes = {SEARCH_SOURCES[t][3]: t for t in types}
+    code_list = ', '.join(str(c) for c in codes)
+    rows = db.session.execute(text(
+        f"SELECT rowid FROM search_index WHERE search_index MATCH :match "
+        f"AND rowid % {ROWID_STRIDE} IN ({code_list}) "
+        f"ORDER BY bm25(search_index, 10.0, 1.0), rowid DESC LIMIT :limit OFFSET :offset"
+    ), {'match': match, 'limit': limit, 'offset': offset})
+    return [(codes[rowid % ROWID_STRIDE], rowid // ROWID_STRIDE) for (rowid,) in rows]
+
+
+def search_hits(query_text: str, types: Optional[Iterable[str]] = None,
+                page: int = 1, per_page: int = 20) -> Tuple[List[Tuple[str, int]], bool]:
+    """
+    Ranked (entity_type, entity_id) pairs for one page of results, best match
+    first, plus whether another page follows. Every token must match (as a
+    prefix, so partially typed words still find results).
+
+    A SQLite database without the FTS table gets it built on first use; on
+    Postgres a missing index raises SearchIndexUnavailable.
+    """
+    tokens = search_tokens(query_text)
+    types = [t for t in (types or SEARCH_TYPES) if t in SEARCH_SOURCES]
+    if not tokens or not types:
+        return [], False
+
+    offset = (max(page, 1) - 1) * per_page
+    if _is_postgres():
+        try:
+            hits = _postgres_hits(tokens, types, per_page + 1, offset)
+        except ProgrammingError as e:
+            db.session.rollback()
+            if 'search_vector' not in str(e.orig):
+                raise
+            raise SearchIndexUnavailable('Search index is missing; run the database migrations') from e
+    else:
+        try:
+            hits = _sqlite_hits(tokens, types, per_page + 1, offset)
+        except OperationalError as e:
+            db.session.rollback()
+            if 'no such table: search_index' not in str(e.orig):
+                raise
+            ensure_search_index()
+            hits = _sqlite_hits(tokens, types, per_page + 1, offset)
+    return hits[:per_page], len(hits) > per_page
+
+
+def make_snippet(content: Optional[str], tokens: Sequence[str], radius: int = SNIPPET_RADIUS) -> str:
+    """A short excerpt of ``content`` centred on the first matching token."""
+    content = ' '.join((content or '').split())
+    if len(content) <= radius * 2:
+        return content
+    lowered = content.lower()
+    positions = [lowered.find(t) for t in tokens if lowered.find(t) >= 0]
+    center = min(positions) if positions else 0
+    start = max(center - radius, 0)
+    end = min(start + radius * 2, len(content))
+    start = max(end - radius * 2, 0)
+    return ('…' if start else '') + content[start:end].strip() + ('…' if end < len(content) else '')
+
+
+def load_search_results(hits: Sequence[Tuple[str, int]], query_text: str) -> List[Dict[str, Any]]:
+    """
+    Hydrate ranked hits into result dicts with one query per entity type,
+    preserving rank order. Hits whose row has since disappeared are skipped.
+    """
+    tokens = search_tokens(query_text)
+    ids_by_type: Dict[str, List[int]] = {}
+    for entity_type, entity_id in hits:
+        ids_by_type.setdefault(entity_type, []).append(entity_id)
+
+    loaders = {
+        'task': lambda ids: Task.query.options(joinedload(Task.project).joinedload(Project.client)).filter(Task.id.in_(ids)),
+        'log': lambda ids: Log.query.options(joinedload(Log.project), joinedload(Log.user)).filter(Log.id.in_(ids)),
+        'project': lambda ids: Project.query.options(joinedload(Project.client)).filter(Project.id.in_(ids)),
+        'client': lambda ids: Client.query.filter(Client.id.in_(ids)),
+        'quote': lambda ids: Quote.query.options(joinedload(Quote.client)).filter(Quote.id.in_(ids)),
+    }
+    objects = {}
+    for entity_type, ids in ids_by_type.items():
+        for obj in loaders[entity_type](ids):
+            objects[(entity_type, obj.id)] = obj
+
+    results = []
+    for key in hits:
+        obj = objects.get(key)
+        if obj is None:
+            continue
+        results.append(_describe(key[0], obj, tokens))
+    return results
+
+
+def _describe(entity_type: str, obj: Any, tokens: Sequence[str]) -> Dict[str, Any]:
+    result = {'type': entity_type, 'id': obj.id, 'project_id': None, 'client_id': None}
+    if entity_type == 'task':
+        project = obj.project
+        result.update(
+            title=make_snippet(obj.description, tokens, radius=40),
+            snippet=make_snippet(obj.description, tokens),
+            context=' · '.join(p for p in (project.client.name if project and project.client else None,
+                                          project.name if project else None) if p),
+            project_id=obj.project_id,
+            is_complete=obj.is_complete,
+        )
+    elif entity_type == 'log':
+        project = obj.project
+        result.update(
+            title=f"{obj.user.full_name if obj.user else 'Log'} · {project.name if project else 'No project'}",
+            snippet=make_snippet(obj.notes, tokens),
+            context=obj.created_at.strftime('%Y-%m-%d') if obj.created_at else '',
+            project_id=obj.project_id,
+        )
+    elif entity_type == 'project':
+        result.update(
+            title=obj.name,
+            snippet=make_snippet(obj.notes, tokens),
+            context=obj.client.name if obj.client else '',
+            project_id=obj.id,
+            client_id=obj.client_id,
+        )
+    elif entity_type == 'client':
+        result.update(title=obj.name, snippet=make_snippet(obj.notes, tokens), context='', client_id=obj.id)
+    elif entity_type == 'quote':
+        result.update(
+            title=f"{obj.quote_id} {obj.title or ''}".strip(),
+            snippet=make_snippet(obj.scope_summary, tokens),
+            context=obj.client.name if obj.client else '',
+            project_id=obj.project_id,
+            client_id=obj.client_id,
+        )
+    return result
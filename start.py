@@ -52,6 +52,13 @@ def main():
         print(f"Error output: {e.stderr}")
         print("Continuing anyway - database may already be up to date...")
     
+    # Start the background job worker (report exports) next to the web server.
+    # Set JOBS_WORKER=0 when a separate worker service runs `flask jobs worker`.
+    if os.environ.get('JOBS_WORKER', '1') != '0':
+        print("Starting jobs worker...")
+        # Not restarted if it dies (gunicorn replaces this process); the shell reports the exit in the logs
+        subprocess.Popen(['sh', '-c', 'flask jobs worker; echo "Jobs worker exited with status $?" >&2'])
+    
     # Start the web server
     print("Starting gunicorn server...")
     os.execvp('gunicorn', ['gunicorn', 'app:app'])
@@ -8,6 +8,10 @@ function taskList(listType) {
         showTasksICreated: false,  // Add missing property
         currentUserId: null,
         isInitialized: false,  // Add initialization flag
+        nextCursor: null,  // Keyset cursor for the next page from the tasks API
+        loadingMore: false,
+        pagesUrl: null,  // Set when the list is fetched from the API instead of embedded
+        firstPageLoaded: false,
 
         init() {
             try {
@@ -31,11 +35,17 @@ function taskList(listType) {
                     this.filteredTasks = this.sortTasksByPriority([...this.tasks]);
                 } else if (listType === 'completed-tasks') {
                     console.log('Loading completed tasks'); // Debug
+                    // Pages that pass completedTasksUrl load the list on demand (see loadFirstPage)
+                    this.pagesUrl = tasksData.completedTasksUrl || null;
                     this.tasks = Array.from(tasksData.completedTasks || []);
                     this.filteredTasks = [...this.tasks]; // No need to sort completed tasks by flag
                     console.log('Completed tasks loaded:', this.tasks); // Debug
                 }
 
+                // Lists rendered as a first page carry a cursor (and endpoint) for the rest
+                this.nextCursor = (tasksData.nextCursors || {})[listType] || null;
+                this.pagesUrl = this.pagesUrl || (tasksData.pageUrls || {})[listType] || null;
+
                 this.isInitialized = true;
                 console.log('Task list initialized:', {
                     listType,
@@ -49,6 +59,54 @@ function taskList(listType) {
             }
         },
 
+        // API endpoint + filters backing this list, used by loadMore()
+        apiUrl() {
+            if (this.pagesUrl) return this.pagesUrl;
+            if (listType === 'completed-tasks') return '/api/completed-tasks?limit=50';
+            if (listType === 'tasks-for-me') return '/api/tasks?assigned_to=me';
+            return '/api/tasks';
+        },
+
+        get hasMore() {
+            return Boolean(this.nextCursor);
+        },
+
+        // Fetch the first page of an on-demand list (no-op once loaded or for embedded lists)
+        async loadFirstPage() {
+            if (!this.isInitialized || !this.pagesUrl || this.firstPageLoaded) return;
+            this.firstPageLoaded = true;
+            await this.fetchPage(null);
+        },
+
+        // Fetch the next page of tasks and append the ones we don't have yet
+        async loadMore() {
+            if (!this.isInitialized || !this.nextCursor) return;
+            await this.fetchPage(this.nextCursor);
+        },
+
+        async fetchPage(cursor) {
+            if (this.loadingMore) return;
+            this.loadingMore = true;
+            try {
+                let url = this.apiUrl();
+                if (cursor) {
+                    url += (url.includes('?') ? '&' : '?') + 'cursor=' + encodeURIComponent(cursor);
+                }
+                const response = await fetch(url);
+                if (!response.ok) throw new Error('HTTP ' + response.status);
+                const data = await response.json();
+
+                const knownIds = new Set(this.tasks.map(task => task.id));
+                this.tasks = this.tasks.concat((data.tasks || []).filter(task => !knownIds.has(task.id)));
+                this.nextCursor = data.next_cursor || null;
+                this.filterTasks();
+            } catch (error) {
+                console.error('Error loading more tasks:', error);
+            } finally {
+                this.loadingMore = false;
+            }
+        },
+
         // Sort tasks with flagged tasks at the top
         sortTasksByPriority(tasks) {
             return tasks.sort((a, b) => {